@@ -0,0 +1,72 @@
+"""Admission control configuration"""
+
+from pathlib import Path
+from typing import Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field
+
+
+class AdmissionSettings(BaseSettings):
+    """Request admission control and load shedding settings"""
+
+    enabled: bool = Field(True, description="Limit concurrent requests")
+    max_concurrency: Optional[int] = Field(
+        None,
+        description="Requests handled at once per worker "
+        "(default: the async pool's pool_size + max_overflow)",
+    )
+    queue_size: Optional[int] = Field(
+        None,
+        description="Requests that may wait for a slot per worker "
+        "(default: twice max_concurrency)",
+    )
+    max_wait_seconds: float = Field(
+        0.5, description="Longest a request waits for a slot before a 503"
+    )
+    route_limits: dict[str, int] = Field(
+        {
+            "/api/v1/users/import": 1,
+            "/api/v1/media/images": 2,
+            "/api/v1/items/search": 4,
+            "/api/v1/reports/{report_id}/matches": 4,
+            "/api/v1/analytics/daily": 2,
+        },
+        description="Requests handled at once per route template (JSON object)",
+    )
+    priority_routes: list[str] = Field(
+        [
+            "/api/v1/categories/all",
+            "/api/v1/reference/rooms",
+            "/api/v1/reference/drop-off-locations",
+            "/api/v1/reference/roles",
+            "/api/v1/auth/me",
+        ],
+        description="Cheap reads admitted ahead of queued requests (JSON list)",
+    )
+    priority_headroom: Optional[int] = Field(
+        None,
+        description="Requests beyond max_concurrency admitted for priority routes, "
+        "which do not use the database (default: max_concurrency)",
+    )
+    exempt_routes: list[str] = Field(
+        [
+            "/",
+            "/metrics",
+            "/docs",
+            "/openapi.json",
+            "/debug/queries",
+            "/api/v1/live/items",
+        ],
+        description="Routes never limited, such as long-lived streams (JSON list)",
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="ADMISSION_",  # Prefix for admission-related environment variables
+        env_file=Path(__file__).parent.parent.parent / ".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="allow",  # Allow extra fields in the settings
+    )
+
+
+admission_settings = AdmissionSettings()  # type: ignore
@@ -1,3 +1,4 @@
+import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from pathlib import Path
@@ -13,6 +14,36 @@ class AuthConfig(BaseSettings):
         3600, description="JWT token expiration time in minutes"
     )
 
+    # password hashing
+    bcrypt_rounds: int = Field(12, description="bcrypt cost factor for passwords")
+    bcrypt_import_rounds: int = Field(
+        8,
+        description=(
+            "bcrypt cost factor for bulk-imported default passwords, "
+            "upgraded to bcrypt_rounds on first successful login"
+        ),
+    )
+    password_hash_workers: int = Field(
+        0,
+        description=(
+            "Processes in each worker's password hashing pool "
+            "(0 = its share of the CPUs)"
+        ),
+    )
+
+    # token verification
+    token_cache_size: int = Field(
+        10_000, description="Verified tokens remembered per process (LRU)"
+    )
+    revocation_capacity: int = Field(
+        100_000,
+        description="Revoked tokens the revocation filter is sized for "
+        "(1% false positives, which cost one database check)",
+    )
+    revocation_sync_seconds: float = Field(
+        2.0, description="How often revocations by other processes are picked up"
+    )
+
     model_config = SettingsConfigDict(
         env_prefix="AUTH_",  # Prefix for auth-related environment variables
         env_file=Path(__file__).parent.parent.parent / ".env",
@@ -21,5 +52,18 @@ class AuthConfig(BaseSettings):
         extra="allow",  # Allow extra fields in the settings
     )
 
+    @property
+    def password_hash_pool_size(self) -> int:
+        """Processes in this worker's password hashing pool.
+
+        Unless set, each of the WEB_CONCURRENCY workers gets an equal share
+        of the CPUs, so together they start one process per core.
+        """
+
+        if self.password_hash_workers:
+            return self.password_hash_workers
+        workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+        return max(1, (os.cpu_count() or 1) // workers)
+
 
 auth_config = AuthConfig()  # type: ignore
@@ -1,8 +1,16 @@
 """Database configuration"""
 
+import os
 from pathlib import Path
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
+from sqlalchemy.engine import make_url
+
+# connections of each worker's sync engine, which only does startup work
+SYNC_ENGINE_CONNECTIONS = 2
+# connection each worker keeps LISTENing for the item feed
+LISTENER_CONNECTIONS = 1
 
 
 class DatabaseSettings(BaseSettings):
@@ -26,6 +34,36 @@ class DatabaseSettings(BaseSettings):
         3600, description="Time in seconds to recycle connections"
     )
     pool_pre_ping: bool = Field(True, description="Check connections before using them")
+    connection_budget: Optional[int] = Field(
+        None,
+        description="Connections each database server may get from all workers "
+        "together; replaces pool_size and max_overflow when set",
+    )
+
+    # read replicas
+    replicas: str = Field(
+        "", description="Comma separated read replica URLs (postgresql://...)"
+    )
+    replica_connect_timeout: float = Field(
+        2.0, description="Seconds to wait for a replica connection"
+    )
+    read_your_writes_seconds: float = Field(
+        5.0,
+        description="How long a client's reads stay on the primary after it writes",
+    )
+
+    # archival of collected items
+    archive_after_days: Optional[int] = Field(
+        180,
+        description="Move collected items older than this many days to the "
+        "archive table (unset to disable)",
+    )
+    archive_batch_size: int = Field(
+        1000, description="Items moved to the archive per transaction"
+    )
+    archive_interval_seconds: float = Field(
+        3600, description="How often the archival job runs"
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="DB_",  # Prefix for db-related environment variables
@@ -44,5 +82,56 @@ class DatabaseSettings(BaseSettings):
             f"{self.host}:{self.port}/{self.name}"
         )
 
+    @property
+    def async_db_url(self) -> str:
+        """Construct the asyncpg database URL from db settings."""
+
+        return (
+            f"postgresql+asyncpg://{self.user}:{self.password}@"
+            f"{self.host}:{self.port}/{self.name}"
+        )
+
+    @property
+    def workers(self) -> int:
+        """Number of worker processes sharing the connection budget."""
+
+        return max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+
+    def pool_limits(self, engine: str) -> tuple[int, int]:
+        """(pool_size, max_overflow) of this worker's "sync" or "async" engines.
+
+        Without a connection budget every engine gets pool_size and
+        max_overflow. With one, each worker gets an equal share: its sync
+        engine SYNC_ENGINE_CONNECTIONS, the item feed LISTENER_CONNECTIONS,
+        its async engine (and each replica engine) the rest, with no
+        overflow so the budget is a hard limit.
+        """
+
+        if self.connection_budget is None:
+            return self.pool_size, self.max_overflow
+        share = self.connection_budget // self.workers
+        reserved = SYNC_ENGINE_CONNECTIONS + LISTENER_CONNECTIONS
+        if share <= reserved:
+            raise ValueError(
+                f"DB_CONNECTION_BUDGET={self.connection_budget} leaves {share} "
+                f"connections to each of {self.workers} workers; at least "
+                f"{reserved + 1} are needed."
+            )
+        if engine == "sync":
+            return 1, SYNC_ENGINE_CONNECTIONS - 1
+        return share - reserved, 0
+
+    @property
+    def replica_async_urls(self) -> list[str]:
+        """The configured replica URLs, using the asyncpg driver."""
+
+        return [
+            make_url(url.strip())
+            .set(drivername="postgresql+asyncpg")
+            .render_as_string(hide_password=False)
+            for url in self.replicas.split(",")
+            if url.strip()
+        ]
+
 
 db_settings = DatabaseSettings()  # type: ignore
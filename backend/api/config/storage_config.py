@@ -0,0 +1,60 @@
+"""Media storage configuration"""
+
+import os
+from pathlib import Path
+from typing import Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field
+
+
+class StorageSettings(BaseSettings):
+    """Uploaded image storage settings"""
+
+    media_root: Path = Field(
+        Path(__file__).parent.parent.parent / "media",
+        description="Directory holding uploaded images and their thumbnails",
+    )
+    max_upload_bytes: int = Field(
+        10 * 1024 * 1024, description="Largest accepted image upload"
+    )
+    thumbnail_size: int = Field(
+        320, description="Longest edge of generated thumbnails, in pixels"
+    )
+    thumbnail_workers: int = Field(
+        0,
+        description=(
+            "Processes in each worker's thumbnail generation pool "
+            "(0 = its share of the CPUs)"
+        ),
+    )
+    accel_redirect_prefix: Optional[str] = Field(
+        None,
+        description=(
+            "Internal location under which a fronting nginx serves media_root; "
+            "when set, file responses are handed off with X-Accel-Redirect"
+        ),
+    )
+
+    model_config = SettingsConfigDict(
+        env_prefix="STORAGE_",  # Prefix for storage-related environment variables
+        env_file=Path(__file__).parent.parent.parent / ".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="allow",  # Allow extra fields in the settings
+    )
+
+    @property
+    def thumbnail_pool_size(self) -> int:
+        """Processes in this worker's thumbnail generation pool.
+
+        Unless set, each of the WEB_CONCURRENCY workers gets an equal share
+        of the CPUs, so together they start one process per core.
+        """
+
+        if self.thumbnail_workers:
+            return self.thumbnail_workers
+        workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+        return max(1, (os.cpu_count() or 1) // workers)
+
+
+storage_settings = StorageSettings()  # type: ignore
@@ -0,0 +1,207 @@
+"""Admission control: bounded concurrency and load shedding.
+
+Without it, requests beyond what the async pool can serve wait inside the
+session dependency for up to the pool timeout, so under overload every
+request gets slow and retrying clients make it worse. Instead, each worker
+handles at most ADMISSION_MAX_CONCURRENCY requests at once (by default the
+primary async pool's capacity, so an admitted request does not wait for a
+connection), and some routes have lower limits of their own
+(ADMISSION_ROUTE_LIMITS, e.g. one user import at a time).
+
+Requests beyond the limits wait in a bounded queue for at most
+ADMISSION_MAX_WAIT_SECONDS; when the queue is full or the wait runs out
+they get 503 with a Retry-After estimated from recent response times.
+Cheap reads (ADMISSION_PRIORITY_ROUTES, served from the reference cache)
+are admitted before anything else waiting and may use
+ADMISSION_PRIORITY_HEADROOM slots beyond the limit, since they need no
+connection, so they keep working while heavier requests are shed. Requests that match
+no route, and ADMISSION_EXEMPT_ROUTES such as /metrics, are not limited.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Optional
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from prometheus_client import Counter, Gauge
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+from backend.api.config.admission_config import AdmissionSettings, admission_settings
+from backend.api.config.db_config import db_settings
+
+# longest Retry-After suggested, in seconds
+MAX_RETRY_AFTER = 30
+# weight of the latest request in the average service time
+SERVICE_TIME_WEIGHT = 0.05
+
+REQUESTS_SHED = Counter(
+    "http_requests_shed_total",
+    "Requests rejected with 503 by admission control.",
+    ["route", "reason"],
+)
+REQUESTS_QUEUED = Gauge(
+    "http_requests_queued",
+    "Requests waiting for admission.",
+    multiprocess_mode="livesum",
+)
+
+
+class AdmissionGate:
+    """At most `limit` holders, plus `headroom` more for priority requests.
+
+    Waiters are admitted priority first, then in arrival order.
+    """
+
+    def __init__(self, limit: int, queue_size: int, headroom: int = 0):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.headroom = headroom
+        self.in_use = 0
+        # (priority, normal) waiters, each a future resolved with a slot
+        self._waiters: tuple[deque, deque] = (deque(), deque())
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters[0]) + len(self._waiters[1])
+
+    async def acquire(self, priority: bool, timeout: float) -> Optional[str]:
+        """Take a slot; returns why not ("queue_full", "timeout") on failure."""
+        if priority:
+            free = self.in_use < self.limit + self.headroom and not self._waiters[0]
+        else:
+            free = self.in_use < self.limit and not self.queued
+        if free:
+            self.in_use += 1
+            return None
+        waiters = self._waiters[0 if priority else 1]
+        if len(waiters) >= self.queue_size or timeout <= 0:
+            return "queue_full"
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        REQUESTS_QUEUED.inc()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # the slot may have been handed over as the wait timed out; the
+            # request holds it then, so admit it rather than leak the slot
+            if future.done() and not future.cancelled():
+                return None
+            return "timeout"
+        except asyncio.CancelledError:
+            # the slot may have been handed over just before cancellation
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        finally:
+            REQUESTS_QUEUED.dec()
+            if not future.done() or future.cancelled():
+                try:
+                    waiters.remove(future)
+                except ValueError:
+                    pass
+        return None
+
+    def release(self):
+        """Free a slot and admit whoever may take it."""
+        self.in_use -= 1
+        for waiters, limit in zip(
+            self._waiters, (self.limit + self.headroom, self.limit)
+        ):
+            while waiters and self.in_use < limit:
+                future = waiters.popleft()
+                if not future.done():
+                    future.set_result(None)
+                    self.in_use += 1
+
+
+class AdmissionControlMiddleware:
+    """Shed load with 503s instead of queueing for database connections."""
+
+    def __init__(self, app: ASGIApp, settings: Optional[AdmissionSettings] = None):
+        if settings is None:
+            settings = admission_settings
+        self.app = app
+        self.settings = settings
+        limit = settings.max_concurrency
+        if limit is None:
+            limit = sum(db_settings.pool_limits("async"))
+        queue_size = settings.queue_size
+        if queue_size is None:
+            queue_size = 2 * limit
+        headroom = settings.priority_headroom
+        if headroom is None:
+            headroom = limit
+        self.gate = AdmissionGate(limit, queue_size, headroom)
+        self.route_gates = {
+            path: AdmissionGate(route_limit, queue_size)
+            for path, route_limit in settings.route_limits.items()
+        }
+        self.priority_routes = frozenset(settings.priority_routes)
+        self.exempt_routes = frozenset(settings.exempt_routes)
+        self.service_seconds = 0.05
+        self._match = lru_cache(maxsize=4096)(self._match)
+        self._routes: list[BaseRoute] = []
+
+    def _match(self, method: str, path: str, root_path: str) -> Optional[BaseRoute]:
+        scope = {"type": "http", "method": method, "path": path, "root_path": root_path}
+        for route in self._routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return route
+        return None
+
+    def retry_after(self) -> int:
+        """Seconds until the queue has likely drained."""
+        backlog = (self.gate.queued + self.gate.in_use) / self.gate.limit
+        seconds = math.ceil(self.service_seconds * max(1.0, backlog))
+        return min(MAX_RETRY_AFTER, max(1, seconds))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self.settings.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        # routing happens further in; match against the same routes here
+        if not self._routes:
+            self._routes = list(scope["app"].router.routes)
+        route = self._match(scope["method"], scope["path"], scope.get("root_path", ""))
+        path = getattr(route, "path", None)
+        if route is None or path in self.exempt_routes:
+            await self.app(scope, receive, send)
+            return
+        scope["route"] = route  # labels shed requests in the metrics
+
+        priority = path in self.priority_routes
+        gates = [self.gate]
+        if path in self.route_gates:
+            # the route's own slot first, so waiting for it holds no
+            # connection-backed slot
+            gates.insert(0, self.route_gates[path])
+        deadline = time.monotonic() + self.settings.max_wait_seconds
+        held: list[AdmissionGate] = []
+        try:
+            for gate in gates:
+                reason = await gate.acquire(priority, deadline - time.monotonic())
+                if reason is not None:
+                    REQUESTS_SHED.labels(path, reason).inc()
+                    response = ORJSONResponse(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        content={"message": "Server is busy, retry later."},
+                        headers={"Retry-After": str(self.retry_after())},
+                    )
+                    await response(scope, receive, send)
+                    return
+                held.append(gate)
+
+            started = time.perf_counter()
+            await self.app(scope, receive, send)
+            self.service_seconds += SERVICE_TIME_WEIGHT * (
+                time.perf_counter() - started - self.service_seconds
+            )
+        finally:
+            for gate in held:
+                gate.release()
@@ -0,0 +1,120 @@
+"""Request metrics middleware and the Prometheus `/metrics` endpoint.
+
+`MetricsMiddleware` is plain ASGI (no `BaseHTTPMiddleware`), so it adds
+no task or body buffering per request; it only wraps `send` to see the
+status code and body size. Latency is labelled by route template
+("/api/v1/items/search", not the concrete URL) to keep label cardinality
+bounded; requests that match no route share the "<unmatched>" label.
+
+When PROMETHEUS_MULTIPROC_DIR is set (multi-worker deployments), the
+endpoint aggregates the metrics every worker wrote to that directory,
+including each worker's connection pool state (storage.pool_metrics).
+"""
+
+import os
+import time
+from fastapi import Request
+from fastapi.responses import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last response byte.",
+    ["method", "route", "status"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Response body size.",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+
+# labelled children cached per label tuple; `labels()` takes a lock and
+# validates its arguments on every call
+_latency_children: dict[tuple, object] = {}
+_size_children: dict[tuple, object] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """The path template of the route that handled the request."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Record latency, response size and in-flight count for every request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            # routing fills scope["route"] in place on the way down
+            route = route_template(scope)
+            key = (method, route, status_code)
+            latency = _latency_children.get(key)
+            if latency is None:
+                latency = _latency_children[key] = REQUEST_LATENCY.labels(
+                    method, route, str(status_code)
+                )
+            sizes = _size_children.get(key[:2])
+            if sizes is None:
+                sizes = _size_children[key[:2]] = RESPONSE_SIZE.labels(method, route)
+            latency.observe(elapsed)
+            sizes.observe(size)
+
+
+def _registry() -> CollectorRegistry:
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    from prometheus_client import multiprocess
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Serve all metrics in the Prometheus text format."""
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
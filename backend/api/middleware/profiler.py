@@ -0,0 +1,55 @@
+"""Per-request SQL profiling middleware and debug endpoint.
+
+Enabled with DB_PROFILE=true. Each request then runs inside a
+`query_profile()`, and its response carries `X-DB-Query-Count` and
+`X-DB-Time-Ms` headers. The headers are written when the response starts,
+so for streamed responses they cover only the queries run before the
+first byte. The last DB_PROFILE_HISTORY profiles (default 100) are kept
+for `GET /debug/queries`.
+"""
+
+import os
+from collections import deque
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from backend.storage.profiler import query_profile
+
+PROFILING_ENABLED = os.getenv("DB_PROFILE", "False").lower() == "true"
+
+recent_profiles: deque = deque(maxlen=int(os.getenv("DB_PROFILE_HISTORY", "100")))
+
+
+class QueryProfilerMiddleware:
+    """Attach the query count and DB time of each request to its response."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']} {scope['path']}"
+        with query_profile(label) as profile:
+
+            async def send_wrapper(message: Message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", ()))
+                    headers.append((b"x-db-query-count", str(profile.count).encode()))
+                    headers.append(
+                        (b"x-db-time-ms", f"{profile.seconds * 1000:.3f}".encode())
+                    )
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+        recent_profiles.append(profile)
+
+
+async def recent_queries(request: Request):
+    """The query breakdown of the most recent requests, newest first."""
+    return ORJSONResponse(
+        content=[profile.to_dict() for profile in reversed(recent_profiles)]
+    )
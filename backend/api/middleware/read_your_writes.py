@@ -0,0 +1,57 @@
+"""Read-your-writes window for replica routing.
+
+Reads may go to a replica that lags the primary, so a client that has
+just written could read its old state back. `ReadYourWritesMiddleware`
+stamps a `last_write` cookie on every successful write (any method other
+than GET, HEAD and OPTIONS that gets a status below 400), and
+`within_write_window` tells the read session dependency to keep that
+client on the primary for DB_READ_YOUR_WRITES_SECONDS (default 5).
+"""
+
+import math
+import time
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from backend.api.config.db_config import db_settings
+
+LAST_WRITE_COOKIE = "last_write"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def within_write_window(request: Request) -> bool:
+    """Whether the client wrote recently enough to need the primary."""
+    stamp = request.cookies.get(LAST_WRITE_COOKIE)
+    if not stamp:
+        return False
+    try:
+        written_at = float(stamp)
+    except ValueError:
+        return False
+    return time.time() - written_at < db_settings.read_your_writes_seconds
+
+
+class ReadYourWritesMiddleware:
+    """Mark clients that have just written so their reads use the primary."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.max_age = math.ceil(db_settings.read_your_writes_seconds)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={self.max_age}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
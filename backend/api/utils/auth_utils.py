@@ -2,15 +2,40 @@
 
 import bcrypt
 
+# stored passwords starting with this are placeholders no password matches
+UNUSABLE_PASSWORD_PREFIX = "!"
+# stored for bulk-imported users until their default password is hashed in
+# the background
+PENDING_PASSWORD_HASH = f"{UNUSABLE_PASSWORD_PREFIX}pending"
 
-def hash_password(password: str) -> str:
+
+def hash_password(password: str, rounds: int = 12) -> str:
     """Hash a password using bcrypt."""
     if not isinstance(password, str):
         raise ValueError("Password must be a string.")
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds))
     return hashed.decode("utf-8")
 
 
+def hash_passwords(passwords: list[str], rounds: int = 12) -> list[str]:
+    """Hash several passwords in one call (one process-pool task per chunk)."""
+    return [hash_password(password, rounds) for password in passwords]
+
+
+def hash_rounds(hashed_password: str) -> int:
+    """Return the bcrypt cost factor encoded in a hash."""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        raise ValueError("Not a bcrypt hash.")
+
+
+def is_bcrypt_hash(value: str) -> bool:
+    """Whether a stored password is a bcrypt hash (rather than the pending
+    placeholder or a plaintext password stored before hashing existed)."""
+    return value.startswith(("$2a$", "$2b$", "$2y$"))
+
+
 def password_matches(hashed_password: str, password: str) -> bool:
     """Check if a password matches the hashed password."""
     if not isinstance(hashed_password, str) or not isinstance(password, str):
@@ -7,3 +7,14 @@ class ItemStatus(Enum):
     DROPPED_OFF = "dropped off"
     CLAIMED = "claimed"
     COLLECTED = "collected"
+
+
+# statuses of items still waiting at a drop-off location
+OPEN_ITEM_STATUSES = (ItemStatus.DROPPED_OFF, ItemStatus.CLAIMED)
+
+# allowed status changes; CLAIMED -> DROPPED_OFF releases a mistaken claim
+ITEM_STATUS_TRANSITIONS = {
+    ItemStatus.DROPPED_OFF: frozenset({ItemStatus.CLAIMED}),
+    ItemStatus.CLAIMED: frozenset({ItemStatus.COLLECTED, ItemStatus.DROPPED_OFF}),
+    ItemStatus.COLLECTED: frozenset(),
+}
@@ -0,0 +1,25 @@
+"""HTTP caching helpers for pre-serialized responses."""
+
+from fastapi import Request, Response, status
+from backend.storage.reference_cache import CachedPayload
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header covers the ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def cached_json_response(request: Request, payload: CachedPayload) -> Response:
+    """Serve a cached payload, answering 304 when the client copy is current."""
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, payload.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=payload.body, media_type="application/json", headers=headers
+    )
@@ -0,0 +1,89 @@
+"""Process-pool backed password hashing.
+
+bcrypt is deliberately CPU-bound; running it on the event loop stalls every
+other request, and running it in threads still leaves it contending for
+one core per call. The hasher hands the work to a pool of processes and
+exposes awaitable APIs.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from backend.api.config.auth_config import AuthConfig, auth_config
+from backend.api.utils.auth_utils import (
+    hash_password,
+    hash_passwords,
+    hash_rounds,
+    password_matches,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """Async bcrypt hashing and verification on a process pool."""
+
+    def __init__(self, config: Optional[AuthConfig] = None):
+        if config is None:
+            config = auth_config
+        self.rounds = config.bcrypt_rounds
+        self.import_rounds = config.bcrypt_import_rounds
+        self.workers = config.password_hash_pool_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """Start the worker processes (idempotent)."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Password hashing pool started ({self.workers} workers).")
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("Password hashing pool stopped.")
+
+    async def _run(self, fn, *args):
+        self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def hash(self, password: str, rounds: Optional[int] = None) -> str:
+        """Hash one password."""
+        return await self._run(hash_password, password, rounds or self.rounds)
+
+    async def verify(self, hashed_password: str, password: str) -> bool:
+        """Check a password against its hash."""
+        return await self._run(password_matches, hashed_password, password)
+
+    async def hash_many(
+        self, passwords: list[str], rounds: Optional[int] = None
+    ) -> list[str]:
+        """Hash a batch of passwords spread evenly across the pool."""
+        if not passwords:
+            return []
+        chunk_size = -(-len(passwords) // self.workers)
+        chunks = [
+            passwords[start : start + chunk_size]
+            for start in range(0, len(passwords), chunk_size)
+        ]
+        results = await asyncio.gather(
+            *(
+                self._run(hash_passwords, chunk, rounds or self.rounds)
+                for chunk in chunks
+            )
+        )
+        return [hashed for chunk in results for hashed in chunk]
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a hash was made with a lower cost than currently configured."""
+        return hash_rounds(hashed_password) < self.rounds
+
+
+password_hasher = PasswordHasher()
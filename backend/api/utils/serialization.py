@@ -0,0 +1,27 @@
+"""Fast serialization of query results.
+
+Routes that return many rows select plain columns instead of ORM entities,
+so no identity map or attribute instrumentation is involved. The rows are
+encoded with orjson, which handles datetimes and enums natively.
+"""
+
+from typing import Sequence
+import orjson
+
+
+def row_dicts(rows: Sequence) -> list[dict]:
+    """Column-name keyed dicts for a sequence of result rows."""
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def dumps(value) -> bytes:
+    """Encode a value as compact JSON bytes."""
+    return orjson.dumps(value)
+
+
+def ndjson_lines(rows: Sequence) -> bytes:
+    """Encode result rows as newline-delimited JSON objects."""
+    return b"".join(orjson.dumps(row) + b"\n" for row in row_dicts(rows))
@@ -0,0 +1,59 @@
+"""Startup phase timing.
+
+`startup_timer` is created when this module is imported, which `run.py`
+does first, so the "imports" phase covers importing the application. The
+lifespan wraps each startup step in `phase()` and calls `report()` once it
+is ready to serve: the breakdown is logged and exported as the
+`app_startup_phase_seconds` gauge.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from prometheus_client import Gauge
+
+logger = logging.getLogger(__name__)
+
+STARTUP_PHASE_SECONDS = Gauge(
+    "app_startup_phase_seconds",
+    "Time spent in each startup phase of this process.",
+    ["phase"],
+    multiprocess_mode="max",
+)
+
+
+class StartupTimer:
+    """Durations of named startup phases, in the order they ran."""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def mark(self, name: str):
+        """End a phase that started when the previous one ended."""
+        now = time.perf_counter()
+        self.phases[name] = now - self._last
+        self._last = now
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as phase `name`."""
+        self._last = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name)
+
+    def report(self):
+        """Log the breakdown and export it to the metrics."""
+        for name, seconds in self.phases.items():
+            STARTUP_PHASE_SECONDS.labels(name).set(seconds)
+        breakdown = ", ".join(
+            f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items()
+        )
+        logger.info(
+            f"Started in {sum(self.phases.values()) * 1000:.0f}ms ({breakdown})."
+        )
+
+
+startup_timer = StartupTimer()
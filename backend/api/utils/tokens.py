@@ -0,0 +1,130 @@
+"""JWT access tokens and the dependency that authenticates requests.
+
+Tokens are signed with AUTH_JWT_SECRET_KEY and carry the user's id, name
+and email, so an authenticated request needs no database lookup to know
+who made it. Verification is stateless: the signature and expiry are
+checked once per token and the result is kept in an LRU of
+AUTH_TOKEN_CACHE_SIZE tokens; repeated requests with the same token only
+check its expiry and the in-memory revocation filter
+(backend.storage.revocations).
+"""
+
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime as dt, timezone as tz
+from functools import lru_cache
+from typing import Optional
+import jwt
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from backend.api.config.auth_config import AuthConfig, auth_config
+from backend.models.user import User
+from backend.storage.revocations import revocation_list
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """The user a verified access token was issued to."""
+
+    id: str
+    first_name: str
+    last_name: str
+    email: str
+    token_id: str
+    expires_at: int  # unix time
+
+    @property
+    def expires_at_datetime(self) -> dt:
+        """Expiry as a naive UTC datetime, like the database columns."""
+        return dt.fromtimestamp(self.expires_at, tz.utc).replace(tzinfo=None)
+
+    def to_dict(self):
+        """Convert AuthenticatedUser instance to dictionary."""
+        return {
+            "id": self.id,
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "email": self.email,
+        }
+
+
+class TokenService:
+    """Issues access tokens and verifies them with a cache."""
+
+    def __init__(self, config: Optional[AuthConfig] = None):
+        if config is None:
+            config = auth_config
+        self.secret = config.jwt_secret_key
+        self.algorithm = config.jwt_algorithm
+        self.lifetime = config.jwt_expiration_time * 60  # configured in minutes
+        self._decode = lru_cache(maxsize=config.token_cache_size)(self._decode)
+
+    def issue(self, user: User) -> tuple[str, int]:
+        """Sign a new access token for `user`; returns it and its expiry."""
+        now = int(time.time())
+        expires_at = now + self.lifetime
+        claims = {
+            "sub": user.id,
+            "jti": uuid.uuid4().hex,
+            "iat": now,
+            "exp": expires_at,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "email": user.email,
+        }
+        return jwt.encode(claims, self.secret, algorithm=self.algorithm), expires_at
+
+    def _decode(self, token: str) -> AuthenticatedUser:
+        claims = jwt.decode(
+            token,
+            self.secret,
+            algorithms=[self.algorithm],
+            options={"require": ["sub", "jti", "exp"]},
+        )
+        return AuthenticatedUser(
+            id=claims["sub"],
+            first_name=claims.get("first_name", ""),
+            last_name=claims.get("last_name", ""),
+            email=claims.get("email", ""),
+            token_id=claims["jti"],
+            expires_at=claims["exp"],
+        )
+
+    def verify(self, token: str) -> AuthenticatedUser:
+        """The token's user; raises jwt.InvalidTokenError if invalid or expired.
+
+        Revocation is not checked here.
+        """
+        user = self._decode(token)
+        # a cached token may have expired since it was first verified
+        if user.expires_at <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
+        return user
+
+
+token_service = TokenService()
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def _unauthorized(message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=message,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def require_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> AuthenticatedUser:
+    """Dependency for protected routes: the user of a valid bearer token."""
+    if credentials is None:
+        raise _unauthorized("Not authenticated.")
+    try:
+        user = token_service.verify(credentials.credentials)
+    except jwt.InvalidTokenError:
+        raise _unauthorized("Invalid or expired token.")
+    if await revocation_list.is_revoked(user.token_id):
+        raise _unauthorized("Token has been revoked.")
+    return user
@@ -0,0 +1,136 @@
+"""Incremental parsing and validation for bulk user imports."""
+
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator, Optional
+from backend.storage.pre_populated.seed_lists import USER_ROLES
+
+USER_IMPORT_FIELDS = ("id", "first_name", "last_name", "email", "role_name")
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/jsonl"}
+MAX_LINE_BYTES = 64 * 1024
+
+
+class ImportRowError(ValueError):
+    """A single import row could not be parsed or validated."""
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without buffering the whole body."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        if len(pending) > MAX_LINE_BYTES:
+            raise ImportRowError(f"Line longer than {MAX_LINE_BYTES} bytes.")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+    if pending:
+        yield pending.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+class _QueuedLines:
+    """Lines waiting for a csv.reader, which reads until none are left."""
+
+    def __init__(self):
+        self.lines: deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], content_type: str
+) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    """Yield `(line_number, record, error)` for each non-blank upload record.
+
+    CSV records may span lines (quoted fields containing newlines); they are
+    numbered by the line they start on.
+    """
+    if content_type in NDJSON_CONTENT_TYPES:
+        line_number = 0
+        async for line in iter_lines(chunks):
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"Invalid JSON: {e.msg}."
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Each line must be a JSON object."
+                continue
+            yield line_number, record, None
+        return
+
+    # one reader for the whole upload, handed each record's lines once the
+    # record is complete, i.e. once its quotes are balanced
+    queued = _QueuedLines()
+    reader = csv.reader(queued)
+    header: Optional[list[str]] = None
+    line_number = 0
+    start = 0
+    quotes = 0
+    size = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not queued.lines:
+            if not line.strip():
+                continue
+            start, quotes, size = line_number, 0, 0
+        queued.lines.append(line + "\n")
+        quotes += line.count('"')
+        size += len(line)
+        if quotes % 2:
+            if size > MAX_LINE_BYTES:
+                raise ImportRowError(
+                    f"Record starting on line {start} is longer than "
+                    f"{MAX_LINE_BYTES} bytes (unclosed quote?)."
+                )
+            continue
+
+        try:
+            values = next(reader)
+        except csv.Error as e:
+            queued.lines.clear()
+            yield start, None, f"Invalid CSV: {e}."
+            continue
+        if header is None:
+            header = [value.strip().lower() for value in values]
+            missing = [field for field in USER_IMPORT_FIELDS if field not in header]
+            if missing:
+                raise ImportRowError(
+                    f"CSV header is missing columns: {', '.join(missing)}."
+                )
+            continue
+        yield start, dict(zip(header, values)), None
+    if queued.lines:
+        yield start, None, "Invalid CSV: unclosed quote."
+
+
+def validate_user_row(record: dict) -> dict:
+    """Validate one import record, returning the cleaned user fields."""
+    cleaned = {
+        field: str(record.get(field) or "").strip() for field in USER_IMPORT_FIELDS
+    }
+    if cleaned["role_name"].lower() not in USER_ROLES:
+        raise ImportRowError(
+            f"Invalid role name: {cleaned['role_name']}. "
+            f"Valid roles are: {', '.join(USER_ROLES)}."
+        )
+    if not all(cleaned[field] for field in ("id", "first_name", "last_name", "email")):
+        raise ImportRowError("Id, first name, last name, and email are required.")
+    if len(cleaned["id"]) > 6:
+        raise ImportRowError("Id must be at most 6 characters.")
+    if len(cleaned["first_name"]) > 120 or len(cleaned["last_name"]) > 120:
+        raise ImportRowError("Names must be at most 120 characters.")
+    if "@" not in cleaned["email"]:
+        raise ImportRowError(f"Invalid email: {cleaned['email']}.")
+    return cleaned
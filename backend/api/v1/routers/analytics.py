@@ -0,0 +1,90 @@
+"""Routes for dashboard analytics, served from the item rollups."""
+
+from datetime import date, datetime as dt, timedelta, timezone as tz
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.utils.constants import OPEN_ITEM_STATUSES, ItemStatus
+from backend.storage.database import get_async_read_db
+from backend.storage.rollups import DIMENSIONS, daily_totals, item_totals
+
+analytics_router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+# longest daily series one request may ask for
+MAX_DAYS = 366
+
+
+def _parse_statuses(value: Optional[str]) -> Optional[list[ItemStatus]]:
+    """Comma separated status values, defaulting to the open ones; None if invalid."""
+    if not value:
+        return list(OPEN_ITEM_STATUSES)
+    try:
+        return [ItemStatus(part.strip()) for part in value.split(",")]
+    except ValueError:
+        return None
+
+
+@analytics_router.get("/open-items", status_code=status.HTTP_200_OK)
+async def get_open_items(
+    by: str = Query("location,category"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Number of open items per drop-off location and/or category."""
+    dimensions = [part.strip() for part in by.split(",") if part.strip()]
+    if not dimensions or any(name not in DIMENSIONS for name in dimensions):
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": f"'by' must list any of: {', '.join(DIMENSIONS)}."},
+        )
+    statuses = _parse_statuses(status_filter)
+    if statuses is None:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid item status."},
+        )
+
+    totals = await item_totals(db, list(dict.fromkeys(dimensions)), statuses)
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "statuses": [item_status.value for item_status in statuses],
+            "total": sum(row["count"] for row in totals),
+            "groups": totals,
+        },
+    )
+
+
+@analytics_router.get("/daily", status_code=status.HTTP_200_OK)
+async def get_daily_items(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    location: Optional[int] = Query(None),
+    category: Optional[int] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Items registered per day (default: the last 30), by current status."""
+    end = end or dt.now(tz.utc).date()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days >= MAX_DAYS:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": f"'from' must not be after 'to', "
+                f"and the range is at most {MAX_DAYS} days."
+            },
+        )
+    statuses = _parse_statuses(status_filter)
+    if statuses is None:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid item status."},
+        )
+
+    days = await daily_totals(db, start, end, statuses, location, category)
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"from": start, "to": end, "days": days},
+    )
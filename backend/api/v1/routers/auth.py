@@ -0,0 +1,110 @@
+"""Routes for logging in and out."""
+
+import hmac
+from datetime import datetime as dt, timezone as tz
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.utils.auth_utils import (
+    PENDING_PASSWORD_HASH,
+    UNUSABLE_PASSWORD_PREFIX,
+    generate_default_password,
+    is_bcrypt_hash,
+)
+from backend.api.utils.password_hasher import password_hasher
+from backend.api.utils.tokens import AuthenticatedUser, require_user, token_service
+from backend.models.user import User
+from backend.storage.database import get_async_db
+from backend.storage.revocations import revocation_list
+
+auth_router = APIRouter(prefix="/auth", tags=["auth"])
+
+# verified against when the user does not exist, so unknown users take as
+# long to reject as wrong passwords
+_dummy_hash: Optional[str] = None
+
+
+async def _unknown_user_hash() -> str:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await password_hasher.hash("not a password")
+    return _dummy_hash
+
+
+@auth_router.post("/login", status_code=status.HTTP_200_OK)
+async def login(
+    credentials: dict = Body(...), db: AsyncSession = Depends(get_async_db)
+):
+    """Exchange a user id or email and password for an access token.
+
+    Passwords hashed with a lower bcrypt cost than configured (e.g. bulk
+    imported defaults) are re-hashed at the current cost on success, as are
+    imported users' default passwords not yet hashed in the background and
+    passwords stored in plaintext before passwords were hashed.
+    """
+    username: str = str(credentials.get("username") or "").strip()
+    password: str = str(credentials.get("password") or "")
+    if not username or not password:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "username (id or email) and password are required."},
+        )
+
+    user: Optional[User] = (
+        await db.execute(
+            select(User).where(or_(User.id == username, User.email == username))
+        )
+    ).scalar_one_or_none()
+    hashed = user is not None and is_bcrypt_hash(user.hashed_password)
+    if hashed:
+        matched = await password_hasher.verify(user.hashed_password, password)
+    else:
+        # still pay for a bcrypt check so timings give nothing away
+        matched = await password_hasher.verify(await _unknown_user_hash(), password)
+        if user is not None:
+            expected = user.hashed_password
+            if expected == PENDING_PASSWORD_HASH:
+                expected = generate_default_password(user.email, user.first_name)
+            elif expected.startswith(UNUSABLE_PASSWORD_PREFIX):
+                expected = None  # no password matches
+            matched = expected is not None and hmac.compare_digest(
+                password.encode(), expected.encode()
+            )
+    if not matched or user is None:
+        return ORJSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={"message": "Invalid username or password."},
+        )
+
+    if not hashed or password_hasher.needs_rehash(user.hashed_password):
+        user.hashed_password = await password_hasher.hash(password)
+        user.updated_at = dt.now(tz.utc).replace(tzinfo=None)
+        await db.commit()
+
+    token, expires_at = token_service.issue(user)
+    return ORJSONResponse(
+        content={
+            "access_token": token,
+            "token_type": "bearer",
+            "expires_at": expires_at,
+            "user": user.to_dict(),
+        }
+    )
+
+
+@auth_router.post("/logout", status_code=status.HTTP_200_OK)
+async def logout(
+    user: AuthenticatedUser = Depends(require_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Revoke the access token used for this request."""
+    await revocation_list.revoke(db, user.token_id, user.id, user.expires_at_datetime)
+    return ORJSONResponse(content={"message": "Logged out."})
+
+
+@auth_router.get("/me", status_code=status.HTTP_200_OK)
+async def get_current_user(user: AuthenticatedUser = Depends(require_user)):
+    """The authenticated user, read from the token alone."""
+    return ORJSONResponse(content=user.to_dict())
@@ -1,24 +1,21 @@
-"""Routes for user-related operations."""
+"""Routes for item category operations."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from fastapi.responses import JSONResponse
-from backend.storage.database import get_db
-from backend.storage.pre_populated.seed_lists import ITEM_CATEGORIES
-from backend.models.item_category import ItemCategory
+from fastapi import APIRouter, Request, status
+from fastapi.responses import ORJSONResponse
+from backend.api.utils.http_cache import cached_json_response
+from backend.storage.reference_cache import reference_cache
 
 categories_router = APIRouter(prefix="/categories", tags=["categories"])
 
 
 @categories_router.get("/all", status_code=status.HTTP_200_OK)
-def add_user(db=Depends(get_db)):
+async def get_all_categories(request: Request):
     """Get all item categories the database."""
-    categories = db.query(ItemCategory).all()
-    if not categories:
-        return JSONResponse(
+    categories = await reference_cache.get("categories")
+    if not categories.count:
+        return ORJSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={"message": "No categories found."},
         )
 
-    return JSONResponse(
-        content={"categories": [category.to_dict() for category in categories]}
-    )
+    return cached_json_response(request, categories)
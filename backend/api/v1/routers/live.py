@@ -0,0 +1,144 @@
+"""Routes pushing item events to subscribed clients."""
+
+import asyncio
+from contextlib import suppress
+from typing import Optional
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from backend.storage.item_feed import FeedEvent, Subscription, item_feed
+
+live_router = APIRouter(prefix="/live", tags=["live"])
+
+# comment sent on idle streams so proxies do not time them out
+KEEPALIVE_SECONDS = 15.0
+SSE_KEEPALIVE = b": keepalive\n\n"
+
+
+def _ids(value) -> frozenset[int]:
+    """Parse ids given as "1,2,3" or a JSON list; raises ValueError."""
+    if value is None:
+        return frozenset()
+    if isinstance(value, str):
+        value = [part for part in value.split(",") if part.strip()]
+    if not isinstance(value, list):
+        raise ValueError(value)
+    return frozenset(int(part) for part in value)
+
+
+@live_router.get("/items", status_code=status.HTTP_200_OK)
+async def stream_items(categories: Optional[str] = None, rooms: Optional[str] = None):
+    """Stream item events as server-sent events.
+
+    Sends every item dropped off in one of `categories` or found in one of
+    `rooms` (comma separated ids; every item if neither is given), and
+    every status change of such an item. A client that falls behind is
+    disconnected and should reconnect.
+    """
+    try:
+        subscription = item_feed.subscribe(_ids(categories), _ids(rooms))
+    except ValueError:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "categories and rooms must be comma separated ids."},
+        )
+    if subscription is None:
+        return ORJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"message": "Too many live subscribers, try again later."},
+            headers={"Retry-After": "5"},
+        )
+
+    async def events():
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.next(), KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield SSE_KEEPALIVE
+                    continue
+                if event is None:
+                    return
+                yield event.sse
+        finally:
+            item_feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _send_events(websocket: WebSocket, subscription: Subscription):
+    while True:
+        event = await subscription.next()
+        if event is None:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return
+        await websocket.send_text(event.json)
+
+
+async def _receive_updates(websocket: WebSocket, subscription: Subscription):
+    """Apply subscription changes until the client disconnects."""
+    # replies go through the subscription's queue, so one task sends
+    while True:
+        try:
+            message = await websocket.receive_json()
+        except WebSocketDisconnect:
+            return
+        except ValueError:
+            message = None
+        try:
+            if not isinstance(message, dict):
+                raise ValueError(message)
+            item_feed.update(
+                subscription,
+                _ids(message.get("categories")),
+                _ids(message.get("rooms")),
+            )
+            reply = {"event": "subscribed", **subscription.to_dict()}
+        except (TypeError, ValueError):
+            reply = {
+                "event": "error",
+                "message": 'Send {"categories": [ids], "rooms": [ids]}.',
+            }
+        try:
+            subscription.queue.put_nowait(FeedEvent(reply))
+        except asyncio.QueueFull:
+            pass  # already far behind; it is about to be dropped
+
+
+@live_router.websocket("/items")
+async def item_updates(
+    websocket: WebSocket, categories: Optional[str] = None, rooms: Optional[str] = None
+):
+    """Push item events over a WebSocket.
+
+    Follows the same items as the event stream. Sending
+    {"categories": [...], "rooms": [...]} replaces what the connection
+    follows; each change is acknowledged with a "subscribed" event.
+    """
+    try:
+        subscription = item_feed.subscribe(_ids(categories), _ids(rooms))
+    except ValueError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if subscription is None:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    try:
+        await websocket.accept()
+        subscription.queue.put_nowait(
+            FeedEvent({"event": "subscribed", **subscription.to_dict()})
+        )
+        sending = asyncio.create_task(_send_events(websocket, subscription))
+        try:
+            await _receive_updates(websocket, subscription)
+        finally:
+            sending.cancel()
+            with suppress(asyncio.CancelledError, WebSocketDisconnect):
+                await sending
+    finally:
+        item_feed.unsubscribe(subscription)
@@ -0,0 +1,398 @@
+"""Routes for lost item operations."""
+
+import base64
+import logging
+from datetime import datetime as dt, timezone as tz
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, Query, Request, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.utils.constants import ItemStatus, OPEN_ITEM_STATUSES
+from backend.api.utils.serialization import ndjson_lines, row_dicts
+from backend.api.utils.tokens import AuthenticatedUser, require_user
+from backend.storage import database
+from backend.storage.counters import item_status_counts
+from backend.storage.database import get_async_db, get_async_read_db
+from backend.storage.duplicates import duplicate_index
+from backend.models.item_duplicate import ItemDuplicate
+from backend.models.lost_item import LostItem
+from backend.storage.item_queries import listing_statement
+from backend.storage.item_events import (
+    item_event_writer,
+    item_timeline,
+    transition_statement,
+)
+from backend.storage.matching import indexed_item, match_index
+from backend.storage.search import SearchQuery, search_engine
+
+logger = logging.getLogger(__name__)
+
+lost_items_router = APIRouter(prefix="/items", tags=["items"])
+
+STREAM_BATCH_SIZE = 1000
+
+
+def encode_cursor(created_at: dt, item_id: int) -> str:
+    """Opaque cursor for the position after (created_at, id)."""
+    raw = f"{created_at.isoformat()}|{item_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[dt, int]:
+    """Inverse of encode_cursor; raises ValueError on malformed input."""
+    try:
+        created_at, item_id = (
+            base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        )
+        return dt.fromisoformat(created_at), int(item_id)
+    except (UnicodeError, ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor.") from e
+
+
+def _parse_status(item_status: Optional[str]) -> Optional[ItemStatus]:
+    """Parse a status query parameter; raises ValueError with a user message."""
+    try:
+        return ItemStatus(item_status) if item_status else None
+    except ValueError:
+        raise ValueError(
+            f"Invalid status: {item_status}. Valid statuses are: "
+            f"{', '.join(s.value for s in ItemStatus)}."
+        )
+
+
+@lost_items_router.post("/add", status_code=status.HTTP_201_CREATED)
+async def add_item(item: dict = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """Register a found item dropped off at a drop-off location.
+
+    The item is matched against open lost reports straight away; the
+    reports it matched are returned and recorded for their owners. Items
+    it likely duplicates (same text and room, or the same photo) are
+    returned and flagged too.
+    """
+    name: str = str(item.get("name") or "").strip()
+    found_by: str = str(item.get("found_by") or "").strip()
+    if not name or not found_by:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Name and found_by are required."},
+        )
+    try:
+        category = int(item["category"])
+        found_in = int(item["found_in"])
+        dropped_off_at = int(item["dropped_off_at"])
+    except (KeyError, TypeError, ValueError):
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "category, found_in and dropped_off_at must be ids."},
+        )
+
+    lost_item = LostItem(
+        name=name,
+        description=str(item.get("description") or "").strip()
+        or "No description provided",
+        image_url=str(item.get("image_url") or ""),
+        status=ItemStatus.DROPPED_OFF,
+        found_by=found_by,
+        dropped_off_by=str(item.get("dropped_off_by") or found_by).strip(),
+        found_in=found_in,
+        dropped_off_at=dropped_off_at,
+        category=category,
+    )
+    try:
+        db.add(lost_item)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Unknown user, room, location or category."},
+        )
+    except Exception as e:
+        await db.rollback()
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": "An error occurred while adding the item."},
+        )
+
+    item_event_writer.record(
+        lost_item.id, None, ItemStatus.DROPPED_OFF, found_by, lost_item.created_at
+    )
+    search_engine.add_item(lost_item)
+    # the item is saved: a failure past this point must not turn into a 500
+    # that makes the client register it again
+    item_id, image_url = lost_item.id, lost_item.image_url
+    item = indexed_item(lost_item)
+    matched_reports, duplicates = [], []
+    try:
+        matched_reports = await match_index.match_drop_off(db, item)
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Matching item {item_id} against reports failed: {e}")
+    try:
+        duplicates = await duplicate_index.check(db, item, image_url)
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Checking item {item_id} for duplicates failed: {e}")
+    return ORJSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={
+            "message": "Item added successfully",
+            "item_id": item_id,
+            "matched_reports": matched_reports,
+            "possible_duplicates": duplicates,
+        },
+    )
+
+
+@lost_items_router.post("/{item_id}/transition", status_code=status.HTTP_200_OK)
+async def transition_item(
+    item_id: int,
+    change: dict = Body(...),
+    user: AuthenticatedUser = Depends(require_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Move an item to another status: claim, collect or release a claim.
+
+    Only the transitions in ITEM_STATUS_TRANSITIONS are allowed; a request
+    that lost a race with a concurrent transition gets 409. The item is
+    claimed or collected by, and the event recorded under, the
+    authenticated user; naming anyone else as `actor` is refused.
+    """
+    actor = user.id
+    if change.get("actor") not in (None, "", actor):
+        return ORJSONResponse(
+            status_code=status.HTTP_403_FORBIDDEN,
+            content={"message": "Items can only be moved on your own behalf."},
+        )
+    try:
+        to_status = _parse_status(change.get("status"))
+    except ValueError as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST, content={"message": str(e)}
+        )
+    if to_status is None:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "status is required."},
+        )
+
+    now = dt.now(tz.utc).replace(tzinfo=None)
+    try:
+        row = (
+            await db.execute(transition_statement(item_id, to_status, actor, now))
+        ).first()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": f"Unknown user: {actor}."},
+        )
+    if row is None:
+        current = (
+            await db.execute(select(LostItem.status).where(LostItem.id == item_id))
+        ).scalar()
+        if current is None:
+            return ORJSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"message": f"Lost item {item_id} not found."},
+            )
+        return ORJSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={
+                "message": f"Cannot move an item that is {current.value} "
+                f"to {to_status.value}."
+            },
+        )
+
+    item_event_writer.record(item_id, row.from_status, to_status, actor, now)
+    search_engine.add_item(row)
+    if to_status not in OPEN_ITEM_STATUSES:
+        match_index.remove_item(item_id)
+    return ORJSONResponse(
+        content={
+            "item_id": item_id,
+            "from_status": row.from_status,
+            "status": to_status,
+        }
+    )
+
+
+@lost_items_router.get("/{item_id}/timeline", status_code=status.HTTP_200_OK)
+async def get_item_timeline(
+    item_id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get an item's status history, oldest first, replayed from its events."""
+    events = await item_timeline(db, item_id)
+    if not events:
+        return ORJSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": f"No history for lost item {item_id}."},
+        )
+    return ORJSONResponse(
+        content={
+            "item_id": item_id,
+            "status": events[-1]["to_status"],
+            "events": events,
+        }
+    )
+
+
+@lost_items_router.get("/{item_id}/duplicates", status_code=status.HTTP_200_OK)
+async def get_item_duplicates(
+    item_id: int, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get the items flagged as likely duplicates of an item, or of which it is one."""
+    rows = await db.execute(
+        select(ItemDuplicate)
+        .where(
+            or_(ItemDuplicate.item_id == item_id, ItemDuplicate.duplicate_of == item_id)
+        )
+        .order_by(ItemDuplicate.text_similarity.desc())
+    )
+    return ORJSONResponse(
+        content={
+            "item_id": item_id,
+            "duplicates": [duplicate.to_dict() for duplicate in rows.scalars()],
+        }
+    )
+
+
+@lost_items_router.get("", status_code=status.HTTP_200_OK)
+async def list_items(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    item_status: Optional[str] = Query(None, alias="status"),
+    open_only: bool = Query(False, alias="open"),
+    dropped_off_at: Optional[int] = None,
+    category: Optional[int] = None,
+    found_in: Optional[int] = None,
+    archived: bool = False,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """List lost items by creation time using keyset (cursor) pagination.
+
+    `open=true` keeps only items still at a drop-off location (dropped off or
+    claimed); combine it with `dropped_off_at` and `category` for the front
+    desk view.
+
+    Collected items are moved to an archive after DB_ARCHIVE_AFTER_DAYS;
+    `archived=true` lists the archive instead of the current items.
+
+    `format=ndjson` streams every item after the cursor, one JSON object per
+    line, with constant memory; `limit` does not apply to the stream.
+    """
+    try:
+        parsed_status = _parse_status(item_status)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST, content={"message": str(e)}
+        )
+
+    statement = listing_statement(
+        order=order,
+        after=after,
+        status=parsed_status,
+        open_only=open_only,
+        dropped_off_at=dropped_off_at,
+        category=category,
+        found_in=found_in,
+        archived=archived,
+    )
+    if format == "ndjson":
+        return StreamingResponse(
+            _stream_items(statement, database.read_sessionLocal(request)),
+            media_type="application/x-ndjson",
+        )
+
+    try:
+        rows = (await db.execute(statement.limit(limit + 1))).all()
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": "An error occurred while listing items."},
+        )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return ORJSONResponse(
+        content={"items": row_dicts(rows), "next_cursor": next_cursor}
+    )
+
+
+async def _stream_items(statement, sessions):
+    """Yield NDJSON chunks from a server-side cursor, one batch at a time."""
+    # the stream outlives the request's dependency session, so it owns one
+    async with sessions() as session:
+        result = await session.stream(
+            statement.execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            yield ndjson_lines(rows)
+
+
+@lost_items_router.get("/search", status_code=status.HTTP_200_OK)
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[int] = None,
+    found_in: Optional[int] = None,
+    dropped_off_at: Optional[int] = None,
+    item_status: Optional[str] = Query(None, alias="status"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Search lost items by name and description, best matches first."""
+    try:
+        parsed_status = _parse_status(item_status)
+    except ValueError as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST, content={"message": str(e)}
+        )
+
+    query = SearchQuery(
+        text=q,
+        category=category,
+        found_in=found_in,
+        dropped_off_at=dropped_off_at,
+        status=parsed_status,
+        limit=limit,
+    )
+    try:
+        results = await search_engine.search(db, query)
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": "An error occurred while searching items."},
+        )
+    return ORJSONResponse(content={"items": results, "count": len(results)})
+
+
+@lost_items_router.get("/counts", status_code=status.HTTP_200_OK)
+async def get_item_counts(
+    approximate: bool = False, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get the number of lost items per status.
+
+    Exact counts come from trigger-maintained counters; `approximate=true`
+    reads the planner's statistics instead.
+    """
+    try:
+        counts = await item_status_counts(db, approximate=approximate)
+    except Exception as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"message": "An error occurred while counting items."},
+        )
+    return ORJSONResponse(
+        content={
+            "counts": {item_status.value: n for item_status, n in counts.items()},
+            "total": sum(counts.values()),
+        }
+    )
@@ -0,0 +1,173 @@
+"""Routes for uploading and serving item images."""
+
+import logging
+from datetime import datetime as dt, timezone as tz
+from pathlib import Path
+from typing import Optional
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import FileResponse, ORJSONResponse, RedirectResponse
+from sqlalchemy import exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.config.storage_config import storage_settings
+from backend.api.utils.http_cache import etag_matches
+from backend.models.lost_item import LostItem
+from backend.storage.database import get_async_db
+from backend.storage.duplicates import duplicate_index
+from backend.storage.matching import ITEM_COLUMNS, indexed_item
+from backend.storage.media_store import (
+    MEDIA_TYPES,
+    MediaError,
+    media_store,
+    parse_file_name,
+)
+from backend.storage.thumbnails import thumbnail_worker
+
+logger = logging.getLogger(__name__)
+
+media_router = APIRouter(prefix="/media", tags=["media"])
+
+# content-addressed files never change, so clients may cache them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@media_router.post("/images", status_code=status.HTTP_201_CREATED)
+async def upload_image(
+    request: Request,
+    item_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Upload an image as the raw request body, optionally attaching it to an item.
+
+    The body is streamed to disk while it is hashed, so memory use does not
+    depend on the image size. Uploading an image that is already stored
+    returns the existing one. The thumbnail is generated in the background;
+    until it exists its URL redirects to the original. An attached image is
+    checked against recent items' images for likely duplicates.
+    """
+    if item_id is not None:
+        found = await db.scalar(select(exists().where(LostItem.id == item_id)))
+        # release the connection while the body streams in
+        await db.commit()
+        if not found:
+            return ORJSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"message": f"Lost item {item_id} not found."},
+            )
+
+    try:
+        stored = await media_store.save_stream(request.stream())
+    except MediaError as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST, content={"message": str(e)}
+        )
+
+    url = str(request.app.url_path_for("get_image", file_name=stored.file_name))
+    content = {
+        "url": url,
+        "thumbnail_url": request.app.url_path_for(
+            "get_thumbnail", file_name=stored.file_name
+        ),
+        "size": stored.size,
+        "deduplicated": stored.deduplicated,
+    }
+    if item_id is not None:
+        item = (
+            await db.execute(
+                update(LostItem)
+                .where(LostItem.id == item_id)
+                .values(image_url=url, updated_at=dt.now(tz.utc).replace(tzinfo=None))
+                .returning(*ITEM_COLUMNS)
+            )
+        ).first()
+        await db.commit()
+        if item is None:
+            # deleted while the image was uploading
+            media_store.discard(stored)
+            return ORJSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"message": f"Lost item {item_id} not found."},
+            )
+        # the image is attached: a failure past this point must not turn
+        # into a 500 that makes the client upload it again
+        content["possible_duplicates"] = []
+        try:
+            content["possible_duplicates"] = await duplicate_index.check(
+                db, indexed_item(item), url
+            )
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Checking item {item_id} for duplicates failed: {e}")
+
+    thumbnail = media_store.thumbnail_path(stored.digest)
+    if not thumbnail.exists():
+        thumbnail_worker.submit(
+            media_store.original_path(stored.digest, stored.ext), thumbnail
+        )
+
+    return ORJSONResponse(
+        status_code=(
+            status.HTTP_200_OK if stored.deduplicated else status.HTTP_201_CREATED
+        ),
+        content=content,
+    )
+
+
+def _serve_file(request: Request, path: Path, digest: str, media_type: str):
+    """Serve a stored file with immutable caching and Range support."""
+    headers = {"ETag": f'"{digest}"', "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if storage_settings.accel_redirect_prefix:
+        # nginx serves the file itself (sendfile, ranges); we only authorize it
+        relative = path.relative_to(media_store.root).as_posix()
+        headers["X-Accel-Redirect"] = (
+            f"{storage_settings.accel_redirect_prefix.rstrip('/')}/{relative}"
+        )
+        return Response(media_type=media_type, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+@media_router.get("/images/{file_name}", status_code=status.HTTP_200_OK)
+async def get_image(file_name: str, request: Request):
+    """Serve an uploaded image."""
+    try:
+        digest, ext = parse_file_name(file_name)
+    except MediaError as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND, content={"message": str(e)}
+        )
+    path = media_store.original_path(digest, ext)
+    if not path.is_file():
+        return ORJSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND, content={"message": "Unknown image."}
+        )
+    return _serve_file(request, path, digest, MEDIA_TYPES[ext])
+
+
+@media_router.get("/thumbnails/{file_name}", status_code=status.HTTP_200_OK)
+async def get_thumbnail(file_name: str, request: Request):
+    """Serve an image's thumbnail, or redirect to the image while it is generated.
+
+    Images whose thumbnail failed keep redirecting; they are not retried.
+    """
+    try:
+        digest, ext = parse_file_name(file_name)
+    except MediaError as e:
+        return ORJSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND, content={"message": str(e)}
+        )
+    path = media_store.thumbnail_path(digest)
+    if path.is_file():
+        return _serve_file(request, path, digest, "image/jpeg")
+
+    original = media_store.original_path(digest, ext)
+    if not original.is_file():
+        return ORJSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND, content={"message": "Unknown image."}
+        )
+    thumbnail_worker.submit(original, path)
+    return RedirectResponse(
+        request.app.url_path_for("get_image", file_name=file_name),
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={"Cache-Control": "no-store"},
+    )
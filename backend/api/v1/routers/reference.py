@@ -0,0 +1,27 @@
+"""Routes for the cached reference lists (rooms, drop-off locations, roles)."""
+
+from fastapi import APIRouter, Request, status
+from backend.api.utils.http_cache import cached_json_response
+from backend.storage.reference_cache import reference_cache
+
+reference_router = APIRouter(prefix="/reference", tags=["reference"])
+
+
+@reference_router.get("/rooms", status_code=status.HTTP_200_OK)
+async def get_rooms(request: Request):
+    """Get all rooms."""
+    return cached_json_response(request, await reference_cache.get("rooms"))
+
+
+@reference_router.get("/drop-off-locations", status_code=status.HTTP_200_OK)
+async def get_drop_off_locations(request: Request):
+    """Get all drop-off locations."""
+    return cached_json_response(
+        request, await reference_cache.get("drop_off_locations")
+    )
+
+
+@reference_router.get("/roles", status_code=status.HTTP_200_OK)
+async def get_roles(request: Request):
+    """Get all user roles."""
+    return cached_json_response(request, await reference_cache.get("roles"))
@@ -0,0 +1,154 @@
+"""Routes for lost report operations."""
+
+from datetime import datetime as dt, timezone as tz
+from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.utils.serialization import row_dicts
+from backend.models.lost_report import LostReport, ReportMatch
+from backend.storage.database import get_async_db, get_async_read_db
+from backend.storage.matching import (
+    MAX_REPORT_WINDOW,
+    REPORT_COLUMNS,
+    indexed_report,
+    match_index,
+)
+
+reports_router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+def _parse_timestamp(value) -> dt:
+    """Parse an ISO 8601 timestamp into naive UTC; raises ValueError."""
+    parsed = dt.fromisoformat(str(value))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(tz.utc).replace(tzinfo=None)
+    return parsed
+
+
+@reports_router.post("/add", status_code=status.HTTP_201_CREATED)
+async def add_report(
+    report: dict = Body(...),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Report a lost item and get the found items that best match it."""
+    reported_by: str = str(report.get("reported_by") or "").strip()
+    description: str = str(report.get("description") or "").strip()
+    if not reported_by or not description:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "reported_by and description are required."},
+        )
+    now = dt.now(tz.utc).replace(tzinfo=None)
+    try:
+        category = int(report["category"])
+        room = int(report["room"]) if report.get("room") is not None else None
+        lost_from = _parse_timestamp(report["lost_from"])
+        lost_until = (
+            _parse_timestamp(report["lost_until"]) if report.get("lost_until") else now
+        )
+    except (KeyError, TypeError, ValueError):
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": "category and lost_from are required; room must be an "
+                "id and times ISO 8601 timestamps."
+            },
+        )
+    if not lost_from <= lost_until or lost_until - lost_from > MAX_REPORT_WINDOW:
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": "lost_from must precede lost_until, at most "
+                f"{MAX_REPORT_WINDOW.days} days apart."
+            },
+        )
+
+    lost_report = LostReport(
+        reported_by=reported_by,
+        category=category,
+        room=room,
+        lost_from=lost_from,
+        lost_until=lost_until,
+        description=description,
+    )
+    try:
+        db.add(lost_report)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Unknown user, room or category."},
+        )
+
+    indexed = indexed_report(lost_report)
+    match_index.add_report(indexed)
+    matches = await match_index.match_report(db, indexed, limit=limit)
+    return ORJSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={"report": lost_report.to_dict(), "matches": matches},
+    )
+
+
+@reports_router.get("/{report_id}/matches", status_code=status.HTTP_200_OK)
+async def get_report_matches(
+    report_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Get the current best matches for a report.
+
+    `drop_offs` lists the items that matched the report when they were
+    dropped off, newest first.
+    """
+    row = (
+        await db.execute(
+            select(*REPORT_COLUMNS, LostReport.is_open).where(
+                LostReport.id == report_id
+            )
+        )
+    ).first()
+    if row is None:
+        return ORJSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": f"Report {report_id} not found."},
+        )
+    matches = (
+        await match_index.match_report(db, indexed_report(row), limit=limit)
+        if row.is_open
+        else []
+    )
+    drop_offs = await db.execute(
+        select(ReportMatch.item_id, ReportMatch.score, ReportMatch.created_at)
+        .where(ReportMatch.report_id == report_id)
+        .order_by(ReportMatch.created_at.desc())
+        .limit(limit)
+    )
+    return ORJSONResponse(
+        content={
+            "is_open": row.is_open,
+            "matches": matches,
+            "drop_offs": row_dicts(drop_offs.all()),
+        }
+    )
+
+
+@reports_router.post("/{report_id}/close", status_code=status.HTTP_200_OK)
+async def close_report(report_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Close a report once the item is found (or given up on)."""
+    result = await db.execute(
+        update(LostReport)
+        .where(LostReport.id == report_id)
+        .values(is_open=False, updated_at=dt.now(tz.utc).replace(tzinfo=None))
+    )
+    await db.commit()
+    if result.rowcount == 0:
+        return ORJSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": f"Report {report_id} not found."},
+        )
+    match_index.remove_report(report_id)
+    return ORJSONResponse(content={"message": "Report closed."})
@@ -1,21 +1,40 @@
 """Routes for user-related operations."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from fastapi.responses import JSONResponse
-from backend.storage.database import get_db
+from datetime import datetime as dt, timezone as tz
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Body
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.storage.database import get_async_db, get_async_read_db
+from backend.storage.counters import user_count
 from backend.models.user import User
-from backend.api.utils.auth_utils import hash_password, generate_default_password
+from backend.api.utils.auth_utils import (
+    PENDING_PASSWORD_HASH,
+    generate_default_password,
+)
+from backend.api.utils.password_hasher import password_hasher
+from backend.api.utils.user_import import (
+    CSV_CONTENT_TYPES,
+    NDJSON_CONTENT_TYPES,
+    ImportRowError,
+    iter_records,
+    validate_user_row,
+)
+from backend.storage.pending_passwords import pending_password_hasher
 from backend.storage.pre_populated.seed_lists import USER_ROLES
 
 user_router = APIRouter(prefix="/users", tags=["users"])
 
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
 
 @user_router.post("/add", status_code=status.HTTP_201_CREATED)
-def add_user(user: dict = Body(...), db=Depends(get_db)):
+async def add_user(user: dict = Body(...), db: AsyncSession = Depends(get_async_db)):
     """Add a new user to the database."""
     role_name: str = user.get("role_name", "").strip()
     if role_name.lower() not in USER_ROLES:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
                 "message": f"Invalid role name: {role_name}. Valid roles are: {', '.join(USER_ROLES)}."
@@ -27,7 +46,7 @@ def add_user(user: dict = Body(...), db=Depends(get_db)):
     email: str = user.get("email", "").strip()
 
     if not all([id, first_name, last_name, email]):
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "First name, last name, and email are required."},
         )
@@ -38,32 +57,165 @@ def add_user(user: dict = Body(...), db=Depends(get_db)):
         first_name=first_name,
         last_name=last_name,
         email=email,
-        hashed_password=generate_default_password(email=email, first_name=first_name),
+        hashed_password=await password_hasher.hash(
+            generate_default_password(email=email, first_name=first_name)
+        ),
     )
 
     try:
         db.add(user)
-        db.commit()
-        db.refresh(user)
-        return JSONResponse(
+        await db.commit()
+        return ORJSONResponse(
             content={"message": "User added successfully", "user_id": user.id}
         )
     except Exception as e:
-        db.rollback()
-        return JSONResponse(
+        await db.rollback()
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"message": "An error occurred while adding the user."},
         )
 
 
 @user_router.get("/count", status_code=status.HTTP_200_OK)
-def get_user_count(db=Depends(get_db)):
-    """Get the total number of users."""
+async def get_user_count(
+    approximate: bool = False, db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get the total number of users.
+
+    Exact counts come from trigger-maintained counters; `approximate=true`
+    reads the planner's estimate instead.
+    """
     try:
-        count = db.query(User).count()
-        return JSONResponse(content={"user_count": count})
+        count = await user_count(db, approximate=approximate)
+        return ORJSONResponse(content={"user_count": count})
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"message": "An error occurred while fetching user count."},
         )
+
+
+async def _insert_user_batch(db: AsyncSession, batch: list[tuple[int, dict]]) -> list:
+    """Insert a batch of users in one statement, returning per-row failures."""
+    statement = (
+        pg_insert(User)
+        .values([row for _, row in batch])
+        .on_conflict_do_nothing()
+        .returning(User.id)
+    )
+    inserted = set((await db.execute(statement)).scalars())
+    await db.commit()
+    return [
+        {"line": line, "id": row["id"], "error": "User id or email already exists."}
+        for line, row in batch
+        if row["id"] not in inserted
+    ]
+
+
+@user_router.post("/import", status_code=status.HTTP_200_OK)
+async def import_users(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Bulk-import users from a streamed CSV or NDJSON upload.
+
+    Rows are validated as they arrive and written in multi-row batches; the
+    response reports every row that was rejected, by line number. Default
+    passwords are hashed afterwards, in the background.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in CSV_CONTENT_TYPES | NDJSON_CONTENT_TYPES:
+        return ORJSONResponse(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            content={"message": "Upload must be text/csv or application/x-ndjson."},
+        )
+
+    imported = 0
+    failed = 0
+    errors: list[dict] = []
+    seen_ids: set[str] = set()
+    seen_emails: set[str] = set()
+    batch: list[tuple[int, dict]] = []
+
+    def report(error: dict):
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(error)
+
+    async def flush():
+        nonlocal imported
+        rejected = await _insert_user_batch(db, batch)
+        for error in rejected:
+            report(error)
+        imported += len(batch) - len(rejected)
+        batch.clear()
+
+    try:
+        async for line, record, parse_error in iter_records(
+            request.stream(), content_type
+        ):
+            if parse_error:
+                report({"line": line, "id": None, "error": parse_error})
+                continue
+            try:
+                cleaned = validate_user_row(record)
+            except ImportRowError as e:
+                report({"line": line, "id": record.get("id"), "error": str(e)})
+                continue
+
+            email = cleaned["email"].lower()
+            if cleaned["id"] in seen_ids or email in seen_emails:
+                report(
+                    {
+                        "line": line,
+                        "id": cleaned["id"],
+                        "error": "Duplicate id or email within the upload.",
+                    }
+                )
+                continue
+            seen_ids.add(cleaned["id"])
+            seen_emails.add(email)
+
+            now = dt.now(tz.utc).replace(tzinfo=None)
+            batch.append(
+                (
+                    line,
+                    {
+                        "id": cleaned["id"],
+                        "first_name": cleaned["first_name"],
+                        "last_name": cleaned["last_name"],
+                        "email": cleaned["email"],
+                        "hashed_password": PENDING_PASSWORD_HASH,
+                        "created_at": now,
+                        "updated_at": now,
+                    },
+                )
+            )
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush()
+        if batch:
+            await flush()
+    except ImportRowError as e:
+        await db.rollback()
+        return ORJSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": str(e), "imported": imported},
+        )
+    except Exception as e:
+        await db.rollback()
+        return ORJSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={
+                "message": "An error occurred while importing users.",
+                "imported": imported,
+            },
+        )
+
+    if imported:
+        pending_password_hasher.wake()
+    return ORJSONResponse(
+        content={
+            "imported": imported,
+            "failed": failed,
+            "errors": errors,
+            "errors_truncated": failed > len(errors),
+        }
+    )
@@ -0,0 +1,317 @@
+"""HTTP load and latency benchmark.
+
+Boots the app from backend/run.py under uvicorn against the configured
+(local!) database, tops up synthetic data to the requested scale, drives
+each scenario concurrently, and reports p50/p95/p99 latency, requests per
+second and database statements per request. The booted server runs with
+DB_PROFILE=true, so statements are counted exactly from its
+X-DB-Query-Count headers; against a server without profiling they are
+estimated from Postgres statistics.
+
+Usage (from the repository root):
+
+    python -m backend.benchmarks.load --items 100000 --save-baseline bench.json
+    python -m backend.benchmarks.load --items 100000 --baseline bench.json
+
+With `--baseline` the run is compared against a saved baseline and the
+command exits with status 1 if any scenario's p95 latency rose, or its
+throughput fell, by more than `--tolerance`.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+import httpx
+from sqlalchemy import delete, func, select, text
+from backend.benchmarks.synthetic import bench_user_id, seed_database
+from backend.models.lost_item import LostItem
+from backend.models.user import User
+from backend.storage import database
+
+_ids = itertools.count()
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One endpoint to drive: a name, a method and a request factory."""
+
+    name: str
+    method: str
+    path: Callable[[], str]
+    body: Optional[Callable[[], dict]] = None
+
+
+LOAD_USER_EMAIL_DOMAIN = "load.bench.invalid"
+
+
+def _new_user() -> dict:
+    # user ids are at most six characters; earlier runs' users are deleted
+    # before each run so the sequence can restart
+    n = next(_ids)
+    return {
+        "id": bench_user_id("L", n),
+        "first_name": "Load",
+        "last_name": "Test",
+        "email": f"user{n}@{LOAD_USER_EMAIL_DOMAIN}",
+        "role_name": "student",
+    }
+
+
+SCENARIOS = [
+    Scenario("categories/all", "GET", lambda: "/api/v1/categories/all"),
+    Scenario("reference/rooms", "GET", lambda: "/api/v1/reference/rooms"),
+    Scenario("users/count", "GET", lambda: "/api/v1/users/count"),
+    Scenario("items/counts", "GET", lambda: "/api/v1/items/counts"),
+    Scenario("items (first page)", "GET", lambda: "/api/v1/items?limit=50"),
+    Scenario(
+        "items (front desk)",
+        "GET",
+        lambda: "/api/v1/items?open=true&dropped_off_at=1&category=3&limit=50",
+    ),
+    Scenario(
+        "items/search", "GET", lambda: "/api/v1/items/search?q=black+jbl+earphones"
+    ),
+    Scenario("users/add", "POST", lambda: "/api/v1/users/add", _new_user),
+]
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+class StatementCounter:
+    """Counts statements the server ran, from pg_stat_statements if loaded.
+
+    Without pg_stat_statements it counts transactions instead, which for
+    this app is one per request plus the statements of explicit commits.
+    """
+
+    def __init__(self):
+        self.source = "transactions"
+        with database.engine.connect() as connection:
+            try:
+                connection.execute(text("SELECT 1 FROM pg_stat_statements LIMIT 1"))
+                self.source = "pg_stat_statements"
+            except Exception:
+                connection.rollback()
+
+    def read(self) -> int:
+        if self.source == "pg_stat_statements":
+            sql = (
+                "SELECT coalesce(sum(calls), 0) FROM pg_stat_statements "
+                "WHERE dbid = (SELECT oid FROM pg_database "
+                "WHERE datname = current_database())"
+            )
+        else:
+            sql = (
+                "SELECT xact_commit + xact_rollback FROM pg_stat_database "
+                "WHERE datname = current_database()"
+            )
+        with database.engine.connect() as connection:
+            # statistics are only flushed periodically; force a fresh snapshot
+            connection.execute(text("SELECT pg_stat_clear_snapshot()"))
+            return int(connection.execute(text(sql)).scalar())
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    profiled = 0
+    queries = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors, profiled, queries
+        for _ in remaining:
+            body = scenario.body() if scenario.body else None
+            started = time.perf_counter()
+            response = await client.request(scenario.method, scenario.path(), json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            if "x-db-query-count" in response.headers:
+                profiled += 1
+                queries += int(response.headers["x-db-query-count"])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "db_per_request": (
+            round(queries / requests, 2) if profiled == requests else None
+        ),
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def drive(base_url: str, args, counter: StatementCounter) -> dict:
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        for scenario in SCENARIOS:
+            if args.only and scenario.name not in args.only:
+                continue
+            for _ in range(args.warmup):
+                body = scenario.body() if scenario.body else None
+                await client.request(scenario.method, scenario.path(), json=body)
+            before = counter.read()
+            result = await run_scenario(
+                client, scenario, args.requests, args.concurrency
+            )
+            result["db_source"] = "x-db-query-count"
+            if result["db_per_request"] is None:
+                await asyncio.sleep(0.6)  # let the server's stats reach the collector
+                statements = counter.read() - before
+                result["db_per_request"] = round(statements / args.requests, 2)
+                result["db_source"] = counter.source
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:<22} {result['rps']:>8.1f} req/s  "
+                f"p50 {result['p50_ms']:>7.2f}ms  p95 {result['p95_ms']:>7.2f}ms  "
+                f"p99 {result['p99_ms']:>7.2f}ms  "
+                f"db/req {result['db_per_request']:>5.2f}  errors {result['errors']}"
+            )
+    return results
+
+
+def top_up_data(users: int, items: int, rooms: int):
+    """Bring synthetic data up to the requested scale."""
+    with database.sessionLocal() as session:
+        session.execute(
+            delete(User).where(User.email.like(f"%@{LOAD_USER_EMAIL_DOMAIN}"))
+        )
+        existing = session.execute(select(func.count()).select_from(LostItem)).scalar()
+        missing = max(0, items - existing)
+        seed_database(session, users=users, items=missing, rooms=rooms, seed=existing)
+        session.execute(text("ANALYZE"))
+        session.commit()
+    print(f"data: {max(existing, items)} lost items, {users} synthetic users")
+
+
+def boot_server(port: int, workers: int) -> subprocess.Popen:
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "backend.run:app",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+    ]
+    server = subprocess.Popen(command, env={**os.environ, "DB_PROFILE": "true"})
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            raise RuntimeError("Server exited during startup.")
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not become ready within 60s.")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Describe every scenario that regressed beyond the tolerance."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms"
+            )
+        if current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {previous['rps']} -> {current['rps']} req/s")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--rooms", type=int, default=0, help="extra synthetic rooms")
+    parser.add_argument("--requests", type=int, default=2000, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="benchmark an already running server instead")
+    parser.add_argument("--only", nargs="*", help="scenario names to run")
+    parser.add_argument("--baseline", help="compare against this baseline file")
+    parser.add_argument("--save-baseline", help="write this run as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    database.db_init()
+    database.pre_populate_tables()
+    top_up_data(args.users, args.items, args.rooms)
+    counter = StatementCounter()
+
+    server = None if args.url else boot_server(args.port, args.workers)
+    try:
+        base_url = args.url or f"http://127.0.0.1:{args.port}"
+        results = asyncio.run(drive(base_url, args, counter))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        database.close_db()
+
+    run = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "items": args.items,
+            "users": args.users,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+        },
+        "scenarios": results,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Report-to-item matching latency benchmark.
+
+Usage (from the repository root):
+
+    python -m backend.benchmarks.matching --items 300000 --reports 2000
+
+Indexes synthetic open items and reports in memory (no database) and
+times ranking the candidates for a report and finding the open reports a
+new drop-off matches. The database check on the final results adds one
+indexed primary-key lookup on top of these numbers.
+"""
+
+import argparse
+import random
+import time
+from datetime import timedelta
+from backend.benchmarks.search_latency import report
+from backend.benchmarks.synthetic import (
+    BRANDS,
+    COLOURS,
+    NOUNS,
+    synthetic_items_in_memory,
+)
+from backend.storage.matching import (
+    IndexedReport,
+    MatchIndex,
+    indexed_item,
+    terms,
+)
+
+
+def synthetic_reports(items: list, count: int, seed: int = 7) -> list[IndexedReport]:
+    """Reports with windows of one to fourteen days around random items."""
+    rng = random.Random(seed)
+    reports = []
+    for report_id in range(1, count + 1):
+        anchor = rng.choice(items)
+        lost_from = anchor.created_at - timedelta(days=rng.randint(0, 3))
+        text = (
+            f"I lost my {rng.choice(COLOURS)} {rng.choice(BRANDS)} "
+            f"{rng.choice(NOUNS)}"
+        )
+        reports.append(
+            IndexedReport(
+                id=report_id,
+                category=anchor.category,
+                room=rng.choice([None, anchor.found_in, rng.randint(1, 36)]),
+                lost_from=lost_from,
+                lost_until=lost_from + timedelta(days=rng.randint(1, 14)),
+                terms=terms(text),
+            )
+        )
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=300_000)
+    parser.add_argument("--reports", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    items = synthetic_items_in_memory(args.items)
+    index = MatchIndex()
+    started = time.perf_counter()
+    for row in items:
+        index.add_item(indexed_item(row))
+    print(f"indexed {args.items} items in {time.perf_counter() - started:.2f}s")
+
+    reports = synthetic_reports(items, args.reports)
+    started = time.perf_counter()
+    for lost_report in reports:
+        index.add_report(lost_report)
+    print(f"indexed {args.reports} reports in {time.perf_counter() - started:.2f}s")
+
+    timings = []
+    for lost_report in reports:
+        started = time.perf_counter()
+        index.candidates(lost_report, args.limit * 2)
+        timings.append(time.perf_counter() - started)
+    report("rank candidates for a report", timings)
+
+    timings = []
+    for row in random.Random(11).sample(items, min(len(items), 2000)):
+        item = indexed_item(row)
+        started = time.perf_counter()
+        index.reports_for(item)
+        timings.append(time.perf_counter() - started)
+    report("match a drop-off against open reports", timings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Query-plan regression check for the canonical lost item queries.
+
+Usage (from the repository root, against a scratch database):
+
+    python -m backend.benchmarks.query_plans --seed-items 100000
+    python -m backend.benchmarks.query_plans --output plans.json
+
+Each canonical query is run through `EXPLAIN (FORMAT JSON)` after
+`ANALYZE lost_items`. The command exits with status 1 if any of them plans
+a sequential scan on lost_items. The planner legitimately prefers
+sequential scans on small tables, so seed at least a few tens of
+thousands of items first. backend/tests/test_query_plans.py runs the same
+check under pytest.
+"""
+
+import argparse
+import json
+import sys
+from datetime import timedelta
+from sqlalchemy import Connection, Select, event, func, select, text
+from backend.api.utils.constants import ItemStatus
+from backend.benchmarks.synthetic import seed_database
+from backend.models.lost_item import LostItem
+from backend.storage import database
+from backend.storage.item_queries import items_for_user_statement, listing_statement
+from backend.storage.search import PostgresSearchEngine, SearchQuery
+
+PAGE_SIZE = 50
+MIN_ROWS = 20_000
+
+
+def _sample(connection: Connection, column) -> object:
+    """A value of `column` from an arbitrary row that has it set."""
+    return connection.execute(
+        select(column).where(column.is_not(None)).limit(1)
+    ).scalar()
+
+
+def canonical_queries(connection: Connection) -> dict[str, Select]:
+    """The queries whose plans must stay on indexes, with realistic parameters."""
+    location = _sample(connection, LostItem.dropped_off_at)
+    category = _sample(connection, LostItem.category)
+    room = _sample(connection, LostItem.found_in)
+    oldest, newest = connection.execute(
+        select(func.min(LostItem.created_at), func.max(LostItem.created_at))
+    ).one()
+    middle = oldest + (newest - oldest) / 2 if oldest else None
+
+    return {
+        "front desk: open items at location by category": listing_statement(
+            open_only=True, dropped_off_at=location, category=category
+        ).limit(PAGE_SIZE),
+        "open items at location": listing_statement(
+            open_only=True, dropped_off_at=location
+        ).limit(PAGE_SIZE),
+        "listing: first page": listing_statement().limit(PAGE_SIZE),
+        "listing: deep page": listing_statement(
+            after=(middle, 0) if middle else None
+        ).limit(PAGE_SIZE),
+        "listing: oldest first, deep page": listing_statement(
+            order="asc", after=(middle - timedelta(days=1), 0) if middle else None
+        ).limit(PAGE_SIZE),
+        "listing: by status": listing_statement(status=ItemStatus.CLAIMED).limit(
+            PAGE_SIZE
+        ),
+        "items found in room": listing_statement(found_in=room).limit(PAGE_SIZE),
+        "items found by user": items_for_user_statement(
+            LostItem.found_by, _sample(connection, LostItem.found_by)
+        ),
+        "items dropped off by user": items_for_user_statement(
+            LostItem.dropped_off_by, _sample(connection, LostItem.dropped_off_by)
+        ),
+        "items claimed by user": items_for_user_statement(
+            LostItem.claimed_by, _sample(connection, LostItem.claimed_by)
+        ),
+        "items collected by user": items_for_user_statement(
+            LostItem.collected_by, _sample(connection, LostItem.collected_by)
+        ),
+        "search: single term with category": PostgresSearchEngine().statement(
+            SearchQuery(text="wallet", category=category)
+        ),
+    }
+
+
+def sequential_scans(plan: dict, table: str = "lost_items") -> list[dict]:
+    """All Seq Scan nodes on `table` in an EXPLAIN JSON plan tree."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") == table:
+        found.append(plan)
+    for child in plan.get("Plans", ()):
+        found.extend(sequential_scans(child, table))
+    return found
+
+
+def _explain_cursor(conn, cursor, statement, parameters, context, executemany):
+    return f"EXPLAIN (FORMAT JSON) {statement}", parameters
+
+
+def explain(connection: Connection, statement: Select) -> dict:
+    """The JSON plan of a statement, executed with its bound parameters.
+
+    The statement is compiled and its parameters processed exactly as when
+    the app runs it; only the SQL sent to the server is prefixed.
+    """
+    event.listen(connection, "before_cursor_execute", _explain_cursor, retval=True)
+    try:
+        plan = connection.execute(statement).scalar()
+    finally:
+        event.remove(connection, "before_cursor_execute", _explain_cursor)
+    return plan[0]["Plan"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed-items", type=int, default=0)
+    parser.add_argument("--seed-users", type=int, default=2000)
+    parser.add_argument("--output", help="write the captured plans to this file")
+    args = parser.parse_args()
+
+    database.db_init()
+    database.pre_populate_tables()
+    if args.seed_items:
+        with database.sessionLocal() as session:
+            seed_database(session, users=args.seed_users, items=args.seed_items)
+
+    failures = []
+    plans = {}
+    with database.engine.begin() as connection:
+        connection.execute(text("ANALYZE lost_items"))
+        rows = connection.execute(select(func.count()).select_from(LostItem)).scalar()
+        if rows < MIN_ROWS:
+            print(
+                f"warning: lost_items has {rows} rows; plans below {MIN_ROWS} "
+                "rows are not representative (use --seed-items)."
+            )
+        for name, statement in canonical_queries(connection).items():
+            plan = explain(connection, statement)
+            plans[name] = plan
+            scans = sequential_scans(plan)
+            verdict = "SEQ SCAN" if scans else "ok"
+            print(
+                f"{verdict:<9} {name}: {plan['Node Type']} (cost {plan['Total Cost']})"
+            )
+            if scans:
+                failures.append(name)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(plans, f, indent=2, default=str)
+    database.close_db()
+
+    if failures:
+        print(f"{len(failures)} canonical queries regressed to sequential scans.")
+        return 1
+    print("All canonical queries use indexes.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Search latency benchmark.
+
+Usage (from the repository root):
+
+    python -m backend.benchmarks.search_latency --backend memory --items 100000
+    python -m backend.benchmarks.search_latency --backend postgres --seed-items 100000
+
+The postgres mode searches the configured database; `--seed-items` first
+inserts that many synthetic items (do not point it at production).
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from backend.api.utils.constants import ItemStatus
+from backend.benchmarks.synthetic import seed_database, synthetic_items_in_memory
+from backend.storage.search import (
+    InMemorySearchEngine,
+    PostgresSearchEngine,
+    SearchQuery,
+)
+
+QUERIES = [
+    SearchQuery(text="black jbl earphones"),
+    SearchQuery(text="blak jbl earphone"),
+    SearchQuery(text="silver laptop charger"),
+    SearchQuery(text="wallet", category=4),
+    SearchQuery(text="umbrella", status=ItemStatus.DROPPED_OFF),
+    SearchQuery(text="sony headphones", found_in=3, dropped_off_at=1),
+]
+
+
+def report(label: str, timings: list[float]):
+    timings = sorted(timings)
+    p = lambda q: timings[min(len(timings) - 1, int(len(timings) * q))] * 1000
+    print(
+        f"{label:<45} p50={p(0.5):7.2f}ms p95={p(0.95):7.2f}ms "
+        f"p99={p(0.99):7.2f}ms mean={statistics.mean(timings) * 1000:7.2f}ms"
+    )
+
+
+def run_memory(items: int, repeat: int):
+    engine = InMemorySearchEngine()
+    started = time.perf_counter()
+    for row in synthetic_items_in_memory(items):
+        engine.add_item(row)
+    print(f"indexed {items} items in {time.perf_counter() - started:.2f}s")
+    for query in QUERIES:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            engine.search_sync(query)
+            timings.append(time.perf_counter() - started)
+        report(f"memory  {query.text!r}", timings)
+
+
+async def run_postgres(seed_items: int, repeat: int):
+    from backend.storage import database
+
+    database.db_init()
+    database.pre_populate_tables()
+    engine = PostgresSearchEngine()
+    with database.sessionLocal() as session:
+        if seed_items:
+            seed_database(session, users=1000, items=seed_items)
+        engine.setup(database.engine, session)
+    async with database.async_sessionLocal() as db:
+        for query in QUERIES:
+            await engine.search(db, query)  # warm up
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await engine.search(db, query)
+                timings.append(time.perf_counter() - started)
+            report(f"postgres {query.text!r}", timings)
+    await database.close_async_db()
+    database.close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["memory", "postgres"], default="memory")
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--seed-items", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.backend == "memory":
+        run_memory(args.items, args.repeat)
+    else:
+        asyncio.run(run_postgres(args.seed_items, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Serialization benchmark: ORM hydration + to_dict + json vs rows + orjson.
+
+Usage (from the repository root, with lost items in the database):
+
+    python -m backend.benchmarks.serialization --rows 10000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from sqlalchemy import select
+from backend.api.utils.serialization import dumps, row_dicts
+from backend.models.lost_item import LostItem
+from backend.storage import database
+from backend.storage.item_queries import LIST_COLUMNS
+
+
+def orm_path(session, rows: int) -> bytes:
+    """The previous path: hydrate entities, to_dict() each, stdlib json."""
+    items = session.execute(select(LostItem).limit(rows)).scalars().all()
+    return json.dumps({"items": [item.to_dict() for item in items]}).encode("utf-8")
+
+
+def row_path(session, rows: int) -> bytes:
+    """The new path: select plain columns, encode with orjson."""
+    result = session.execute(select(*LIST_COLUMNS).limit(rows)).all()
+    return dumps({"items": row_dicts(result)})
+
+
+def measure(label: str, fn, rows: int, repeat: int):
+    cpu = []
+    peaks = []
+    for _ in range(repeat):
+        with database.sessionLocal() as session:
+            tracemalloc.start()
+            started = time.process_time()
+            body = fn(session, rows)
+            cpu.append(time.process_time() - started)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    best = min(cpu)
+    print(
+        f"{label:<32} cpu={best * 1000:8.1f}ms ({best / rows * 1e6:6.1f}us/row) "
+        f"peak={min(peaks) / rows:8.0f}B/row body={len(body)}B"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    database.db_init()
+    measure("ORM + to_dict + json", orm_path, args.rows, args.repeat)
+    measure("columns + orjson", row_path, args.rows, args.repeat)
+    database.close_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Time-to-first-request benchmark.
+
+Starts `backend.run:app` under uvicorn repeatedly and measures the time
+from spawning the process until `GET /` first answers 200, against the
+configured (local!) database. Each run is measured twice:
+
+- "fast": the default startup. DDL and seeding are skipped when their
+  fingerprints match.
+- "full": FORCE_SCHEMA_SYNC=1 and FORCE_SEED=1, which is what every boot
+  cost before the fingerprints existed.
+
+Usage (from the repository root):
+
+    python -m backend.benchmarks.startup --runs 5
+
+The script does not import the application, so it can also time another
+checkout: run it with that checkout as the working directory.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+MODES = {
+    "fast": {},
+    "full": {"FORCE_SCHEMA_SYNC": "1", "FORCE_SEED": "1"},
+}
+
+
+def time_to_first_request(port: int, env: dict) -> float:
+    """Seconds from spawning the server until it answers `GET /`."""
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "backend.run:app",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+    ]
+    started = time.perf_counter()
+    server = subprocess.Popen(command, env={**os.environ, **env})
+    try:
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+                if response.status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.HTTPError:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError("Server exited during startup.")
+            time.sleep(0.01)
+        raise RuntimeError("Server did not become ready within 60s.")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--modes", nargs="*", default=list(MODES), choices=MODES)
+    args = parser.parse_args()
+
+    # one untimed boot, so the first timed one does not pay for a schema sync
+    time_to_first_request(args.port, {})
+    timings: dict[str, list[float]] = {mode: [] for mode in args.modes}
+    for _ in range(args.runs):
+        for mode in args.modes:
+            timings[mode].append(time_to_first_request(args.port, MODES[mode]))
+
+    for mode, samples in timings.items():
+        print(
+            f"{mode:5s} time to first request: "
+            f"median {statistics.median(samples) * 1000:7.1f}ms  "
+            f"min {min(samples) * 1000:7.1f}ms  "
+            f"max {max(samples) * 1000:7.1f}ms  ({len(samples)} runs)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
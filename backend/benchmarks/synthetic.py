@@ -0,0 +1,193 @@
+"""Synthetic users and lost items for benchmarks.
+
+Rows are generated deterministically from a seed so that runs against the
+same scale are comparable.
+"""
+
+import random
+from collections import namedtuple
+from datetime import datetime as dt, timedelta, timezone as tz
+from typing import Iterator
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from backend.api.utils.constants import ItemStatus
+from backend.models.user import User
+from backend.models.room import Room
+from backend.models.drop_off_locations import DropOffLocation
+from backend.models.item_category import ItemCategory
+from backend.models.lost_item import LostItem
+
+COLOURS = ["black", "white", "red", "blue", "green", "grey", "silver", "pink"]
+BRANDS = ["jbl", "sony", "apple", "samsung", "hp", "dell", "nike", "adidas", "casio"]
+NOUNS = [
+    "earphones",
+    "headphones",
+    "wallet",
+    "charger",
+    "laptop",
+    "cable",
+    "bag",
+    "umbrella",
+    "bottle",
+    "jacket",
+    "notebook",
+    "calculator",
+    "keys",
+    "id card",
+]
+PLACES = ["desk", "bench", "floor", "shelf", "socket", "window", "locker"]
+
+# same columns as backend.storage.search.SEARCH_RESULT_COLUMNS
+SyntheticItem = namedtuple(
+    "SyntheticItem",
+    "id name description image_url status found_in dropped_off_at category "
+    "created_at",
+)
+
+
+_ID_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+# user ids are at most six characters: a letter and five base-36 digits
+USER_ID_DIGITS = 5
+
+
+def bench_user_id(prefix: str, n: int) -> str:
+    """The `n`th benchmark user id starting with `prefix` (60 million per prefix)."""
+    digits = ""
+    for _ in range(USER_ID_DIGITS):
+        n, digit = divmod(n, 36)
+        digits = _ID_DIGITS[digit] + digits
+    if n:
+        raise ValueError(f"Out of {prefix} benchmark user ids.")
+    return f"{prefix}{digits}"
+
+
+def synthetic_user_ids(count: int) -> list[str]:
+    """Ids of the synthetic users (6 characters, like student ids)."""
+    return [bench_user_id("S", i) for i in range(count)]
+
+
+def generate_users(count: int) -> Iterator[dict]:
+    """Rows for User inserts."""
+    now = dt.now(tz.utc).replace(tzinfo=None)
+    for user_id in synthetic_user_ids(count):
+        yield {
+            "id": user_id,
+            "first_name": f"First{user_id}",
+            "last_name": f"Last{user_id}",
+            "email": f"{user_id.lower()}@bench.invalid",
+            "hashed_password": "!",  # not a valid bcrypt hash; cannot log in
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def generate_items(
+    count: int,
+    *,
+    user_ids: list[str],
+    room_ids: list[int],
+    location_ids: list[int],
+    category_ids: list[int],
+    seed: int = 42,
+    days: int = 365,
+) -> Iterator[dict]:
+    """Rows for LostItem inserts spread over the last `days` days."""
+    rng = random.Random(seed)
+    start = dt.now(tz.utc).replace(tzinfo=None) - timedelta(days=days)
+    statuses = list(ItemStatus)
+    for i in range(count):
+        noun = rng.choice(NOUNS)
+        name = f"{rng.choice(COLOURS)} {rng.choice(BRANDS)} {noun}"
+        created_at = start + timedelta(seconds=rng.randrange(days * 86400))
+        status = rng.choices(statuses, weights=[6, 1, 3])[0]
+        found_by = rng.choice(user_ids)
+        claimed_by = None
+        if status is not ItemStatus.DROPPED_OFF:
+            claimed_by = rng.choice(user_ids)
+        yield {
+            "name": name,
+            "description": f"Found on the {rng.choice(PLACES)}, {noun} #{i}",
+            "image_url": "",
+            "status": status,
+            "found_by": found_by,
+            "dropped_off_by": found_by,
+            "claimed_by": claimed_by,
+            "collected_by": claimed_by if status is ItemStatus.COLLECTED else None,
+            "found_in": rng.choice(room_ids),
+            "dropped_off_at": rng.choice(location_ids),
+            "category": rng.choice(category_ids),
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def synthetic_items_in_memory(count: int, seed: int = 42) -> list[SyntheticItem]:
+    """Item tuples for engines that do not need a database."""
+    rows = generate_items(
+        count,
+        user_ids=[bench_user_id("S", 0)],
+        room_ids=list(range(1, 37)),
+        location_ids=list(range(1, 7)),
+        category_ids=list(range(1, 20)),
+        seed=seed,
+    )
+    return [
+        SyntheticItem(
+            id=i + 1,
+            name=row["name"],
+            description=row["description"],
+            image_url=row["image_url"],
+            status=row["status"],
+            found_in=row["found_in"],
+            dropped_off_at=row["dropped_off_at"],
+            category=row["category"],
+            created_at=row["created_at"],
+        )
+        for i, row in enumerate(rows)
+    ]
+
+
+def _batched(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed_database(
+    session: Session, *, users: int, items: int, rooms: int = 0, seed: int = 42
+) -> dict:
+    """Insert synthetic users, rooms and lost items, returning what was created.
+
+    Users and rooms are idempotent (fixed ids and codes); items are always
+    added. Requires the reference tables to be seeded already.
+    """
+    if rooms:
+        session.execute(
+            pg_insert(Room)
+            .values([{"code": f"BENCH-{i:04d}"} for i in range(rooms)])
+            .on_conflict_do_nothing(index_elements=["code"])
+        )
+    existing = set(session.execute(select(User.id).where(User.id.like("S%"))).scalars())
+    user_ids = synthetic_user_ids(users)
+    new_users = (row for row in generate_users(users) if row["id"] not in existing)
+    for batch in _batched(new_users, 5000):
+        session.execute(insert(User), batch)
+
+    rows = generate_items(
+        items,
+        user_ids=user_ids,
+        room_ids=list(session.execute(select(Room.id)).scalars()),
+        location_ids=list(session.execute(select(DropOffLocation.id)).scalars()),
+        category_ids=list(session.execute(select(ItemCategory.id)).scalars()),
+        seed=seed,
+    )
+    for batch in _batched(rows, 5000):
+        session.execute(insert(LostItem), batch)
+    session.commit()
+    return {"users": users, "items": items, "rooms": rooms}
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime as dt, timezone as tz
+from backend.storage import Base
+
+
+class AppMetadata(Base):
+    """Key/value bookkeeping for the application, e.g. applied seed checksums."""
+
+    __tablename__ = "app_metadata"
+
+    key = Column(String(120), primary_key=True)
+    value = Column(String(255), nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __init__(self, key: str, value: str):
+        self.key = key
+        self.value = value
+        self.updated_at = dt.now(tz.utc)
+
+    def __repr__(self):
+        """String representation of AppMetadata instance."""
+        return f"<AppMetadata(key='{self.key}', value='{self.value}')>"
@@ -0,0 +1,61 @@
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, String
+from backend.storage import Base
+from backend.api.utils.constants import ItemStatus
+
+
+class ArchivedLostItem(Base):
+    """A collected lost item moved out of `lost_items` (the cold table).
+
+    Same columns as LostItem plus `archived_at`. Rows are only written by
+    moving them from lost_items, where their references were checked, so
+    there are no foreign keys to slow down the moves.
+    """
+
+    __tablename__ = "lost_items_archive"
+    __table_args__ = (
+        # keyset pagination, like ix_lost_items_created_at_id
+        Index("ix_lost_items_archive_created_at_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(120), nullable=False)
+    description = Column(String(500), nullable=True)
+    image_url = Column(String(255), nullable=True)
+    status = Column(Enum(ItemStatus, name="item_status"), nullable=False)
+    found_by = Column(String(6), nullable=False)
+    dropped_off_by = Column(String(6), nullable=True)
+    found_in = Column(Integer, nullable=False)
+    claimed_by = Column(String(6), nullable=True)
+    collected_by = Column(String(6), nullable=True)
+    dropped_off_at = Column(Integer, nullable=False)
+    category = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, nullable=False)
+
+    def to_dict(self):
+        """Convert ArchivedLostItem instance to dictionary."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "image_url": self.image_url,
+            "status": getattr(self.status, "value", self.status),
+            "found_by": self.found_by,
+            "dropped_off_by": self.dropped_off_by,
+            "found_in": self.found_in,
+            "claimed_by": self.claimed_by,
+            "collected_by": self.collected_by,
+            "dropped_off_at": self.dropped_off_at,
+            "category": self.category,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+            "archived_at": self.archived_at.isoformat(),
+        }
+
+    def __repr__(self):
+        """String representation of ArchivedLostItem instance."""
+        return (
+            f"<ArchivedLostItem(id={self.id}, name='{self.name}', "
+            f"archived_at={self.archived_at})>"
+        )
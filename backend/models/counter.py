@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, BigInteger
+from backend.storage import Base
+
+
+class Counter(Base):
+    """A shard of an exact row count, maintained by database triggers.
+
+    Each count is spread over several shard rows so concurrent writers do
+    not queue on a single hot row; the count is the sum of its shards.
+    """
+
+    __tablename__ = "counters"
+
+    name = Column(String(120), primary_key=True)
+    shard = Column(Integer, primary_key=True, default=0)
+    value = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        """String representation of Counter instance."""
+        return f"<Counter(name='{self.name}', shard={self.shard}, value={self.value})>"
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Integer, String, Text, UniqueConstraint
 from backend.storage import Base
 
 
 class DropOffLocation(Base):
     __tablename__ = "drop_off_locations"
+    __table_args__ = (UniqueConstraint("name", name="uq_drop_off_locations_name"),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(120), nullable=False)
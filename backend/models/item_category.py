@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, UniqueConstraint
 from backend.storage import Base
 
 
 class ItemCategory(Base):
     __tablename__ = "item_categories"
+    __table_args__ = (UniqueConstraint("name", name="uq_item_categories_name"),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(120), nullable=False)
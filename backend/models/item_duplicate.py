@@ -0,0 +1,51 @@
+from datetime import datetime as dt, timezone as tz
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, Integer
+from backend.storage import Base
+
+
+class ItemImageHash(Base):
+    """Perceptual hash of a lost item's image, for duplicate detection.
+
+    Like item events, rows have no foreign key and outlive archived items.
+    """
+
+    __tablename__ = "item_image_hashes"
+
+    item_id = Column(Integer, primary_key=True, autoincrement=False)
+    image_hash = Column(BigInteger, nullable=False)  # 64-bit dHash, signed
+
+    def __repr__(self):
+        """String representation of ItemImageHash instance."""
+        return f"<ItemImageHash(item_id={self.item_id}, image_hash={self.image_hash})>"
+
+
+class ItemDuplicate(Base):
+    """A lost item flagged as a likely duplicate of an earlier one."""
+
+    __tablename__ = "item_duplicates"
+    __table_args__ = (Index("ix_item_duplicates_duplicate_of", "duplicate_of"),)
+
+    item_id = Column(Integer, primary_key=True, autoincrement=False)
+    duplicate_of = Column(Integer, primary_key=True, autoincrement=False)
+    text_similarity = Column(Float, nullable=False)  # Jaccard of the text terms
+    image_distance = Column(Integer, nullable=True)  # differing image hash bits
+    detected_at = Column(
+        DateTime, nullable=False, default=lambda: dt.now(tz.utc).replace(tzinfo=None)
+    )
+
+    def to_dict(self):
+        """Convert ItemDuplicate instance to dictionary."""
+        return {
+            "item_id": self.item_id,
+            "duplicate_of": self.duplicate_of,
+            "text_similarity": self.text_similarity,
+            "image_distance": self.image_distance,
+            "detected_at": self.detected_at.isoformat(),
+        }
+
+    def __repr__(self):
+        """String representation of ItemDuplicate instance."""
+        return (
+            f"<ItemDuplicate(item_id={self.item_id}, "
+            f"duplicate_of={self.duplicate_of})>"
+        )
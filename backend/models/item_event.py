@@ -0,0 +1,44 @@
+from sqlalchemy import BigInteger, Column, DateTime, Enum, Index, Integer, String
+from backend.storage import Base
+from backend.api.utils.constants import ItemStatus
+
+
+class ItemEvent(Base):
+    """An append-only record of one lost item status change.
+
+    There is deliberately no foreign key to lost_items: events are written
+    in batches after the status change commits, and outlive the item row
+    (e.g. once it is archived).
+    """
+
+    __tablename__ = "item_events"
+    __table_args__ = (
+        Index("ix_item_events_item_id_occurred_at", "item_id", "occurred_at", "id"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    item_id = Column(Integer, nullable=False)
+    from_status = Column(
+        Enum(ItemStatus, name="item_status"), nullable=True
+    )  # NULL for the event that registers the item
+    to_status = Column(Enum(ItemStatus, name="item_status"), nullable=False)
+    actor = Column(String(6), nullable=True)  # the user who caused the change
+    occurred_at = Column(DateTime, nullable=False)
+
+    def to_dict(self):
+        """Convert ItemEvent instance to dictionary."""
+        return {
+            "id": self.id,
+            "item_id": self.item_id,
+            "from_status": getattr(self.from_status, "value", self.from_status),
+            "to_status": getattr(self.to_status, "value", self.to_status),
+            "actor": self.actor,
+            "occurred_at": self.occurred_at.isoformat(),
+        }
+
+    def __repr__(self):
+        """String representation of ItemEvent instance."""
+        return (
+            f"<ItemEvent(id={self.id}, item_id={self.item_id}, "
+            f"from_status={self.from_status}, to_status={self.to_status})>"
+        )
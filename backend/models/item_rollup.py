@@ -0,0 +1,46 @@
+from sqlalchemy import BigInteger, Column, Date, Enum, Integer
+from backend.storage import Base
+from backend.api.utils.constants import ItemStatus
+
+
+class ItemRollup(Base):
+    """Number of lost items per drop-off location, category and status.
+
+    Maintained by database triggers (backend.storage.rollups).
+    """
+
+    __tablename__ = "item_rollups"
+
+    dropped_off_at = Column(Integer, primary_key=True)
+    category = Column(Integer, primary_key=True)
+    status = Column(Enum(ItemStatus, name="item_status"), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        """String representation of ItemRollup instance."""
+        return (
+            f"<ItemRollup(dropped_off_at={self.dropped_off_at}, "
+            f"category={self.category}, status={self.status}, count={self.count})>"
+        )
+
+
+class ItemDailyRollup(Base):
+    """Number of lost items per registration day, location, category and status.
+
+    Maintained by database triggers (backend.storage.rollups).
+    """
+
+    __tablename__ = "item_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    dropped_off_at = Column(Integer, primary_key=True)
+    category = Column(Integer, primary_key=True)
+    status = Column(Enum(ItemStatus, name="item_status"), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        """String representation of ItemDailyRollup instance."""
+        return (
+            f"<ItemDailyRollup(day={self.day}, dropped_off_at={self.dropped_off_at}, "
+            f"category={self.category}, status={self.status}, count={self.count})>"
+        )
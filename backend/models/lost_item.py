@@ -1,14 +1,71 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Enum,
+    Index,
+    text,
+)
 from datetime import datetime as dt, timezone as tz
 from backend.storage import Base
 from typing import Optional
 from backend.api.utils.constants import ItemStatus
 
+# Predicate for items still waiting at a drop-off location
+# (api.utils.constants.OPEN_ITEM_STATUSES, as stored enum labels).
+OPEN_ITEMS_SQL = "status IN ('DROPPED_OFF', 'CLAIMED')"
+
+# Full-text search document; queries must use this exact expression for the
+# planner to match it against ix_lost_items_search_document.
+SEARCH_DOCUMENT_SQL = "to_tsvector('english', name || ' ' || coalesce(description, ''))"
+
 
 class LostItem(Base):
     """Represents a lost item in the institution."""
 
     __tablename__ = "lost_items"
+    __table_args__ = (
+        Index(
+            "ix_lost_items_search_document",
+            text(SEARCH_DOCUMENT_SQL),
+            postgresql_using="gin",
+        ),
+        # keyset pagination walks (created_at, id) in either direction
+        Index("ix_lost_items_created_at_id", "created_at", "id"),
+        Index("ix_lost_items_status_created_at", "status", "created_at", "id"),
+        # front desk: open items at a drop-off location, by category, newest first
+        Index(
+            "ix_lost_items_open_location_category",
+            "dropped_off_at",
+            "category",
+            "created_at",
+            "id",
+            postgresql_where=text(OPEN_ITEMS_SQL),
+        ),
+        # foreign keys; the trailing created_at serves "newest for X" lookups
+        Index("ix_lost_items_found_in_created_at", "found_in", "created_at"),
+        Index("ix_lost_items_category_created_at", "category", "created_at"),
+        Index("ix_lost_items_location_created_at", "dropped_off_at", "created_at"),
+        Index("ix_lost_items_found_by", "found_by"),
+        # mostly NULL until an item moves on, so only index the set rows
+        Index(
+            "ix_lost_items_dropped_off_by",
+            "dropped_off_by",
+            postgresql_where=text("dropped_off_by IS NOT NULL"),
+        ),
+        Index(
+            "ix_lost_items_claimed_by",
+            "claimed_by",
+            postgresql_where=text("claimed_by IS NOT NULL"),
+        ),
+        Index(
+            "ix_lost_items_collected_by",
+            "collected_by",
+            postgresql_where=text("collected_by IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(120), nullable=False)
@@ -32,8 +89,12 @@ class LostItem(Base):
         Integer, ForeignKey("drop_off_locations.id"), nullable=False, default=-1
     )
     category = Column(Integer, ForeignKey("item_categories.id"), nullable=False)
-    created_at = Column(DateTime, nullable=False, default=dt.now(tz.utc))
-    updated_at = Column(DateTime, nullable=False, default=dt.now(tz.utc))
+    created_at = Column(
+        DateTime, nullable=False, default=lambda: dt.now(tz.utc).replace(tzinfo=None)
+    )
+    updated_at = Column(
+        DateTime, nullable=False, default=lambda: dt.now(tz.utc).replace(tzinfo=None)
+    )
 
     def __init__(
         self,
@@ -61,8 +122,8 @@ class LostItem(Base):
         self.collected_by = collected_by
         self.dropped_off_at = dropped_off_at
         self.category = category
-        self.created_at = dt.now(tz.utc)
-        self.updated_at = dt.now(tz.utc)
+        # columns are naive timestamps holding UTC; asyncpg rejects aware values
+        self.created_at = self.updated_at = dt.now(tz.utc).replace(tzinfo=None)
 
     def to_dict(self):
         """Convert LostItem instance to dictionary."""
@@ -71,7 +132,7 @@ class LostItem(Base):
             "name": self.name,
             "description": self.description,
             "image_url": self.image_url,
-            "status": self.status,
+            "status": getattr(self.status, "value", self.status),
             "found_by": self.found_by,
             "dropped_off_by": self.dropped_off_by,
             "found_in": self.found_in,
@@ -0,0 +1,110 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
+from datetime import datetime as dt, timezone as tz
+from typing import Optional
+from backend.storage import Base
+
+
+class LostReport(Base):
+    """A student's report of an item they lost, matched against found items."""
+
+    __tablename__ = "lost_reports"
+    __table_args__ = (
+        Index("ix_lost_reports_reported_by", "reported_by"),
+        # the matcher reloads open reports by id
+        Index("ix_lost_reports_open_id", "id", postgresql_where=text("is_open")),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    reported_by = Column(String(6), ForeignKey("users.id"), nullable=False)
+    category = Column(Integer, ForeignKey("item_categories.id"), nullable=False)
+    room = Column(
+        Integer, ForeignKey("rooms.id"), nullable=True
+    )  # where the owner thinks they lost it, if known
+    lost_from = Column(DateTime, nullable=False)
+    lost_until = Column(DateTime, nullable=False)
+    description = Column(String(500), nullable=False)
+    is_open = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __init__(
+        self,
+        *,
+        reported_by: str,
+        category: int,
+        room: Optional[int] = None,
+        lost_from: dt,
+        lost_until: dt,
+        description: str,
+    ):
+        self.reported_by = reported_by
+        self.category = category
+        self.room = room
+        self.lost_from = lost_from
+        self.lost_until = lost_until
+        self.description = description
+        self.is_open = True
+        # columns are naive timestamps holding UTC; asyncpg rejects aware values
+        self.created_at = self.updated_at = dt.now(tz.utc).replace(tzinfo=None)
+
+    def to_dict(self):
+        """Convert LostReport instance to dictionary."""
+        return {
+            "id": self.id,
+            "reported_by": self.reported_by,
+            "category": self.category,
+            "room": self.room,
+            "lost_from": self.lost_from.isoformat(),
+            "lost_until": self.lost_until.isoformat(),
+            "description": self.description,
+            "is_open": self.is_open,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+    def __repr__(self):
+        """String representation of LostReport instance."""
+        return (
+            f"<LostReport(id={self.id}, reported_by='{self.reported_by}', "
+            f"category={self.category}, is_open={self.is_open})>"
+        )
+
+
+class ReportMatch(Base):
+    """A found item that matched an open report when it was dropped off."""
+
+    __tablename__ = "report_matches"
+
+    report_id = Column(Integer, ForeignKey("lost_reports.id"), primary_key=True)
+    # no foreign key: matches outlive the item row once it is archived
+    item_id = Column(Integer, primary_key=True)
+    score = Column(Float, nullable=False)
+    created_at = Column(
+        DateTime, nullable=False, default=lambda: dt.now(tz.utc).replace(tzinfo=None)
+    )
+
+    def to_dict(self):
+        """Convert ReportMatch instance to dictionary."""
+        return {
+            "report_id": self.report_id,
+            "item_id": self.item_id,
+            "score": self.score,
+            "created_at": self.created_at.isoformat(),
+        }
+
+    def __repr__(self):
+        """String representation of ReportMatch instance."""
+        return (
+            f"<ReportMatch(report_id={self.report_id}, item_id={self.item_id}, "
+            f"score={self.score})>"
+        )
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, String
+from backend.storage import Base
+
+
+class RevokedToken(Base):
+    """An access token revoked before it expired (e.g. by logging out).
+
+    Rows are only needed until the token would have expired anyway.
+    """
+
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (Index("ix_revoked_tokens_expires_at", "expires_at"),)
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    jti = Column(String(32), unique=True, nullable=False)  # the token's id claim
+    user_id = Column(String(6), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        """String representation of RevokedToken instance."""
+        return (
+            f"<RevokedToken(id={self.id}, jti='{self.jti}', "
+            f"user_id='{self.user_id}', expires_at={self.expires_at})>"
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Integer, String, Text, UniqueConstraint
 from backend.storage import Base
 
 
@@ -6,6 +6,7 @@ class Room(Base):
     """Represents a room in the institution."""
 
     __tablename__ = "rooms"
+    __table_args__ = (UniqueConstraint("code", name="uq_rooms_code"),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     code = Column(String(60), nullable=False)
@@ -1,11 +1,20 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Index, Integer, String, DateTime, text
 from datetime import datetime as dt, timezone as tz
 from backend.storage import Base
+from backend.api.utils.auth_utils import PENDING_PASSWORD_HASH
 
 
 # example user model
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # bulk-imported users whose password is still to be hashed
+        Index(
+            "ix_users_pending_password",
+            "id",
+            postgresql_where=text(f"hashed_password = '{PENDING_PASSWORD_HASH}'"),
+        ),
+    )
 
     id = Column(
         String(6), primary_key=True, index=True, nullable=False
@@ -25,8 +34,8 @@ class User(Base):
         self.last_name = last_name
         self.email = email
         self.hashed_password = hashed_password
-        self.created_at = self.updated_at = dt.now(tz.utc)
-        self.created_at = self.updated_at = dt.now(tz.utc)
+        # columns are naive timestamps holding UTC; asyncpg rejects aware values
+        self.created_at = self.updated_at = dt.now(tz.utc).replace(tzinfo=None)
 
     def to_dict(self):
         """Convert User instance to dictionary."""
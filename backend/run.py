@@ -1,28 +1,106 @@
 """Backend application entry point"""
 
+# first, so the startup timing covers importing everything below
+from backend.api.utils.startup_timing import startup_timer
 from fastapi import FastAPI, status, APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware import cors
 from contextlib import asynccontextmanager
-from backend.storage.database import db_init, close_db, pre_populate_tables
+from backend.storage import database
+from backend.storage.database import (
+    db_init,
+    close_db,
+    close_async_db,
+    pre_populate_tables,
+)
+from backend.storage.reference_cache import reference_cache
+from backend.api.utils.password_hasher import password_hasher
+from backend.storage.thumbnails import thumbnail_worker
+from backend.storage.search import search_engine
+from backend.storage.matching import match_index
+from backend.storage.duplicates import duplicate_index
+from backend.storage.item_events import item_event_writer
+from backend.storage.revocations import revocation_list
+from backend.storage.archive import item_archiver
+from backend.storage.item_feed import item_feed
+from backend.storage.pending_passwords import pending_password_hasher
+from backend.api.middleware.admission import AdmissionControlMiddleware
+from backend.api.middleware.metrics import MetricsMiddleware, metrics_endpoint
+from backend.api.middleware.read_your_writes import ReadYourWritesMiddleware
+from backend.api.config.db_config import db_settings
+from backend.api.middleware.profiler import (
+    PROFILING_ENABLED,
+    QueryProfilerMiddleware,
+    recent_queries,
+)
 # import routers
-from backend.api.v1.routers import users, categories
+from backend.api.v1.routers import (
+    users,
+    categories,
+    reference,
+    lost_items,
+    media,
+    reports,
+    analytics,
+    auth,
+    live,
+)
 
 app_router = APIRouter(prefix="/api/v1", tags=["v1"])
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan context manager."""
-    db_init()
-    pre_populate_tables()
+    startup_timer.mark("imports")
+    with startup_timer.phase("db_init"):
+        db_init()
+    with startup_timer.phase("seed"):
+        pre_populate_tables()
+    with startup_timer.phase("reference_cache"):
+        reference_cache.warm()
+    with startup_timer.phase("search_index"):
+        with database.sessionLocal() as session:
+            search_engine.setup(database.engine, session)
+    # built in the background; matching requests wait for it
+    match_index.start(database.sessionLocal)
+    duplicate_index.start(database.sessionLocal)
+    with startup_timer.phase("workers"):
+        password_hasher.start()
+        thumbnail_worker.start()
+        item_event_writer.start(database.async_sessionLocal)
+        item_archiver.start(database.async_sessionLocal)
+        item_feed.start()
+        pending_password_hasher.start(database.async_sessionLocal)
+    with startup_timer.phase("revocations"):
+        await revocation_list.start(database.async_sessionLocal)
+    startup_timer.report()
     yield
+    await item_feed.stop()
+    await pending_password_hasher.stop()
+    await revocation_list.stop()
+    await item_archiver.stop()
+    await match_index.stop()
+    await duplicate_index.stop()
+    await item_event_writer.stop()
+    thumbnail_worker.shutdown()
+    password_hasher.shutdown()
+    await close_async_db()
     close_db()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app_router.include_router(users.user_router)
 app_router.include_router(categories.categories_router)
+app_router.include_router(reference.reference_router)
+app_router.include_router(lost_items.lost_items_router)
+app_router.include_router(media.media_router)
+app_router.include_router(reports.reports_router)
+app_router.include_router(analytics.analytics_router)
+app_router.include_router(auth.auth_router)
+app_router.include_router(live.live_router)
 app.include_router(app_router)
 
+# innermost, so shed requests still get CORS headers and metrics
+app.add_middleware(AdmissionControlMiddleware)
 app.add_middleware(
     cors.CORSMiddleware,
     allow_origins=["*"],  # Adjust for production
@@ -30,11 +108,18 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if PROFILING_ENABLED:
+    app.add_middleware(QueryProfilerMiddleware)
+    app.add_route("/debug/queries", recent_queries, include_in_schema=False)
+if db_settings.replica_async_urls:
+    app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 @app.get("/", status_code=status.HTTP_200_OK)
 def root():
     """Root endpoint"""
-    return JSONResponse(content={"message": "Backend is running!"})
+    return ORJSONResponse(content={"message": "Backend is running!"})
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,116 @@
+"""Production server launcher.
+
+    python -m backend.serve [--workers N] [--host HOST] [--port PORT]
+
+Runs the app under uvicorn with N worker processes (WEB_CONCURRENCY,
+default: the number of cores), on uvloop and httptools when installed.
+
+The launcher syncs the schema and seed data once before starting the
+workers, so each of them finds both up to date and goes straight to
+serving (processes that still race, e.g. on several hosts, serialize on
+an advisory lock). With DB_CONNECTION_BUDGET set, every worker sizes its
+pools from an equal share of the budget instead of each opening
+DB_POOL_SIZE + DB_MAX_OVERFLOW connections. Likewise, each worker's
+password hashing and thumbnail process pools default to its share of the
+cores rather than all of them. With more than one worker, /metrics
+aggregates all workers through PROMETHEUS_MULTIPROC_DIR (a temporary
+directory unless set). On shutdown, requests still running
+after --graceful-timeout seconds (default 10), such as live item
+streams, are cancelled.
+
+`python backend/run.py` remains the single-process, auto-reloading
+development server.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+# startup switches the launcher applies once; workers must not repeat them
+ONE_OFF_SWITCHES = ("DROP_TABLES_FIRST", "FORCE_SCHEMA_SYNC", "FORCE_SEED")
+
+
+def prepare_database():
+    """Sync the schema and seed data, then release every connection."""
+    from backend.storage import database
+
+    database.db_init()
+    database.pre_populate_tables()
+    database.close_db()
+    asyncio.run(database.close_async_db())
+    for name in ONE_OFF_SWITCHES:
+        os.environ.pop(name, None)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", "0")) or os.cpu_count() or 1,
+    )
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info"))
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.getenv("GRACEFUL_TIMEOUT", "10")),
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+
+    # read by DatabaseSettings.pool_limits in this process and the workers
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    from backend.api.config.db_config import db_settings
+
+    try:
+        pool_size, _ = db_settings.pool_limits("async")
+    except ValueError as e:
+        parser.error(str(e))
+    if db_settings.connection_budget is not None:
+        logger.info(
+            f"{args.workers} workers share {db_settings.connection_budget} "
+            f"connections per database server ({pool_size} async each)."
+        )
+
+    prepare_database()
+
+    # set after this process imported prometheus_client, so only the
+    # workers write their metrics to the directory
+    metrics_dir = None
+    if args.workers > 1 and not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        metrics_dir = tempfile.mkdtemp(prefix="lostandfound-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    logger.info(f"Starting {args.workers} workers ({loop}, {http}).")
+    try:
+        uvicorn.run(
+            "backend.run:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            loop=loop,
+            http=http,
+            log_level=args.log_level,
+            # live streams never finish on their own
+            timeout_graceful_shutdown=args.graceful_timeout,
+        )
+    finally:
+        if metrics_dir is not None:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Archival of collected lost items into a cold table.
+
+Collected items are only ever read again for history, but left in
+`lost_items` they grow the table and every index the open-item queries
+use. `ItemArchiver` moves items collected more than DB_ARCHIVE_AFTER_DAYS
+ago (by `updated_at`, the time of their last transition) into
+`lost_items_archive`, DB_ARCHIVE_BATCH_SIZE at a time, each batch one
+`DELETE ... RETURNING` feeding an `INSERT` in a single statement. It runs
+at startup and then every DB_ARCHIVE_INTERVAL_SECONDS; concurrent
+workers skip the run while one of them holds the archive lock.
+
+Nothing reads the archive unless asked to (`GET /items?archived=true`).
+Counters and rollups still include archived items, item events are kept,
+and report matches keep their item ids (they have no foreign key).
+
+    python -m backend.storage.archive [--older-than-days N]
+
+runs one archival pass by hand, e.g. for the first large backfill.
+"""
+
+import argparse
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import datetime as dt, timedelta, timezone as tz
+from typing import Optional
+from sqlalchemy import (
+    DateTime,
+    Engine,
+    Insert,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from backend.api.config.db_config import DatabaseSettings, db_settings
+from backend.api.utils.constants import ItemStatus
+from backend.models.archived_lost_item import ArchivedLostItem
+from backend.models.lost_item import LostItem
+from backend.storage.search import search_engine
+
+logger = logging.getLogger(__name__)
+
+# arbitrary application-wide key for pg_try_advisory_xact_lock
+ARCHIVE_LOCK_KEY = 7_302_214_572
+
+ITEM_COLUMN_NAMES = [column.name for column in LostItem.__table__.columns]
+
+
+def ensure_archive(engine: Engine):
+    """Drop the foreign key from report_matches to lost_items, if present.
+
+    It would keep matched items from ever leaving lost_items.
+    """
+    with engine.begin() as connection:
+        names = (
+            connection.execute(
+                text(
+                    "SELECT conname FROM pg_constraint WHERE contype = 'f' "
+                    "AND conrelid = 'report_matches'::regclass "
+                    "AND confrelid = 'lost_items'::regclass"
+                )
+            )
+            .scalars()
+            .all()
+        )
+        for name in names:
+            connection.execute(
+                text(f'ALTER TABLE report_matches DROP CONSTRAINT "{name}"')
+            )
+            logger.info(f"Dropped foreign key {name} so matched items can be archived.")
+
+
+def archive_statement(cutoff: dt, now: dt, batch_size: int) -> Insert:
+    """Move up to `batch_size` items collected before `cutoff`; returns their ids."""
+    due = (
+        select(LostItem.id)
+        .where(LostItem.status == ItemStatus.COLLECTED, LostItem.updated_at < cutoff)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(LostItem)
+        .where(LostItem.id.in_(due.scalar_subquery()))
+        .returning(*LostItem.__table__.columns)
+        .cte("moved")
+    )
+    rows = select(
+        *(moved.c[name] for name in ITEM_COLUMN_NAMES),
+        literal(now, DateTime).label("archived_at"),
+    )
+    return (
+        insert(ArchivedLostItem)
+        .from_select([*ITEM_COLUMN_NAMES, "archived_at"], rows)
+        .returning(ArchivedLostItem.id)
+    )
+
+
+def _utcnow() -> dt:
+    return dt.now(tz.utc).replace(tzinfo=None)
+
+
+class ItemArchiver:
+    """Background job moving old collected items to the archive."""
+
+    def __init__(self, settings: Optional[DatabaseSettings] = None):
+        if settings is None:
+            settings = db_settings
+        self.after_days = settings.archive_after_days
+        self.batch_size = settings.archive_batch_size
+        self.interval = settings.archive_interval_seconds
+        self._sessions: Optional[async_sessionmaker] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, sessions: async_sessionmaker):
+        """Archive now and every interval from now on (idempotent)."""
+        self._sessions = sessions
+        if self.after_days is not None and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop archiving; a batch in progress is rolled back."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def archive(
+        self, sessions: async_sessionmaker, after_days: Optional[int] = None
+    ) -> int:
+        """Move every item collected over `after_days` ago; returns how many.
+
+        Stops early if another process is archiving at the same time.
+        """
+        if after_days is None:
+            after_days = self.after_days
+        now = _utcnow()
+        cutoff = now - timedelta(days=after_days)
+        moved = 0
+        while True:
+            async with sessions() as session:
+                locked = await session.scalar(
+                    select(func.pg_try_advisory_xact_lock(ARCHIVE_LOCK_KEY))
+                )
+                if not locked:
+                    return moved
+                result = await session.execute(
+                    archive_statement(cutoff, now, self.batch_size)
+                )
+                ids = result.scalars().all()
+                await session.commit()
+            for item_id in ids:
+                search_engine.remove_item(item_id)
+            moved += len(ids)
+            if len(ids) < self.batch_size:
+                return moved
+
+    async def _run(self):
+        while True:
+            try:
+                moved = await self.archive(self._sessions)
+                if moved:
+                    logger.info(f"Archived {moved} collected items.")
+            except Exception as e:
+                logger.error(f"Archiving collected items failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+item_archiver = ItemArchiver()
+
+
+async def _archive_once(after_days: Optional[int]) -> int:
+    from backend.storage import database
+
+    database.db_init()
+    try:
+        return await item_archiver.archive(database.async_sessionLocal, after_days)
+    finally:
+        await database.close_async_db()
+        database.close_db()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Archive old collected items.")
+    parser.add_argument(
+        "--older-than-days", type=int, default=db_settings.archive_after_days
+    )
+    args = parser.parse_args()
+    if args.older_than_days is None:
+        parser.error(
+            "--older-than-days is required when DB_ARCHIVE_AFTER_DAYS is unset"
+        )
+    logging.basicConfig(level=logging.INFO)
+    moved = asyncio.run(_archive_once(args.older_than_days))
+    print(f"Archived {moved} collected items.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
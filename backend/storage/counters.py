@@ -0,0 +1,241 @@
+"""Exact and approximate counts without scanning the counted tables.
+
+Exact counts live in the `counters` table and are kept current by
+statement-level triggers on `users`, `lost_items` and `lost_items_archive`,
+so they are updated in the same transaction as the rows they count and
+bulk inserts cost one counter update per statement rather than per row.
+Item counts cover archived items too: moving an item to the archive
+subtracts it from lost_items and adds it back in the same statement.
+Approximate counts come from planner statistics and cost nothing to
+maintain.
+"""
+
+import logging
+from typing import Optional
+from sqlalchemy import Engine, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.utils.constants import ItemStatus
+from backend.models.counter import Counter
+
+logger = logging.getLogger(__name__)
+
+COUNTER_SHARDS = 16
+USERS_COUNTER = "users"
+ITEM_STATUS_COUNTER_PREFIX = "lost_items:"
+
+_FUNCTIONS = f"""
+CREATE OR REPLACE FUNCTION counters_bump(counter_name text, delta bigint)
+RETURNS void AS $$
+BEGIN
+    IF delta = 0 THEN
+        RETURN;
+    END IF;
+    INSERT INTO counters (name, shard, value)
+    VALUES (counter_name, pg_backend_pid() % {COUNTER_SHARDS}, delta)
+    ON CONFLICT (name, shard) DO UPDATE SET value = counters.value + EXCLUDED.value;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION counters_users_insert() RETURNS trigger AS $$
+BEGIN
+    PERFORM counters_bump('{USERS_COUNTER}', (SELECT count(*) FROM new_rows));
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION counters_users_delete() RETURNS trigger AS $$
+BEGIN
+    PERFORM counters_bump('{USERS_COUNTER}', -(SELECT count(*) FROM old_rows));
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION counters_items_insert() RETURNS trigger AS $$
+BEGIN
+    PERFORM counters_bump('{ITEM_STATUS_COUNTER_PREFIX}' || status::text, count(*))
+    FROM new_rows GROUP BY status ORDER BY status;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION counters_items_delete() RETURNS trigger AS $$
+BEGIN
+    PERFORM counters_bump('{ITEM_STATUS_COUNTER_PREFIX}' || status::text, -count(*))
+    FROM old_rows GROUP BY status ORDER BY status;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION counters_items_update() RETURNS trigger AS $$
+BEGIN
+    PERFORM counters_bump('{ITEM_STATUS_COUNTER_PREFIX}' || status::text, sum(delta))
+    FROM (
+        SELECT status, 1 AS delta FROM new_rows
+        UNION ALL
+        SELECT status, -1 AS delta FROM old_rows
+    ) AS changes
+    GROUP BY status ORDER BY status;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+"""
+
+# (trigger name, table, event, transition tables, function)
+_TRIGGERS = [
+    (
+        "counters_users_ins",
+        "users",
+        "INSERT",
+        "NEW TABLE AS new_rows",
+        "counters_users_insert",
+    ),
+    (
+        "counters_users_del",
+        "users",
+        "DELETE",
+        "OLD TABLE AS old_rows",
+        "counters_users_delete",
+    ),
+    (
+        "counters_items_ins",
+        "lost_items",
+        "INSERT",
+        "NEW TABLE AS new_rows",
+        "counters_items_insert",
+    ),
+    (
+        "counters_items_del",
+        "lost_items",
+        "DELETE",
+        "OLD TABLE AS old_rows",
+        "counters_items_delete",
+    ),
+    (
+        "counters_items_upd",
+        "lost_items",
+        "UPDATE",
+        "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "counters_items_update",
+    ),
+    (
+        "counters_archive_ins",
+        "lost_items_archive",
+        "INSERT",
+        "NEW TABLE AS new_rows",
+        "counters_items_insert",
+    ),
+    (
+        "counters_archive_del",
+        "lost_items_archive",
+        "DELETE",
+        "OLD TABLE AS old_rows",
+        "counters_items_delete",
+    ),
+]
+
+
+def recount(connection):
+    """Rebuild every counter from a full count of the counted tables."""
+    connection.execute(
+        text("LOCK TABLE users, lost_items, lost_items_archive IN SHARE MODE")
+    )
+    connection.execute(text("DELETE FROM counters"))
+    connection.execute(
+        text(
+            "INSERT INTO counters (name, shard, value) "
+            f"SELECT '{USERS_COUNTER}', 0, count(*) FROM users"
+        )
+    )
+    connection.execute(
+        text(
+            "INSERT INTO counters (name, shard, value) "
+            f"SELECT '{ITEM_STATUS_COUNTER_PREFIX}' || status::text, 0, count(*) "
+            "FROM (SELECT status FROM lost_items "
+            "UNION ALL SELECT status FROM lost_items_archive) AS items "
+            "GROUP BY status"
+        )
+    )
+
+
+def ensure_counters(engine: Engine):
+    """Install the counting triggers if missing, backfilling the counts once."""
+    names = [name for name, *_ in _TRIGGERS]
+    with engine.begin() as connection:
+        installed = set(
+            connection.execute(
+                text("SELECT tgname FROM pg_trigger WHERE tgname = ANY(:names)"),
+                {"names": names},
+            ).scalars()
+        )
+        if installed == set(names):
+            return
+
+        connection.execute(text(_FUNCTIONS))
+        for name, table, event, transition, function in _TRIGGERS:
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {name} ON {table}"))
+            connection.execute(
+                text(
+                    f"CREATE TRIGGER {name} AFTER {event} ON {table} "
+                    f"REFERENCING {transition} "
+                    f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+                )
+            )
+        recount(connection)
+        logger.info("Counter triggers installed and counts backfilled.")
+
+
+async def exact_count(db: AsyncSession, name: str) -> int:
+    """The current value of one counter (sum of its shards)."""
+    value = await db.scalar(
+        select(func.coalesce(func.sum(Counter.value), 0)).where(Counter.name == name)
+    )
+    return int(value)
+
+
+async def _estimated_rows(db: AsyncSession, table: str) -> Optional[int]:
+    """Planner row estimate for a table, or None if it was never analyzed."""
+    estimate = await db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": table},
+    )
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+async def user_count(db: AsyncSession, approximate: bool = False) -> int:
+    """Number of users, exact from counters or estimated from statistics."""
+    if approximate:
+        estimate = await _estimated_rows(db, "users")
+        if estimate is not None:
+            return estimate
+    return await exact_count(db, USERS_COUNTER)
+
+
+async def item_status_counts(
+    db: AsyncSession, approximate: bool = False
+) -> dict[ItemStatus, int]:
+    """Number of lost items per status, archived items included."""
+    counts = {item_status: 0 for item_status in ItemStatus}
+    if approximate:
+        estimate = await _estimated_rows(db, "lost_items")
+        stats = (
+            await db.execute(
+                text(
+                    "SELECT most_common_vals::text::text[], most_common_freqs "
+                    "FROM pg_stats WHERE schemaname = current_schema() "
+                    "AND tablename = 'lost_items' AND attname = 'status'"
+                )
+            )
+        ).first()
+        # the arrays are NULL until ANALYZE finds repeated values
+        if estimate is not None and stats is not None and None not in stats:
+            for label, frequency in zip(*stats):
+                counts[ItemStatus[label]] = round(estimate * frequency)
+            # the archive only holds collected items
+            archived = await _estimated_rows(db, "lost_items_archive")
+            counts[ItemStatus.COLLECTED] += archived or 0
+            return counts
+
+    result = await db.execute(
+        select(Counter.name, func.sum(Counter.value))
+        .where(Counter.name.startswith(ITEM_STATUS_COUNTER_PREFIX))
+        .group_by(Counter.name)
+    )
+    for name, value in result:
+        counts[ItemStatus[name.removeprefix(ITEM_STATUS_COUNTER_PREFIX)]] = int(value)
+    return counts
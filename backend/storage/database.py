@@ -2,15 +2,49 @@
 
 import os
 import csv
+import hashlib
 import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime as dt, timezone as tz
+from itertools import count
 from pathlib import Path
+from fastapi import Request
 from pydantic import Field
-from typing import Optional, Generator
-from sqlalchemy import create_engine, text, Engine
-from sqlalchemy.exc import SQLAlchemyError
+from typing import Optional, Generator, AsyncGenerator
+from sqlalchemy import (
+    create_engine,
+    text,
+    update,
+    Engine,
+    Connection,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 from sqlalchemy.orm import declarative_base, Session, sessionmaker
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from backend.storage.pre_populated.seed_lists import USER_ROLES, ITEM_CATEGORIES
 from backend.api.config.db_config import DatabaseSettings, db_settings
+from backend.api.utils.auth_utils import (
+    PENDING_PASSWORD_HASH,
+    UNUSABLE_PASSWORD_PREFIX,
+)
+from backend.api.middleware.read_your_writes import within_write_window
+from backend.storage.reference_cache import reference_cache
+from backend.storage import profiler
+from backend.storage.pool_metrics import (
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    track_pool,
+)
 
 # models import
 from . import Base
@@ -20,6 +54,20 @@ from backend.models.room import Room
 from backend.models.drop_off_locations import DropOffLocation
 from backend.models.item_category import ItemCategory
 from backend.models.lost_item import LostItem
+from backend.models.archived_lost_item import ArchivedLostItem
+from backend.models.lost_report import LostReport, ReportMatch
+from backend.models.item_event import ItemEvent
+from backend.models.item_duplicate import ItemDuplicate, ItemImageHash
+from backend.models.item_rollup import ItemRollup, ItemDailyRollup
+from backend.models.revoked_token import RevokedToken
+from backend.models.app_metadata import AppMetadata
+from backend.models.counter import Counter
+from backend.storage import archive, counters, item_events, item_feed, rollups
+from backend.storage.archive import ensure_archive
+from backend.storage.counters import ensure_counters
+from backend.storage.item_events import ensure_item_events
+from backend.storage.item_feed import ensure_item_feed
+from backend.storage.rollups import ensure_rollups
 
 from dotenv import load_dotenv
 
@@ -27,26 +75,36 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
-def make_db_engine(settings: Optional[DatabaseSettings] = None) -> Engine:
-    """Create the database engine with given settings."""
+def make_db_engine(
+    settings: Optional[DatabaseSettings] = None, test_connection: bool = True
+) -> Engine:
+    """Create the database engine with given settings.
+
+    `test_connection=False` skips the `SELECT 1` round trip, for callers
+    whose first query fails just as loudly.
+    """
 
     if settings is None:
         settings = db_settings
 
     try:
         # create the engine
+        pool_size, max_overflow = settings.pool_limits("sync")
         engine = create_engine(
             url=settings.db_url,
-            pool_size=settings.pool_size,
-            max_overflow=settings.max_overflow,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
             pool_recycle=settings.pool_recycle,
             pool_pre_ping=settings.pool_pre_ping,
+            poolclass=TimedQueuePool,
             echo=os.getenv("DB_ECHO", "False").lower() == "true",
         )
-        # test the connection
-        with engine.connect() as connection:
-            connection.execute(text("SELECT 1"))
-            logger.info("Test database connection successful!.")
+        track_pool("sync", engine.pool)
+        profiler.install(engine)
+        if test_connection:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                logger.info("Test database connection successful!.")
     except SQLAlchemyError as e:
         logger.error(f"Database connection failed: {e}")
         raise e
@@ -55,26 +113,101 @@ def make_db_engine(settings: Optional[DatabaseSettings] = None) -> Engine:
         return engine
 
 
+def make_async_db_engine(
+    settings: Optional[DatabaseSettings] = None,
+    url: Optional[str] = None,
+    label: str = "async",
+) -> AsyncEngine:
+    """Create the async (asyncpg) database engine with given settings.
+
+    The pool is sized from the same settings as the sync engine, so request
+    concurrency is bounded by the pool rather than by the threadpool. `url`
+    overrides the primary's URL (for replicas); `label` names the pool in
+    the metrics.
+    """
+
+    if settings is None:
+        settings = db_settings
+
+    connect_args = {}
+    if url is not None:
+        # a replica that is down should fail over quickly, not after 60s
+        connect_args["timeout"] = settings.replica_connect_timeout
+
+    pool_size, max_overflow = settings.pool_limits("async")
+    async_engine = create_async_engine(
+        url=url or settings.async_db_url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        connect_args=connect_args,
+        echo=os.getenv("DB_ECHO", "False").lower() == "true",
+    )
+    track_pool(label, async_engine.pool)
+    profiler.install(async_engine.sync_engine)
+    logger.info(f"Async database engine ({label}) created successfully.")
+    return async_engine
+
+
 # Global engine
 engine: Optional[Engine] = None
 sessionLocal: Optional[sessionmaker] = None
+async_engine: Optional[AsyncEngine] = None
+async_sessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+replica_engines: list[AsyncEngine] = []
+replica_sessionLocals: list[async_sessionmaker[AsyncSession]] = []
+
+# replica index -> time.monotonic() before which it is skipped
+_replica_down_until: dict[int, float] = {}
+_replica_turn = count()
+REPLICA_RETRY_SECONDS = 30
 
 
 def db_init(settings: Optional[DatabaseSettings] = None):
-    """Initialize the database connection."""
-    global engine, sessionLocal
+    """Initialize the database connection.
+
+    Tables, indexes and triggers are only synced when the schema
+    fingerprint differs from the one recorded by the last sync (or
+    FORCE_SCHEMA_SYNC=1), so a restart against an up-to-date database
+    costs one query here.
+    """
+    global engine, sessionLocal, async_engine, async_sessionLocal
+    global replica_engines, replica_sessionLocals
 
     if settings is None:
         settings = db_settings
 
     try:
-        engine = make_db_engine(settings)
+        # the fingerprint query below tests the connection
+        engine = make_db_engine(settings, test_connection=False)
         sessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
-        # drop tables if DROP_TABLES_FIRST is set
-        if os.getenv("DROP_TABLES_FIRST", "0") == "1":
-            Base.metadata.drop_all(bind=engine)
-            logger.info("Dropped all tables as per DROP_TABLES_FIRST setting.")
-        Base.metadata.create_all(bind=engine)  # Create tables if they don't exist
+        async_engine = make_async_db_engine(settings)
+        async_sessionLocal = async_sessionmaker(
+            bind=async_engine, autoflush=False, expire_on_commit=False
+        )
+        replica_engines = [
+            make_async_db_engine(settings, url, f"replica-{index}")
+            for index, url in enumerate(settings.replica_async_urls)
+        ]
+        replica_sessionLocals = [
+            async_sessionmaker(bind=replica, autoflush=False, expire_on_commit=False)
+            for replica in replica_engines
+        ]
+        _replica_down_until.clear()
+        drop_first = os.getenv("DROP_TABLES_FIRST", "0") == "1"
+        force = drop_first or os.getenv("FORCE_SCHEMA_SYNC", "0") == "1"
+        fingerprint = schema_fingerprint()
+        applied = None if force else applied_metadata(engine, SCHEMA_FINGERPRINT_KEY)
+        if applied == fingerprint:
+            logger.info("Schema unchanged since last sync, skipping DDL.")
+        else:
+            with startup_lock(engine):
+                # another process may have synced while this one waited
+                applied = applied_metadata(engine, SCHEMA_FINGERPRINT_KEY)
+                if force or applied != fingerprint:
+                    sync_schema(engine, fingerprint, drop_first)
     except SQLAlchemyError as e:
         logger.error(f"Failed to initialize database connection: {e}")
         raise e
@@ -82,6 +215,133 @@ def db_init(settings: Optional[DatabaseSettings] = None):
     logger.info("Database initialized...")
 
 
+def sync_schema(engine: Engine, fingerprint: str, drop_first: bool = False):
+    """Create missing tables, indexes and triggers, then record `fingerprint`."""
+    # drop tables if DROP_TABLES_FIRST is set
+    if drop_first:
+        Base.metadata.drop_all(bind=engine)
+        logger.info("Dropped all tables as per DROP_TABLES_FIRST setting.")
+    Base.metadata.create_all(bind=engine)  # Create tables if they don't exist
+    ensure_indexes(engine)
+    ensure_counters(engine)
+    ensure_item_events(engine)
+    ensure_rollups(engine)
+    ensure_archive(engine)
+    ensure_item_feed(engine)
+    ensure_hashed_passwords(engine)
+    record_metadata(engine, SCHEMA_FINGERPRINT_KEY, fingerprint)
+
+
+# arbitrary application-wide key for pg_advisory_lock
+STARTUP_LOCK_KEY = 7_302_214_571
+
+
+@contextmanager
+def startup_lock(engine: Engine):
+    """Hold a Postgres advisory lock, so one process at a time syncs or seeds.
+
+    Workers and hosts that boot together would otherwise race on the same
+    DDL and upserts.
+    """
+    with engine.connect() as connection:
+        connection.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": STARTUP_LOCK_KEY}
+        )
+        try:
+            yield
+        finally:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": STARTUP_LOCK_KEY}
+            )
+
+
+SCHEMA_FINGERPRINT_KEY = "schema_fingerprint"
+# modules whose ensure_* functions install triggers; any edit to them
+# (even a comment) changes the fingerprint and triggers one full sync
+TRIGGER_MODULES = (counters, item_events, rollups, archive, item_feed)
+
+
+def schema_fingerprint() -> str:
+    """Checksum of the DDL db_init would apply: tables, indexes, triggers."""
+    digest = hashlib.sha256()
+    dialect = postgresql.dialect()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    for module in TRIGGER_MODULES:
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def applied_metadata(engine: Engine, key: str) -> Optional[str]:
+    """The value recorded under `key` in app_metadata, if any."""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(
+                text("SELECT value FROM app_metadata WHERE key = :key"), {"key": key}
+            ).scalar()
+    except ProgrammingError:
+        # app_metadata does not exist yet
+        return None
+
+
+def record_metadata(engine: Engine, key: str, value: str):
+    """Record `value` under `key` in app_metadata."""
+    with engine.begin() as connection:
+        connection.execute(
+            pg_insert(AppMetadata)
+            .values(key=key, value=value, updated_at=dt.now(tz.utc))
+            .on_conflict_do_update(
+                index_elements=[AppMetadata.key],
+                set_={"value": value, "updated_at": dt.now(tz.utc)},
+            )
+        )
+
+
+def ensure_indexes(engine: Engine):
+    """Create declared indexes missing from tables that already existed.
+
+    `create_all` only creates indexes together with new tables, so indexes
+    added to existing models are created here.
+    """
+    with engine.begin() as connection:
+        existing = set(
+            connection.execute(
+                text(
+                    "SELECT indexname FROM pg_indexes "
+                    "WHERE schemaname = current_schema()"
+                )
+            ).scalars()
+        )
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=connection)
+                    logger.info(f"Created missing index {index.name}.")
+
+
+def ensure_hashed_passwords(engine: Engine):
+    """Queue passwords stored in plaintext for background hashing.
+
+    Users added before passwords were hashed have their default password
+    stored as-is; marking them pending has PendingPasswordHasher replace
+    it with a hash of that same default password. Unusable placeholders
+    (such as the pending one) are left alone.
+    """
+    with engine.begin() as connection:
+        marked = connection.execute(
+            update(User)
+            .where(
+                User.hashed_password.not_like("$2_$%"),
+                User.hashed_password.not_like(f"{UNUSABLE_PASSWORD_PREFIX}%"),
+            )
+            .values(hashed_password=PENDING_PASSWORD_HASH)
+        ).rowcount
+    if marked:
+        logger.info(f"Queued {marked} plaintext passwords for hashing.")
+
+
 def get_db() -> Generator[Session, None, None]:
     """Dependency to get database session"""
     global sessionLocal
@@ -95,104 +355,241 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def pre_populate_user_roles():
-    """Pre-populate user roles in the database."""
-    global sessionLocal
-
-    if not sessionLocal:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get an async database session"""
+    global async_sessionLocal
+    if not async_sessionLocal:
         raise Exception("Database not initialized. Call db_init() first.")
 
-    with sessionLocal() as session:
-        for role_name in USER_ROLES:
-            existing_role = session.query(Role).filter_by(name=role_name).first()
-            if not existing_role:
-                new_role = Role(name=role_name)
-                session.add(new_role)
-        session.commit()
-        logger.info("User roles pre-populated successfully.")
+    async with async_sessionLocal() as db:
+        yield db
 
 
-def pre_populate_item_categories():
-    """Pre-populate categories in the database."""
-    global sessionLocal
+def read_sessionLocal(
+    request: Optional[Request] = None,
+) -> async_sessionmaker[AsyncSession]:
+    """Session factory for a read-only request.
 
-    if not sessionLocal:
+    Replicas take turns; the primary serves the read when no replica is
+    configured or up, or when the client wrote within its read-your-writes
+    window.
+    """
+    if not async_sessionLocal:
         raise Exception("Database not initialized. Call db_init() first.")
+    if not replica_sessionLocals or (
+        request is not None and within_write_window(request)
+    ):
+        return async_sessionLocal
+
+    now = time.monotonic()
+    for _ in range(len(replica_sessionLocals)):
+        index = next(_replica_turn) % len(replica_sessionLocals)
+        if _replica_down_until.get(index, 0) <= now:
+            return replica_sessionLocals[index]
+    return async_sessionLocal
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get an async session for reads, on a replica if possible.
+
+    Only use it for handlers that do not write. A replica that cannot be
+    reached is skipped for REPLICA_RETRY_SECONDS and the primary serves
+    the request.
+    """
+    sessions = read_sessionLocal(request)
+    db = sessions()
+    if sessions is not async_sessionLocal:
+        try:
+            # connect now, so a dead replica fails over before the handler runs
+            await db.connection()
+        except (SQLAlchemyError, OSError) as e:
+            await db.close()
+            index = replica_sessionLocals.index(sessions)
+            _replica_down_until[index] = time.monotonic() + REPLICA_RETRY_SECONDS
+            logger.warning(f"Replica {index} unavailable, reading from primary: {e}")
+            db = async_sessionLocal()
+
+    async with db:
+        yield db
 
-    with sessionLocal() as session:
-        # Example categories, replace with actual categories as needed
-        for category_name in ITEM_CATEGORIES:
-            existing_category = (
-                session.query(ItemCategory).filter_by(name=category_name).first()
+
+SEED_DIR = Path(__file__).parent / "pre_populated"
+DROP_OFF_LOCATIONS_FILE = SEED_DIR / "dropofflocations.csv"
+ROOMS_FILE = SEED_DIR / "rooms.csv"
+SEED_CHECKSUM_KEY = "seed_checksum"
+SEEDED_MODELS = (Role, ItemCategory, DropOffLocation, Room)
+
+
+def seed_checksum() -> str:
+    """Checksum of the seed lists and CSV files currently on disk."""
+    digest = hashlib.sha256()
+    digest.update(repr((USER_ROLES, ITEM_CATEGORIES)).encode("utf-8"))
+    for seed_file in (DROP_OFF_LOCATIONS_FILE, ROOMS_FILE):
+        digest.update(seed_file.read_bytes())
+    return digest.hexdigest()
+
+
+def _collapse_duplicates(connection: Connection, table, columns: list[str]):
+    """Keep the lowest id per duplicate key and repoint foreign keys to it."""
+    partition = ", ".join(columns)
+    ranked = (
+        f"SELECT id, min(id) OVER (PARTITION BY {partition}) AS keep_id "
+        f"FROM {table.name}"
+    )
+    for referencing in Base.metadata.sorted_tables:
+        for fk in referencing.foreign_keys:
+            if fk.column.table is not table:
+                continue
+            column = fk.parent.name
+            connection.execute(
+                text(
+                    f"UPDATE {referencing.name} SET {column} = ranked.keep_id "
+                    f"FROM ({ranked}) AS ranked "
+                    f"WHERE {referencing.name}.{column} = ranked.id "
+                    f"AND ranked.id <> ranked.keep_id"
+                )
             )
-            if not existing_category:
-                new_category = ItemCategory(name=category_name)
-                session.add(new_category)
-        session.commit()
-        logger.info("Categories pre-populated successfully.")
+    connection.execute(
+        text(
+            f"DELETE FROM {table.name} USING ({ranked}) AS ranked "
+            f"WHERE {table.name}.id = ranked.id AND ranked.id <> ranked.keep_id"
+        )
+    )
+
+
+def ensure_seed_constraints(connection: Connection):
+    """Create the unique indexes the seed upserts rely on, if missing.
+
+    `create_all` does not alter tables that already exist, so databases
+    created before these constraints were declared get an equivalent,
+    identically named unique index instead. Duplicates left behind by the
+    old row-by-row seeding are collapsed first.
+    """
+    for model in SEEDED_MODELS:
+        table = model.__table__
+        for constraint in table.constraints:
+            if not isinstance(constraint, UniqueConstraint):
+                continue
+            exists = connection.execute(
+                text("SELECT to_regclass(:name)"), {"name": constraint.name}
+            ).scalar()
+            if exists:
+                continue
+            columns = [column.name for column in constraint.columns]
+            _collapse_duplicates(connection, table, columns)
+            connection.execute(
+                text(
+                    f"CREATE UNIQUE INDEX {constraint.name} "
+                    f"ON {table.name} ({', '.join(columns)})"
+                )
+            )
+            logger.info(f"Created missing unique index {constraint.name}.")
 
 
-def pre_populate_drop_off_locations():
-    """Pre-populate drop-off locations in the database."""
-    global sessionLocal
+def _bulk_insert_missing(
+    session: Session, model, rows: list[dict], conflict_column: str
+) -> int:
+    """Insert all rows in one statement, skipping those that already exist."""
+    if not rows:
+        return 0
+    statement = (
+        pg_insert(model)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[conflict_column])
+    )
+    return session.execute(statement).rowcount
 
-    if not sessionLocal:
-        raise Exception("Database not initialized. Call db_init() first.")
 
-    drop_off_file = Path(__file__).parent / "pre_populated" / "dropofflocations.csv"
-    with open(drop_off_file, mode="r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        with sessionLocal() as session:
-            for row in reader:
-                name: str = row.get("name", "").strip()
-                description: str = row.get("description", "").strip()
+def pre_populate_user_roles(session: Session):
+    """Pre-populate user roles in the database."""
+    rows = [{"name": role_name} for role_name in dict.fromkeys(USER_ROLES)]
+    inserted = _bulk_insert_missing(session, Role, rows, "name")
+    logger.info(f"User roles pre-populated successfully ({inserted} new).")
 
-                if not name:
-                    logger.warning("Skipping drop-off location with empty name.")
-                    continue
 
-                existing_location = (
-                    session.query(DropOffLocation).filter_by(name=name).first()
-                )
-                if not existing_location:
-                    new_location = DropOffLocation(name=name, description=description)
-                    session.add(new_location)
-            session.commit()
-            logger.info("Drop-off locations pre-populated successfully.")
+def pre_populate_item_categories(session: Session):
+    """Pre-populate categories in the database."""
+    rows = [{"name": name} for name in dict.fromkeys(ITEM_CATEGORIES)]
+    inserted = _bulk_insert_missing(session, ItemCategory, rows, "name")
+    logger.info(f"Categories pre-populated successfully ({inserted} new).")
+
+
+def pre_populate_drop_off_locations(session: Session):
+    """Pre-populate drop-off locations in the database."""
+    locations: dict[str, dict] = {}
+    with open(DROP_OFF_LOCATIONS_FILE, mode="r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name: str = row.get("name", "").strip()
+            description: str = row.get("description", "").strip()
 
+            if not name:
+                logger.warning("Skipping drop-off location with empty name.")
+                continue
+            locations.setdefault(name, {"name": name, "description": description})
 
-def pre_populate_rooms():
+    rows = list(locations.values())
+    inserted = _bulk_insert_missing(session, DropOffLocation, rows, "name")
+    logger.info(f"Drop-off locations pre-populated successfully ({inserted} new).")
+
+
+def pre_populate_rooms(session: Session):
     """Pre-populate rooms in the database."""
+    room_codes: dict[str, None] = {}
+    with open(ROOMS_FILE, mode="r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            room_code: str = row.get("room code", "").strip()
+            if not room_code:
+                logger.warning("Skipping room with empty code.")
+                continue
+            room_codes[room_code] = None
+
+    rows = [{"code": code} for code in room_codes]
+    inserted = _bulk_insert_missing(session, Room, rows, "code")
+    logger.info(f"Rooms pre-populated successfully ({inserted} new).")
+
+
+def pre_populate_tables(force: bool = False) -> bool:
+    """Pre-populate tables in the database.
+
+    Seeding is skipped when the checksum of the seed lists and CSV files
+    matches the one recorded by the last successful run, unless `force` or
+    the FORCE_SEED environment variable is set. Processes booting together
+    seed one at a time. Returns whether seeding ran.
+    """
     global sessionLocal
 
     if not sessionLocal:
         raise Exception("Database not initialized. Call db_init() first.")
 
-    rooms_file = Path(__file__).parent / "pre_populated" / "rooms.csv"
-    with open(rooms_file, mode="r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        with sessionLocal() as session:
-            for row in reader:
-                room_code: str = row.get("room code", "").strip()
-                if not room_code:
-                    logger.warning("Skipping room with empty code.")
-                    continue
-
-                existing_room = session.query(Room).filter_by(code=room_code).first()
-                if not existing_room:
-                    new_room = Room(code=room_code)
-                    session.add(new_room)
-            session.commit()
-            logger.info("Rooms pre-populated successfully.")
-
-
-def pre_populate_tables():
-    """Pre-populate tables in the database."""
-    pre_populate_user_roles()
-    pre_populate_item_categories()
-    pre_populate_drop_off_locations()
-    pre_populate_rooms()
+    force = force or os.getenv("FORCE_SEED", "0") == "1"
+    checksum = seed_checksum()
+
+    if not force and applied_metadata(engine, SEED_CHECKSUM_KEY) == checksum:
+        logger.info("Seed data unchanged since last run, skipping pre-population.")
+        return False
+
+    with startup_lock(engine), sessionLocal() as session:
+        applied = session.get(AppMetadata, SEED_CHECKSUM_KEY)
+        if not force and applied is not None and applied.value == checksum:
+            logger.info("Seed data was applied by another process meanwhile.")
+            return False
+
+        ensure_seed_constraints(session.connection())
+        pre_populate_user_roles(session)
+        pre_populate_item_categories(session)
+        pre_populate_drop_off_locations(session)
+        pre_populate_rooms(session)
+
+        if applied is None:
+            session.add(AppMetadata(key=SEED_CHECKSUM_KEY, value=checksum))
+        else:
+            applied.value = checksum
+            applied.updated_at = dt.now(tz.utc)
+        session.commit()
+
+    reference_cache.invalidate()
     logger.info("Pre-population of tables completed successfully.")
+    return True
 
 
 def close_db():
@@ -210,3 +607,26 @@ def close_db():
 
     engine = None
     sessionLocal = None
+
+
+async def close_async_db():
+    """Close the async database connection pools."""
+    global async_engine, async_sessionLocal, replica_engines, replica_sessionLocals
+
+    for replica in replica_engines:
+        try:
+            await replica.dispose()
+        except SQLAlchemyError as e:
+            logger.error(f"Error closing replica connection: {e}")
+    replica_engines = []
+    replica_sessionLocals = []
+
+    if async_engine:
+        try:
+            await async_engine.dispose()
+            logger.info("Async database connection closed.")
+        except SQLAlchemyError as e:
+            logger.error(f"Error closing async database connection: {e}")
+
+    async_engine = None
+    async_sessionLocal = None
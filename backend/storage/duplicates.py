@@ -0,0 +1,535 @@
+"""Duplicate detection for dropped-off items.
+
+The same found item is sometimes registered twice, by different people,
+with near-identical text in the same category and room. `DuplicateIndex`
+keeps every item registered in the last DUPLICATE_WINDOW_DAYS (default
+14) in memory and finds likely duplicates of a new one without comparing
+it against all of them:
+
+- Text: a MinHash signature of the item's terms (name and description)
+  is split into LSH bands, and only items sharing a band in the same
+  category are compared. Pairs whose terms have a Jaccard similarity of
+  0.6 collide with 98% probability, pairs below 0.2 rarely do. Candidates
+  are kept if their exact Jaccard similarity reaches TEXT_THRESHOLD and
+  they were found in the same room.
+- Images: a 64-bit difference hash (dHash) of the item's photo is split
+  into eight bytes. Hashes differing in at most IMAGE_MAX_DISTANCE (7)
+  bits share a byte, so comparing the items that share one finds every
+  such pair; those are kept whatever their text says.
+
+Flags are recorded in `item_duplicates`, the later item pointing at the
+earlier one, and image hashes in `item_image_hashes`. The index is built
+at startup in a worker thread and picks up items registered by other
+workers like the match index does, as well as recent items whose image
+(and so image hash) another worker changed.
+
+    python -m backend.storage.duplicates [--workers N]
+
+scans the whole lost_items table instead, one category per process, and
+records every pair found (and any image hash not yet stored).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import random
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime as dt, timedelta, timezone as tz
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from backend.models.item_duplicate import ItemDuplicate, ItemImageHash
+from backend.models.lost_item import LostItem
+from backend.storage.matching import IndexedItem, indexed_item, terms
+from backend.storage.media_store import MediaError, media_store, parse_file_name
+from backend.storage.thumbnails import thumbnail_worker
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_WINDOW = timedelta(days=int(os.getenv("DUPLICATE_WINDOW_DAYS", "14")))
+REFRESH_SECONDS = float(os.getenv("DUPLICATE_REFRESH_SECONDS", "1"))
+# rows committed out of id order are caught by re-checking this many ids
+REFRESH_LAG_IDS = 1000
+# and items changed shortly before the last refresh (e.g. given an image,
+# whose hash is committed after the item) by re-checking this far back
+REFRESH_LAG = timedelta(seconds=60)
+MAX_DUPLICATES = 5
+
+MINHASH_PERMUTATIONS = 48
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+TEXT_THRESHOLD = 0.6
+
+IMAGE_BANDS = 8
+IMAGE_MAX_DISTANCE = IMAGE_BANDS - 1
+
+_PRIME = (1 << 61) - 1
+# fixed seed: signatures must agree across processes and restarts
+_random = random.Random(20240917)
+_PERMUTATIONS = [
+    (_random.randrange(1, _PRIME), _random.randrange(_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+
+@lru_cache(maxsize=200_000)
+def _term_hashes(term: str) -> tuple[int, ...]:
+    """The term's value under every MinHash permutation."""
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return tuple((a * value + b) % _PRIME for a, b in _PERMUTATIONS)
+
+
+def minhash(item_terms: Iterable[str]) -> Optional[tuple[int, ...]]:
+    """MinHash signature of a set of terms; None if it is empty."""
+    hashes = [_term_hashes(term) for term in item_terms]
+    if not hashes:
+        return None
+    return tuple(map(min, zip(*hashes)))
+
+
+def perceptual_hash(path: str) -> int:
+    """64-bit difference hash (dHash) of an image file."""
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as image:
+        # decode at a fraction of the size; only 9x8 pixels are kept
+        image.draft("L", (64, 64))
+        image = ImageOps.exif_transpose(image)
+        pixels = image.convert("L").resize((9, 8), Image.Resampling.BOX).tobytes()
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            left = pixels[row * 9 + column]
+            value = (value << 1) | (left > pixels[row * 9 + column + 1])
+    return value
+
+
+def to_signed(value: int) -> int:
+    """A 64-bit hash as a BIGINT."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def from_signed(value: int) -> int:
+    return value & ((1 << 64) - 1)
+
+
+def image_path(image_url: Optional[str]) -> Optional[Path]:
+    """The stored original behind an item's image URL, if there is one."""
+    if not image_url:
+        return None
+    try:
+        digest, ext = parse_file_name(image_url.rsplit("/", 1)[-1])
+    except MediaError:
+        return None
+    path = media_store.original_path(digest, ext)
+    return path if path.is_file() else None
+
+
+def jaccard(first: frozenset, second: frozenset) -> float:
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+@dataclass(frozen=True, slots=True)
+class Fingerprint:
+    id: int
+    category: int
+    found_in: Optional[int]
+    created_at: dt
+    terms: frozenset[str]
+    signature: Optional[tuple[int, ...]]
+    image_hash: Optional[int]
+
+
+def fingerprint(item: IndexedItem, image_hash: Optional[int] = None) -> Fingerprint:
+    return Fingerprint(
+        item.id,
+        item.category,
+        item.found_in,
+        item.created_at,
+        item.terms,
+        minhash(item.terms),
+        image_hash,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Duplicate:
+    item_id: int  # the later item
+    duplicate_of: int
+    text_similarity: float
+    image_distance: Optional[int]
+
+    def to_dict(self):
+        return {
+            "item_id": self.item_id,
+            "duplicate_of": self.duplicate_of,
+            "text_similarity": round(self.text_similarity, 6),
+            "image_distance": self.image_distance,
+        }
+
+
+def _bucket_keys(item: Fingerprint):
+    if item.signature is not None:
+        for band in range(LSH_BANDS):
+            rows = item.signature[band * LSH_ROWS : (band + 1) * LSH_ROWS]
+            yield (item.category, "text", band, rows)
+    if item.image_hash is not None:
+        for band in range(IMAGE_BANDS):
+            yield (item.category, "image", band, (item.image_hash >> 8 * band) & 0xFF)
+
+
+class DuplicateIndex:
+    """In-memory LSH index of recently registered items."""
+
+    def __init__(self):
+        self._items: dict[int, Fingerprint] = {}
+        self._buckets: dict[tuple, set[int]] = defaultdict(set)
+        # (created_at, id) in insertion order, for expiring old items
+        self._arrivals: deque[tuple[dt, int]] = deque()
+        self._high_water = 0
+        self._refreshed_at = 0.0
+        # items updated since then are re-read at the next refresh
+        self._changed_since = dt.min
+        self._lock = asyncio.Lock()
+        self._ready = asyncio.Event()
+        self._loading: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # maintenance
+
+    def add(self, item: Fingerprint):
+        """Index (or re-index) an item."""
+        self.remove(item.id)
+        self._items[item.id] = item
+        for key in _bucket_keys(item):
+            self._buckets[key].add(item.id)
+        self._arrivals.append((item.created_at, item.id))
+        self._high_water = max(self._high_water, item.id)
+
+    def remove(self, item_id: int):
+        """Drop an item from the index, if present."""
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return
+        for key in _bucket_keys(item):
+            bucket = self._buckets[key]
+            bucket.discard(item_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def expire(self, now: dt):
+        """Drop items registered more than DUPLICATE_WINDOW before `now`."""
+        cutoff = now - DUPLICATE_WINDOW
+        while self._arrivals and self._arrivals[0][0] < cutoff:
+            created_at, item_id = self._arrivals.popleft()
+            item = self._items.get(item_id)
+            if item is not None and item.created_at == created_at:
+                self.remove(item_id)
+
+    def setup(self, session: Session):
+        """Index every item registered within the window."""
+        now = dt.now(tz.utc).replace(tzinfo=None)
+        since = now - DUPLICATE_WINDOW
+        self._changed_since = now - REFRESH_LAG
+        rows = session.execute(
+            _fingerprint_rows()
+            .where(LostItem.created_at >= since)
+            .order_by(LostItem.created_at, LostItem.id)
+            .execution_options(yield_per=5000)
+        )
+        for row in rows:
+            self.add(_row_fingerprint(row))
+        self._refreshed_at = time.monotonic()
+        self._ready.set()
+        logger.info(f"Duplicate index built ({len(self._items)} recent items).")
+
+    def start(self, sessions: sessionmaker):
+        """Build the index in the background (idempotent)."""
+        if self._loading is None and not self._ready.is_set():
+            self._loading = asyncio.create_task(self._load(sessions))
+
+    async def stop(self):
+        """Wait for a background build that is still running."""
+        if self._loading is not None:
+            await self._loading
+            self._loading = None
+
+    async def _load(self, sessions: sessionmaker):
+        def build() -> DuplicateIndex:
+            built = DuplicateIndex()
+            with sessions() as session:
+                built.setup(session)
+            return built
+
+        try:
+            built = await asyncio.to_thread(build)
+        except Exception as e:
+            logger.error(f"Building the duplicate index failed: {e}")
+        else:
+            for name in (
+                "_items",
+                "_buckets",
+                "_arrivals",
+                "_high_water",
+                "_changed_since",
+            ):
+                setattr(self, name, getattr(built, name))
+        self._refreshed_at = 0.0
+        self._ready.set()
+
+    async def refresh(self, db: AsyncSession):
+        """Pick up items registered, or given an image, by other workers."""
+        if time.monotonic() - self._refreshed_at < REFRESH_SECONDS:
+            return
+        async with self._lock:
+            if time.monotonic() - self._refreshed_at < REFRESH_SECONDS:
+                return
+            self._refreshed_at = time.monotonic()
+            now = dt.now(tz.utc).replace(tzinfo=None)
+            self.expire(now)
+            rows = await db.execute(
+                _fingerprint_rows().where(
+                    or_(
+                        LostItem.id > self._high_water - REFRESH_LAG_IDS,
+                        and_(
+                            LostItem.created_at >= now - DUPLICATE_WINDOW,
+                            LostItem.updated_at >= self._changed_since,
+                        ),
+                    )
+                )
+            )
+            self._changed_since = now - REFRESH_LAG
+            for row in rows:
+                item = _row_fingerprint(row)
+                if self._items.get(item.id) != item:
+                    self.add(item)
+
+    # queries
+
+    def duplicates_of(self, item: Fingerprint) -> list[Duplicate]:
+        """Indexed items `item` likely duplicates, most similar first."""
+        candidates: set[int] = set()
+        for key in _bucket_keys(item):
+            candidates.update(self._buckets.get(key, ()))
+        candidates.discard(item.id)
+        found = []
+        for candidate_id in candidates:
+            other = self._items[candidate_id]
+            if abs(other.created_at - item.created_at) > DUPLICATE_WINDOW:
+                continue
+            similarity = jaccard(item.terms, other.terms)
+            distance = None
+            if item.image_hash is not None and other.image_hash is not None:
+                distance = (item.image_hash ^ other.image_hash).bit_count()
+            if (similarity >= TEXT_THRESHOLD and item.found_in == other.found_in) or (
+                distance is not None and distance <= IMAGE_MAX_DISTANCE
+            ):
+                later, earlier = max(item.id, other.id), min(item.id, other.id)
+                found.append(Duplicate(later, earlier, similarity, distance))
+        found.sort(
+            key=lambda duplicate: (
+                -duplicate.text_similarity,
+                (
+                    duplicate.image_distance
+                    if duplicate.image_distance is not None
+                    else 65
+                ),
+            )
+        )
+        return found[:MAX_DUPLICATES]
+
+    async def check(
+        self, db: AsyncSession, item: IndexedItem, image_url: Optional[str] = None
+    ) -> list[dict]:
+        """Index a new (or newly photographed) item and record its duplicates."""
+        await self._ready.wait()
+        await self.refresh(db)
+        image_hash = None
+        path = image_path(image_url)
+        if path is not None:
+            try:
+                # decoding is CPU-bound; keep it off the web process
+                image_hash = await thumbnail_worker.run(perceptual_hash, str(path))
+            except Exception as e:
+                logger.warning(f"Hashing the image of item {item.id} failed: {e}")
+        indexed = fingerprint(item, image_hash)
+        duplicates = self.duplicates_of(indexed)
+        self.add(indexed)
+
+        if image_hash is not None:
+            await db.execute(
+                pg_insert(ItemImageHash)
+                .values(item_id=item.id, image_hash=to_signed(image_hash))
+                .on_conflict_do_update(
+                    index_elements=[ItemImageHash.item_id],
+                    set_={"image_hash": to_signed(image_hash)},
+                )
+            )
+        if duplicates:
+            flags = pg_insert(ItemDuplicate).values(
+                [duplicate.to_dict() for duplicate in duplicates]
+            )
+            # a pair first flagged by its text gets the image distance later
+            await db.execute(
+                flags.on_conflict_do_update(
+                    index_elements=[ItemDuplicate.item_id, ItemDuplicate.duplicate_of],
+                    set_={
+                        "image_distance": func.coalesce(
+                            flags.excluded.image_distance, ItemDuplicate.image_distance
+                        )
+                    },
+                )
+            )
+        if image_hash is not None or duplicates:
+            await db.commit()
+        return [duplicate.to_dict() for duplicate in duplicates]
+
+
+def _fingerprint_rows():
+    return select(
+        LostItem.id,
+        LostItem.category,
+        LostItem.found_in,
+        LostItem.created_at,
+        LostItem.name,
+        LostItem.description,
+        ItemImageHash.image_hash,
+    ).outerjoin(ItemImageHash, ItemImageHash.item_id == LostItem.id)
+
+
+def _row_fingerprint(row) -> Fingerprint:
+    image_hash = None if row.image_hash is None else from_signed(row.image_hash)
+    return fingerprint(indexed_item(row), image_hash)
+
+
+duplicate_index = DuplicateIndex()
+
+
+# batch mode
+
+
+@dataclass(frozen=True, slots=True)
+class _ScanRow:
+    id: int
+    category: int
+    found_in: Optional[int]
+    created_at: dt
+    name: str
+    description: Optional[str]
+    image_url: Optional[str]
+    image_hash: Optional[int]
+
+
+def scan_category(rows: list[_ScanRow]) -> tuple[list[tuple[int, int]], list[dict]]:
+    """Find the duplicates among one category's items, oldest first.
+
+    Runs in a worker process; returns the image hashes it had to compute
+    and the duplicates found.
+    """
+    index = DuplicateIndex()
+    new_hashes = []
+    duplicates = []
+    for row in rows:
+        image_hash = None if row.image_hash is None else from_signed(row.image_hash)
+        path = image_path(row.image_url) if image_hash is None else None
+        if path is not None:
+            try:
+                image_hash = perceptual_hash(str(path))
+                new_hashes.append((row.id, image_hash))
+            except Exception as e:
+                logger.warning(f"Hashing the image of item {row.id} failed: {e}")
+        item = fingerprint(indexed_item(row), image_hash)
+        index.expire(item.created_at)
+        duplicates.extend(d.to_dict() for d in index.duplicates_of(item))
+        index.add(item)
+    return new_hashes, duplicates
+
+
+def scan(workers: int, chunk_size: int = 5000) -> tuple[int, int]:
+    """Scan lost_items for duplicates on `workers` processes and record them."""
+    from backend.storage import database
+
+    database.db_init()
+    try:
+        by_category: dict[int, list[_ScanRow]] = defaultdict(list)
+        with database.sessionLocal() as session:
+            rows = session.execute(
+                select(
+                    LostItem.id,
+                    LostItem.category,
+                    LostItem.found_in,
+                    LostItem.created_at,
+                    LostItem.name,
+                    LostItem.description,
+                    LostItem.image_url,
+                    ItemImageHash.image_hash,
+                )
+                .outerjoin(ItemImageHash, ItemImageHash.item_id == LostItem.id)
+                .order_by(LostItem.created_at, LostItem.id)
+                .execution_options(yield_per=chunk_size)
+            )
+            for row in rows:
+                by_category[row.category].append(_ScanRow(*row))
+        # largest categories first, so no process is left with a big one last
+        groups = sorted(by_category.values(), key=len, reverse=True)
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            results = list(pool.map(scan_category, groups))
+
+        hashes = [
+            {"item_id": item_id, "image_hash": to_signed(image_hash)}
+            for new_hashes, _ in results
+            for item_id, image_hash in new_hashes
+        ]
+        duplicates = [duplicate for _, found in results for duplicate in found]
+        with database.sessionLocal() as session:
+            for start in range(0, len(hashes), chunk_size):
+                session.execute(
+                    pg_insert(ItemImageHash)
+                    .values(hashes[start : start + chunk_size])
+                    .on_conflict_do_nothing()
+                )
+            for start in range(0, len(duplicates), chunk_size):
+                session.execute(
+                    pg_insert(ItemDuplicate)
+                    .values(duplicates[start : start + chunk_size])
+                    .on_conflict_do_nothing()
+                )
+            session.commit()
+        return len(hashes), len(duplicates)
+    finally:
+        database.close_db()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Flag duplicate lost items.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    started = time.perf_counter()
+    hashed, flagged = scan(args.workers)
+    print(
+        f"Hashed {hashed} images and flagged {flagged} duplicate pairs "
+        f"in {time.perf_counter() - started:.1f}s."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
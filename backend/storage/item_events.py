@@ -0,0 +1,244 @@
+"""Lost item status transitions and their append-only event log.
+
+A transition is one guarded UPDATE: it only applies if the item's current
+status may move to the requested one (api.utils.constants.
+ITEM_STATUS_TRANSITIONS), and returns the status it replaced, so
+concurrent claims cannot both succeed.
+
+The resulting `item_events` rows are not written in the transition's
+transaction. `ItemEventWriter` buffers them in memory and a background task
+inserts each batch with one statement every ITEM_EVENTS_FLUSH_MS (default
+200) or as soon as ITEM_EVENTS_BATCH_SIZE (default 500) are waiting, so
+the claim and collect path pays for one write, not two. The price is that
+events still buffered when the process dies are lost; shutdown flushes
+the buffer. A batch that fails is retried row by row: rows the database
+rejects are logged to the `dead_letter` logger and dropped, the rest are
+kept while the database is unreachable. Updates and deletes on item_events
+are rejected by a trigger.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime as dt
+from typing import Optional
+from sqlalchemy import Engine, Update, insert, select, text, update
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from backend.api.utils.constants import ITEM_STATUS_TRANSITIONS, ItemStatus
+from backend.models.item_event import ItemEvent
+from backend.models.lost_item import LostItem
+from backend.storage.search import SEARCH_RESULT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+FLUSH_SECONDS = int(os.getenv("ITEM_EVENTS_FLUSH_MS", "200")) / 1000
+BATCH_SIZE = int(os.getenv("ITEM_EVENTS_BATCH_SIZE", "500"))
+MAX_PENDING = int(os.getenv("ITEM_EVENTS_MAX_PENDING", "100000"))
+
+# events the database rejected, or that could not be kept any longer
+dead_letter = logging.getLogger(f"{__name__}.dead_letter")
+
+_APPEND_ONLY = """
+CREATE OR REPLACE FUNCTION item_events_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'item_events is append-only';
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS item_events_append_only ON item_events;
+CREATE TRIGGER item_events_append_only
+BEFORE UPDATE OR DELETE ON item_events
+FOR EACH STATEMENT EXECUTE FUNCTION item_events_append_only();
+"""
+
+
+def ensure_item_events(engine: Engine):
+    """Install the trigger that makes item_events append-only, if missing."""
+    with engine.begin() as connection:
+        installed = connection.execute(
+            text("SELECT 1 FROM pg_trigger WHERE tgname = 'item_events_append_only'")
+        ).first()
+        if installed is None:
+            connection.execute(text(_APPEND_ONLY))
+            logger.info("Installed the item_events append-only trigger.")
+
+
+def predecessors(status: ItemStatus) -> list[ItemStatus]:
+    """Statuses an item may move to `status` from."""
+    return [
+        previous
+        for previous, following in ITEM_STATUS_TRANSITIONS.items()
+        if status in following
+    ]
+
+
+def transition_statement(
+    item_id: int, to_status: ItemStatus, actor: Optional[str], now: dt
+) -> Update:
+    """Guarded status update returning the item and the status it replaced."""
+    previous = (
+        select(LostItem.id, LostItem.status)
+        .where(LostItem.id == item_id)
+        .with_for_update()
+        .subquery("previous")
+    )
+    values = {"status": to_status, "updated_at": now}
+    if to_status is ItemStatus.CLAIMED:
+        values["claimed_by"] = actor
+    elif to_status is ItemStatus.COLLECTED:
+        values["collected_by"] = actor
+    elif to_status is ItemStatus.DROPPED_OFF:
+        values["claimed_by"] = None
+    return (
+        update(LostItem)
+        .where(
+            LostItem.id == previous.c.id,
+            # checked on both: the target row is re-checked after a
+            # concurrent update, the locked subquery supplies the old value
+            LostItem.status.in_(predecessors(to_status)),
+            previous.c.status.in_(predecessors(to_status)),
+        )
+        .values(values)
+        .returning(*SEARCH_RESULT_COLUMNS, previous.c.status.label("from_status"))
+    )
+
+
+def _rejected(error: DBAPIError) -> bool:
+    """Whether the database refused the statement, rather than being unreachable."""
+    return not error.connection_invalidated and not isinstance(
+        error, (InterfaceError, OperationalError)
+    )
+
+
+class ItemEventWriter:
+    """Buffers item events and inserts them in batches."""
+
+    def __init__(self):
+        self._buffer: list[dict] = []
+        self._writing: list[dict] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+        self._sessions: Optional[async_sessionmaker] = None
+
+    def start(self, sessions: async_sessionmaker):
+        """Start the background flusher (idempotent)."""
+        self._sessions = sessions
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher after it has written whatever is still buffered."""
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+
+    def record(
+        self,
+        item_id: int,
+        from_status: Optional[ItemStatus],
+        to_status: ItemStatus,
+        actor: Optional[str],
+        occurred_at: dt,
+    ):
+        """Queue an event; it is written with the next batch."""
+        self._buffer.append(
+            {
+                "item_id": item_id,
+                "from_status": from_status,
+                "to_status": to_status,
+                "actor": actor,
+                "occurred_at": occurred_at,
+            }
+        )
+        if len(self._buffer) >= BATCH_SIZE and self._wake is not None:
+            self._wake.set()
+
+    def pending(self, item_id: int) -> list[dict]:
+        """Events for an item that have not been written yet."""
+        return [
+            event
+            for event in (*self._writing, *self._buffer)
+            if event["item_id"] == item_id
+        ]
+
+    async def flush(self):
+        """Write the buffered events in one statement."""
+        if not self._buffer or self._sessions is None:
+            return
+        batch = self._writing = self._buffer
+        self._buffer = []
+        try:
+            async with self._sessions() as session:
+                await session.execute(insert(ItemEvent), batch)
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Writing {len(batch)} item events failed: {e}")
+            await self._write_one_by_one(batch)
+        finally:
+            self._writing = []
+
+    async def _write_one_by_one(self, batch: list[dict]):
+        """Write a failed batch row by row, so one bad row cannot block the rest.
+
+        Rows the database rejects go to the dead-letter log; if it cannot be
+        reached, the unwritten rows are kept, in order, for the next flush
+        (up to MAX_PENDING buffered events, dropping the oldest).
+        """
+        for index, event in enumerate(batch):
+            try:
+                async with self._sessions() as session:
+                    await session.execute(insert(ItemEvent), [event])
+                    await session.commit()
+            except DBAPIError as e:
+                if not _rejected(e):
+                    self._buffer[:0] = batch[index:]
+                    break
+                dead_letter.error(f"Dropped item event {event}: {e}")
+            except Exception:
+                self._buffer[:0] = batch[index:]
+                break
+        overflow = len(self._buffer) - MAX_PENDING
+        if overflow > 0:
+            for event in self._buffer[:overflow]:
+                dead_letter.error(f"Dropped item event {event}: buffer full")
+            del self._buffer[:overflow]
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+
+async def item_timeline(db: AsyncSession, item_id: int) -> list[dict]:
+    """Every recorded status change of an item, oldest first."""
+    rows = await db.execute(
+        select(
+            ItemEvent.from_status,
+            ItemEvent.to_status,
+            ItemEvent.actor,
+            ItemEvent.occurred_at,
+        )
+        .where(ItemEvent.item_id == item_id)
+        .order_by(ItemEvent.occurred_at, ItemEvent.id)
+    )
+    events = [row._asdict() for row in rows]
+    events.extend(
+        {
+            key: event[key]
+            for key in ("from_status", "to_status", "actor", "occurred_at")
+        }
+        for event in item_event_writer.pending(item_id)
+    )
+    return events
+
+
+item_event_writer = ItemEventWriter()
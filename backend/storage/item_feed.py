@@ -0,0 +1,308 @@
+"""Real-time feed of dropped-off items and status changes.
+
+Statement-level triggers on `lost_items` send a NOTIFY on the
+`lost_items_feed` channel for every inserted item and every item whose
+status changed, when the transaction commits, whichever worker (or
+script) made the change. Each worker holds one connection that LISTENs
+on the channel and hands the notifications to `ItemFeed`, which fans
+them out to the worker's subscribers:
+
+- subscribers are indexed by the categories and rooms they follow (or
+  follow everything), so an event only touches the subscribers it is for
+- an event is encoded once, whatever the number of subscribers
+- each subscriber has a queue of ITEM_FEED_QUEUE_SIZE (default 64)
+  events; one that falls that far behind is dropped rather than letting
+  its backlog grow, and reconnects
+
+Events are not replayed: those sent while a client or the listening
+connection was disconnected are missed, and clients catch up with
+`GET /items`.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import suppress
+from typing import Iterable, Iterator, Optional
+import asyncpg
+import orjson
+from sqlalchemy import Engine, text
+from backend.api.config.db_config import DatabaseSettings, db_settings
+from backend.api.utils.constants import ItemStatus
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "lost_items_feed"
+QUEUE_SIZE = int(os.getenv("ITEM_FEED_QUEUE_SIZE", "64"))
+MAX_SUBSCRIBERS = int(os.getenv("ITEM_FEED_MAX_SUBSCRIBERS", "10000"))
+# how often the listening connection is checked, and the longest wait
+# before reconnecting it
+KEEPALIVE_SECONDS = 30.0
+MAX_RECONNECT_SECONDS = 30.0
+
+_ITEM_JSON = """json_build_object(
+        'id', new_rows.id,
+        'name', new_rows.name,
+        'status', new_rows.status,
+        'category', new_rows.category,
+        'found_in', new_rows.found_in,
+        'dropped_off_at', new_rows.dropped_off_at,
+        'image_url', new_rows.image_url,
+        'updated_at', new_rows.updated_at"""
+
+_FUNCTIONS = f"""
+CREATE OR REPLACE FUNCTION item_feed_insert() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{CHANNEL}', {_ITEM_JSON},
+        'event', 'created'
+    )::text)
+    FROM new_rows;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION item_feed_update() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{CHANNEL}', {_ITEM_JSON},
+        'event', 'status_changed',
+        'from_status', old_rows.status
+    )::text)
+    FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+    WHERE new_rows.status IS DISTINCT FROM old_rows.status;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+"""
+
+# (trigger name, event, transition tables, function)
+_TRIGGERS = [
+    ("item_feed_ins", "INSERT", "NEW TABLE AS new_rows", "item_feed_insert"),
+    (
+        "item_feed_upd",
+        "UPDATE",
+        "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "item_feed_update",
+    ),
+]
+
+
+def ensure_item_feed(engine: Engine):
+    """Install the triggers notifying the feed channel, if missing."""
+    names = [name for name, *_ in _TRIGGERS]
+    with engine.begin() as connection:
+        connection.execute(text(_FUNCTIONS))
+        installed = set(
+            connection.execute(
+                text("SELECT tgname FROM pg_trigger WHERE tgname = ANY(:names)"),
+                {"names": names},
+            ).scalars()
+        )
+        for name, event, transition, function in _TRIGGERS:
+            if name in installed:
+                continue
+            connection.execute(
+                text(
+                    f"CREATE TRIGGER {name} AFTER {event} ON lost_items "
+                    f"REFERENCING {transition} "
+                    f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+                )
+            )
+            logger.info(f"Installed the {name} item feed trigger.")
+
+
+class FeedEvent:
+    """An event, encoded once for all its subscribers."""
+
+    __slots__ = ("json", "_sse")
+
+    def __init__(self, message: dict):
+        self.json = orjson.dumps(message).decode()
+        self._sse: Optional[bytes] = None
+
+    @property
+    def sse(self) -> bytes:
+        """The event as a server-sent events message."""
+        if self._sse is None:
+            self._sse = f"data: {self.json}\n\n".encode()
+        return self._sse
+
+
+# key of the subscribers that follow every item
+_EVERYTHING = ("all", None)
+
+
+class Subscription:
+    """One client's filter and its queue of pending events."""
+
+    def __init__(self, categories: frozenset[int], rooms: frozenset[int]):
+        self.categories = categories
+        self.rooms = rooms
+        self.queue: asyncio.Queue[Optional[FeedEvent]] = asyncio.Queue(QUEUE_SIZE)
+
+    def keys(self) -> Iterator[tuple]:
+        if not self.categories and not self.rooms:
+            yield _EVERYTHING
+        for category in self.categories:
+            yield ("category", category)
+        for room in self.rooms:
+            yield ("room", room)
+
+    def to_dict(self):
+        return {"categories": sorted(self.categories), "rooms": sorted(self.rooms)}
+
+    async def next(self) -> Optional[FeedEvent]:
+        """The next event; None once the subscription was dropped."""
+        return await self.queue.get()
+
+
+class ItemFeed:
+    """In-process pub/sub of item events, fed by Postgres notifications."""
+
+    def __init__(self, max_subscribers: int = MAX_SUBSCRIBERS):
+        self.max_subscribers = max_subscribers
+        self._subscribers: dict[tuple, set[Subscription]] = {}
+        self._count = 0
+        self._task: Optional[asyncio.Task] = None
+        self.listening = asyncio.Event()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # subscriptions
+
+    def subscribe(
+        self, categories: Iterable[int] = (), rooms: Iterable[int] = ()
+    ) -> Optional[Subscription]:
+        """Follow items in any of `categories` or `rooms` (all items if
+        neither is given); None if the worker has too many subscribers."""
+        if self._count >= self.max_subscribers:
+            return None
+        subscription = Subscription(frozenset(categories), frozenset(rooms))
+        self._index(subscription)
+        self._count += 1
+        return subscription
+
+    def update(
+        self,
+        subscription: Subscription,
+        categories: Iterable[int] = (),
+        rooms: Iterable[int] = (),
+    ):
+        """Change what a subscription follows (if it was not dropped)."""
+        active = self._unindex(subscription)
+        subscription.categories = frozenset(categories)
+        subscription.rooms = frozenset(rooms)
+        if active:
+            self._index(subscription)
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop delivering to a subscription (idempotent)."""
+        if self._unindex(subscription):
+            self._count -= 1
+
+    def _index(self, subscription: Subscription):
+        for key in subscription.keys():
+            self._subscribers.setdefault(key, set()).add(subscription)
+
+    def _unindex(self, subscription: Subscription) -> bool:
+        removed = False
+        for key in subscription.keys():
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None and subscription in subscribers:
+                subscribers.discard(subscription)
+                removed = True
+                if not subscribers:
+                    del self._subscribers[key]
+        return removed
+
+    # delivery
+
+    def publish(self, message: dict) -> int:
+        """Deliver an item event to its subscribers; returns how many."""
+        item = message["item"]
+        targets = set(self._subscribers.get(_EVERYTHING, ()))
+        targets.update(self._subscribers.get(("category", item["category"]), ()))
+        targets.update(self._subscribers.get(("room", item["found_in"]), ()))
+        if not targets:
+            return 0
+        event = FeedEvent(message)
+        for subscription in targets:
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+        return len(targets)
+
+    def _drop(self, subscription: Subscription):
+        """Disconnect a subscriber that stopped keeping up."""
+        self.unsubscribe(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def _notified(self, connection, pid: int, channel: str, payload: str):
+        if not self._count:
+            return
+        try:
+            row = orjson.loads(payload)
+            event = row.pop("event")
+            row["status"] = ItemStatus[row["status"]].value
+            if "from_status" in row:
+                row["from_status"] = ItemStatus[row["from_status"]].value
+        except (orjson.JSONDecodeError, KeyError) as e:
+            logger.warning(f"Ignoring malformed item feed notification: {e}")
+            return
+        self.publish({"event": event, "item": row})
+
+    # listening
+
+    def start(self, settings: Optional[DatabaseSettings] = None):
+        """Listen for notifications in the background (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(settings or db_settings))
+
+    async def stop(self):
+        """Stop listening and disconnect every subscriber."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for subscribers in list(self._subscribers.values()):
+            for subscription in list(subscribers):
+                self._drop(subscription)
+
+    async def _listen(self, settings: DatabaseSettings):
+        delay = 1.0
+        while True:
+            try:
+                connection = await asyncpg.connect(
+                    host=settings.host,
+                    port=settings.port,
+                    user=settings.user,
+                    password=settings.password,
+                    database=settings.name,
+                )
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.error(f"Connecting the item feed failed: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_SECONDS)
+                continue
+            delay = 1.0
+            try:
+                await connection.add_listener(CHANNEL, self._notified)
+                self.listening.set()
+                while True:
+                    await asyncio.sleep(KEEPALIVE_SECONDS)
+                    await connection.execute("SELECT 1", timeout=KEEPALIVE_SECONDS)
+            except (
+                OSError,
+                asyncio.TimeoutError,
+                asyncpg.InterfaceError,
+                asyncpg.PostgresError,
+            ) as e:
+                logger.warning(f"Item feed connection lost, reconnecting: {e}")
+            finally:
+                self.listening.clear()
+                connection.terminate()
+
+
+item_feed = ItemFeed()
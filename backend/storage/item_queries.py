@@ -0,0 +1,65 @@
+"""Canonical lost item queries.
+
+The routes and the query-plan check (backend/benchmarks/query_plans.py)
+build their statements here, so the plans that are checked are the plans
+that are served.
+"""
+
+from datetime import datetime as dt
+from typing import Optional
+from sqlalchemy import Select, select, tuple_
+from backend.api.utils.constants import ItemStatus, OPEN_ITEM_STATUSES
+from backend.models.archived_lost_item import ArchivedLostItem
+from backend.models.lost_item import LostItem
+
+LIST_COLUMNS = tuple(LostItem.__table__.columns)
+ARCHIVE_LIST_COLUMNS = tuple(ArchivedLostItem.__table__.columns)
+
+
+def listing_statement(
+    *,
+    order: str = "desc",
+    after: Optional[tuple[dt, int]] = None,
+    status: Optional[ItemStatus] = None,
+    open_only: bool = False,
+    dropped_off_at: Optional[int] = None,
+    category: Optional[int] = None,
+    found_in: Optional[int] = None,
+    archived: bool = False,
+) -> Select:
+    """Keyset-ordered select over (created_at, id), optionally after a cursor.
+
+    `archived=True` reads the archive of collected items instead.
+    """
+    model = ArchivedLostItem if archived else LostItem
+    statement = select(*(ARCHIVE_LIST_COLUMNS if archived else LIST_COLUMNS))
+    if status is not None:
+        statement = statement.where(model.status == status)
+    if open_only:
+        statement = statement.where(model.status.in_(OPEN_ITEM_STATUSES))
+    if dropped_off_at is not None:
+        statement = statement.where(model.dropped_off_at == dropped_off_at)
+    if category is not None:
+        statement = statement.where(model.category == category)
+    if found_in is not None:
+        statement = statement.where(model.found_in == found_in)
+
+    key = tuple_(model.created_at, model.id)
+    if after is not None:
+        position = tuple_(*after)
+        statement = statement.where(
+            key < position if order == "desc" else key > position
+        )
+    if order == "desc":
+        return statement.order_by(model.created_at.desc(), model.id.desc())
+    return statement.order_by(model.created_at, model.id)
+
+
+def items_for_user_statement(column, user_id: str, limit: int = 50) -> Select:
+    """Newest items a user found, dropped off, claimed or collected."""
+    return (
+        select(*LIST_COLUMNS)
+        .where(column == user_id)
+        .order_by(LostItem.created_at.desc())
+        .limit(limit)
+    )
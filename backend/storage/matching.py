@@ -0,0 +1,438 @@
+"""Matching lost reports against found items.
+
+`MatchIndex` keeps open items and open reports in memory, bucketed by
+(category, day). A report only has to score the items of its category
+that were registered between the start of its loss window and
+MATCH_GRACE_DAYS after its end, typically a few hundred candidates even
+with hundreds of thousands of items. A new drop-off only scores the open
+reports whose window covers its day.
+
+Scores combine IDF-weighted token overlap between the report text and the
+item's name and description (60%), the room it was found in (25%; half
+credit for another room in the same building), and how soon after the
+loss window it was registered (15%).
+
+At startup the index is built in a worker thread (`start`), so the
+application serves other requests meanwhile; matching waits for it.
+
+The index is maintained incrementally. Items and reports created through
+this process are added directly. Rows created by other workers are
+picked up by `refresh()`, at most once per MATCH_REFRESH_SECONDS. Items
+and reports that are no longer open are dropped lazily, when the database
+check on every result shows they have moved on.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime as dt, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from backend.api.utils.constants import OPEN_ITEM_STATUSES
+from backend.models.lost_item import LostItem
+from backend.models.lost_report import LostReport, ReportMatch
+from backend.models.room import Room
+from backend.storage.search import SEARCH_RESULT_COLUMNS, search_result, tokenize
+
+logger = logging.getLogger(__name__)
+
+MATCH_GRACE = timedelta(days=int(os.getenv("MATCH_GRACE_DAYS", "14")))
+MAX_REPORT_WINDOW = timedelta(days=90)
+REFRESH_SECONDS = float(os.getenv("MATCH_REFRESH_SECONDS", "1"))
+# rows committed out of id order are caught by re-checking this many ids
+REFRESH_LAG_IDS = 1000
+# minimum score for a new drop-off to be recorded as a match for a report
+DROP_OFF_MATCH_THRESHOLD = 0.5
+
+TEXT_WEIGHT = 0.6
+ROOM_WEIGHT = 0.25
+TIME_WEIGHT = 0.15
+
+# words common in reports that say nothing about the item
+STOPWORDS = frozenset(
+    "a an and at by for from i in is it lost me my near of on or left the "
+    "think was were with".split()
+)
+
+ITEM_COLUMNS = (
+    LostItem.id,
+    LostItem.category,
+    LostItem.found_in,
+    LostItem.created_at,
+    LostItem.name,
+    LostItem.description,
+)
+REPORT_COLUMNS = (
+    LostReport.id,
+    LostReport.category,
+    LostReport.room,
+    LostReport.lost_from,
+    LostReport.lost_until,
+    LostReport.description,
+)
+
+
+def terms(value: str) -> frozenset[str]:
+    """The distinct meaningful tokens of a text."""
+    return frozenset(t for t in tokenize(value) if t not in STOPWORDS)
+
+
+def day(moment: dt) -> int:
+    return moment.toordinal()
+
+
+def building(room_code: str) -> str:
+    """The building part of a room code ("KG-10" -> "KG")."""
+    return room_code.split("-", 1)[0].strip().upper()
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedItem:
+    id: int
+    category: int
+    found_in: Optional[int]
+    created_at: dt
+    terms: frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedReport:
+    id: int
+    category: int
+    room: Optional[int]
+    lost_from: dt
+    lost_until: dt
+    terms: frozenset[str]
+
+    def days(self) -> range:
+        """The days on which a matching item may have been registered."""
+        return range(day(self.lost_from), day(self.lost_until + MATCH_GRACE) + 1)
+
+
+def indexed_item(row) -> IndexedItem:
+    return IndexedItem(
+        row.id,
+        row.category,
+        row.found_in,
+        row.created_at,
+        terms(f"{row.name} {row.description or ''}"),
+    )
+
+
+def indexed_report(row) -> IndexedReport:
+    return IndexedReport(
+        row.id,
+        row.category,
+        row.room,
+        row.lost_from,
+        row.lost_until,
+        terms(row.description),
+    )
+
+
+class MatchIndex:
+    """In-memory index of open items and open reports."""
+
+    def __init__(self):
+        self._items: dict[int, IndexedItem] = {}
+        self._item_buckets: dict[tuple[int, int], set[int]] = defaultdict(set)
+        self._document_frequency: Counter = Counter()
+        self._reports: dict[int, IndexedReport] = {}
+        self._report_buckets: dict[tuple[int, int], set[int]] = defaultdict(set)
+        self._buildings: dict[int, str] = {}
+        self._item_high_water = 0
+        self._report_high_water = 0
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+        self._ready = asyncio.Event()
+        self._loading: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # maintenance
+
+    def add_item(self, item: IndexedItem):
+        """Index (or re-index) an open item."""
+        self.remove_item(item.id)
+        self._items[item.id] = item
+        self._item_buckets[(item.category, day(item.created_at))].add(item.id)
+        self._document_frequency.update(item.terms)
+        self._item_high_water = max(self._item_high_water, item.id)
+
+    def remove_item(self, item_id: int):
+        """Drop an item from the index, if present."""
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return
+        self._item_buckets[(item.category, day(item.created_at))].discard(item_id)
+        self._document_frequency.subtract(item.terms)
+
+    def add_report(self, report: IndexedReport):
+        """Index (or re-index) an open report."""
+        self.remove_report(report.id)
+        self._reports[report.id] = report
+        for report_day in report.days():
+            self._report_buckets[(report.category, report_day)].add(report.id)
+        self._report_high_water = max(self._report_high_water, report.id)
+
+    def remove_report(self, report_id: int):
+        """Drop a report from the index, if present."""
+        report = self._reports.pop(report_id, None)
+        if report is None:
+            return
+        for report_day in report.days():
+            self._report_buckets[(report.category, report_day)].discard(report_id)
+
+    def add_rooms(self, rows: Iterable):
+        for row in rows:
+            self._buildings[row.id] = building(row.code)
+
+    def setup(self, session: Session):
+        """Index every open item and open report currently in the database."""
+        self.add_rooms(session.execute(select(Room.id, Room.code)))
+        items = select(*ITEM_COLUMNS).where(LostItem.status.in_(OPEN_ITEM_STATUSES))
+        for row in session.execute(items.execution_options(yield_per=5000)):
+            self.add_item(indexed_item(row))
+        reports = select(*REPORT_COLUMNS).where(LostReport.is_open)
+        for row in session.execute(reports):
+            self.add_report(indexed_report(row))
+        self._refreshed_at = time.monotonic()
+        self._ready.set()
+        logger.info(
+            f"Match index built ({len(self._items)} open items, "
+            f"{len(self._reports)} open reports)."
+        )
+
+    def start(self, sessions: sessionmaker):
+        """Build the index in the background (idempotent)."""
+        if self._loading is None and not self._ready.is_set():
+            self._loading = asyncio.create_task(self._load(sessions))
+
+    async def stop(self):
+        """Wait for a background build that is still running."""
+        if self._loading is not None:
+            await self._loading
+            self._loading = None
+
+    async def _load(self, sessions: sessionmaker):
+        def build() -> MatchIndex:
+            built = MatchIndex()
+            with sessions() as session:
+                built.setup(session)
+            return built
+
+        try:
+            built = await asyncio.to_thread(build)
+        except Exception as e:
+            # don't leave matching waiting forever; refresh() still picks up
+            # rows near the high-water marks
+            logger.error(f"Building the match index failed: {e}")
+        else:
+            # changes made while building are replaced; the refresh forced
+            # below re-reads the rows written meanwhile
+            for name in (
+                "_items",
+                "_item_buckets",
+                "_document_frequency",
+                "_reports",
+                "_report_buckets",
+                "_buildings",
+                "_item_high_water",
+                "_report_high_water",
+            ):
+                setattr(self, name, getattr(built, name))
+        self._refreshed_at = 0.0
+        self._ready.set()
+
+    async def refresh(self, db: AsyncSession):
+        """Pick up items, reports and rooms created by other workers."""
+        if time.monotonic() - self._refreshed_at < REFRESH_SECONDS:
+            return
+        async with self._lock:
+            if time.monotonic() - self._refreshed_at < REFRESH_SECONDS:
+                return
+            self._refreshed_at = time.monotonic()
+            new_items = await self._unseen_ids(
+                db,
+                LostItem.id,
+                self._items,
+                self._item_high_water,
+                LostItem.status.in_(OPEN_ITEM_STATUSES),
+            )
+            if new_items:
+                rows = await db.execute(
+                    select(*ITEM_COLUMNS).where(LostItem.id.in_(new_items))
+                )
+                for row in rows:
+                    self.add_item(indexed_item(row))
+            new_reports = await self._unseen_ids(
+                db,
+                LostReport.id,
+                self._reports,
+                self._report_high_water,
+                LostReport.is_open,
+            )
+            if new_reports:
+                rows = await db.execute(
+                    select(*REPORT_COLUMNS).where(LostReport.id.in_(new_reports))
+                )
+                for row in rows:
+                    self.add_report(indexed_report(row))
+            rooms = await db.execute(
+                select(Room.id, Room.code).where(Room.id.not_in(self._buildings))
+            )
+            self.add_rooms(rooms)
+
+    @staticmethod
+    async def _unseen_ids(db, id_column, known, high_water, is_open) -> list[int]:
+        """Ids of open rows near or above the high-water mark not yet indexed."""
+        ids = await db.execute(
+            select(id_column).where(id_column > high_water - REFRESH_LAG_IDS, is_open)
+        )
+        return [row_id for row_id in ids.scalars() if row_id not in known]
+
+    # scoring
+
+    def _idf(self, term: str) -> float:
+        frequency = max(0, self._document_frequency.get(term, 0))
+        total = len(self._items)
+        return math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+
+    def _text_score(self, query: frozenset[str], document: frozenset[str]) -> float:
+        """IDF-weighted share of the query terms found in the document."""
+        total = matched = 0.0
+        for term in query:
+            weight = self._idf(term)
+            total += weight
+            if term in document:
+                matched += weight
+            elif len(term) >= 3 and any(
+                len(other) >= 3 and (other.startswith(term) or term.startswith(other))
+                for other in document
+            ):
+                # plurals and truncations ("earphone", "earphones")
+                matched += 0.8 * weight
+        return matched / total if total else 0.0
+
+    def _room_score(self, reported: Optional[int], found_in: Optional[int]) -> float:
+        if reported is None or found_in is None:
+            return 0.0
+        if reported == found_in:
+            return 1.0
+        reported_building = self._buildings.get(reported)
+        if reported_building and reported_building == self._buildings.get(found_in):
+            return 0.5
+        return 0.0
+
+    @staticmethod
+    def _time_score(report: IndexedReport, registered: dt) -> float:
+        if registered <= report.lost_until:
+            return 1.0
+        late = (registered - report.lost_until) / MATCH_GRACE
+        return max(0.0, 1.0 - late)
+
+    def score(self, report: IndexedReport, item: IndexedItem) -> float:
+        return (
+            TEXT_WEIGHT * self._text_score(report.terms, item.terms)
+            + ROOM_WEIGHT * self._room_score(report.room, item.found_in)
+            + TIME_WEIGHT * self._time_score(report, item.created_at)
+        )
+
+    def candidates(self, report: IndexedReport, limit: int) -> list[tuple[float, int]]:
+        """The best (score, item id) pairs for a report, best first."""
+        scored = []
+        for report_day in report.days():
+            for item_id in self._item_buckets.get((report.category, report_day), ()):
+                item = self._items[item_id]
+                if item.created_at < report.lost_from:
+                    continue
+                scored.append((self.score(report, item), item_id))
+        scored.sort(reverse=True)
+        return scored[:limit]
+
+    def reports_for(self, item: IndexedItem) -> list[tuple[float, int]]:
+        """(score, report id) of open reports an item may belong to, best first."""
+        scored = []
+        bucket = self._report_buckets.get((item.category, day(item.created_at)), ())
+        for report_id in bucket:
+            report = self._reports[report_id]
+            if report.lost_from <= item.created_at <= report.lost_until + MATCH_GRACE:
+                scored.append((self.score(report, item), report_id))
+        scored.sort(reverse=True)
+        return scored
+
+    # queries
+
+    async def match_report(
+        self, db: AsyncSession, report: IndexedReport, limit: int = 20
+    ) -> list[dict]:
+        """Open items ranked by how well they match a report."""
+        await self._ready.wait()
+        await self.refresh(db)
+        # over-fetch so items that were collected meanwhile can be dropped
+        ranked = self.candidates(report, limit * 2)
+        if not ranked:
+            return []
+        rows = await db.execute(
+            select(*SEARCH_RESULT_COLUMNS).where(
+                LostItem.id.in_([item_id for _, item_id in ranked]),
+                LostItem.status.in_(OPEN_ITEM_STATUSES),
+            )
+        )
+        by_id = {row.id: row for row in rows}
+        results = []
+        for score, item_id in ranked:
+            row = by_id.get(item_id)
+            if row is None:
+                self.remove_item(item_id)
+            elif len(results) < limit:
+                results.append(search_result(row, score))
+        return results
+
+    async def match_drop_off(self, db: AsyncSession, item: IndexedItem) -> list[dict]:
+        """Record and return the open reports a newly dropped-off item matches."""
+        await self._ready.wait()
+        self.add_item(item)
+        await self.refresh(db)
+        ranked = [
+            (score, report_id)
+            for score, report_id in self.reports_for(item)
+            if score >= DROP_OFF_MATCH_THRESHOLD
+        ]
+        if not ranked:
+            return []
+        open_reports = set(
+            (
+                await db.execute(
+                    select(LostReport.id).where(
+                        LostReport.id.in_([report_id for _, report_id in ranked]),
+                        LostReport.is_open,
+                    )
+                )
+            ).scalars()
+        )
+        matches = []
+        for score, report_id in ranked:
+            if report_id not in open_reports:
+                self.remove_report(report_id)
+                continue
+            matches.append(
+                {"report_id": report_id, "item_id": item.id, "score": round(score, 6)}
+            )
+        if matches:
+            await db.execute(
+                pg_insert(ReportMatch).values(matches).on_conflict_do_nothing()
+            )
+            await db.commit()
+        return matches
+
+
+match_index = MatchIndex()
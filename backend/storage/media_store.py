@@ -0,0 +1,144 @@
+"""Content-addressed storage for uploaded images.
+
+Files are named by the sha256 of their bytes:
+
+    <media_root>/originals/<d[:2]>/<d>.<ext>
+    <media_root>/thumbnails/<d[:2]>/<d>.jpg
+
+An upload is streamed chunk by chunk into a temporary file while it is
+hashed, then renamed into place. If a file with that digest already
+exists, the upload is discarded and the existing file is reused, so the
+same photo uploaded twice is stored once.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from backend.api.config.storage_config import StorageSettings, storage_settings
+
+# leading bytes identifying each accepted image format
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png", "image/png"),
+    (b"GIF87a", "gif", "image/gif"),
+    (b"GIF89a", "gif", "image/gif"),
+    (b"RIFF", "webp", "image/webp"),  # checked further in sniff_image
+)
+SNIFF_BYTES = 12
+MEDIA_TYPES = {ext: media_type for _, ext, media_type in IMAGE_SIGNATURES}
+FILE_NAME_PATTERN = re.compile(r"^([0-9a-f]{64})\.(jpg|png|gif|webp)$")
+
+
+class MediaError(Exception):
+    """An upload that cannot be stored; the message is safe to show users."""
+
+
+def sniff_image(head: bytes) -> Optional[str]:
+    """The extension of the image format `head` starts with, if accepted."""
+    for signature, ext, _ in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            if ext == "webp" and head[8:12] != b"WEBP":
+                return None
+            return ext
+    return None
+
+
+def _require_image(head: bytes) -> str:
+    ext = sniff_image(head)
+    if ext is None:
+        raise MediaError("Upload must be a JPEG, PNG, GIF or WebP image.")
+    return ext
+
+
+def parse_file_name(name: str) -> tuple[str, str]:
+    """Split "<digest>.<ext>" into its parts; raises MediaError if malformed."""
+    match = FILE_NAME_PATTERN.match(name)
+    if match is None:
+        raise MediaError("Unknown image.")
+    return match.group(1), match.group(2)
+
+
+@dataclass(frozen=True)
+class StoredImage:
+    """An image in the store."""
+
+    digest: str
+    ext: str
+    size: int
+    deduplicated: bool
+
+    @property
+    def file_name(self) -> str:
+        return f"{self.digest}.{self.ext}"
+
+
+class MediaStore:
+    """Streams uploads into, and locates files in, the media directory."""
+
+    def __init__(self, settings: Optional[StorageSettings] = None):
+        if settings is None:
+            settings = storage_settings
+        self.root = Path(settings.media_root)
+        self.max_upload_bytes = settings.max_upload_bytes
+
+    def original_path(self, digest: str, ext: str) -> Path:
+        return self.root / "originals" / digest[:2] / f"{digest}.{ext}"
+
+    def thumbnail_path(self, digest: str) -> Path:
+        return self.root / "thumbnails" / digest[:2] / f"{digest}.jpg"
+
+    async def save_stream(self, chunks: AsyncIterator[bytes]) -> StoredImage:
+        """Store a streamed upload, hashing it as it is written to disk."""
+        temp_dir = self.root / "tmp"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=temp_dir)
+        digest = hashlib.sha256()
+        size = 0
+        head = b""
+        ext = None
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                async for chunk in chunks:
+                    if ext is None and len(head) < SNIFF_BYTES:
+                        head += chunk[: SNIFF_BYTES - len(head)]
+                        if len(head) == SNIFF_BYTES:
+                            ext = _require_image(head)
+                    size += len(chunk)
+                    if size > self.max_upload_bytes:
+                        raise MediaError(
+                            f"Upload exceeds {self.max_upload_bytes} bytes."
+                        )
+                    digest.update(chunk)
+                    await asyncio.to_thread(temp_file.write, chunk)
+            if ext is None:
+                ext = _require_image(head)
+
+            hex_digest = digest.hexdigest()
+            final = self.original_path(hex_digest, ext)
+            if final.exists():
+                os.unlink(temp_name)
+                return StoredImage(hex_digest, ext, size, deduplicated=True)
+            final.parent.mkdir(parents=True, exist_ok=True)
+            os.chmod(temp_name, 0o644)  # mkstemp creates owner-only files
+            os.replace(temp_name, final)
+            return StoredImage(hex_digest, ext, size, deduplicated=False)
+        except BaseException:
+            if os.path.exists(temp_name):
+                os.unlink(temp_name)
+            raise
+
+    def discard(self, stored: StoredImage):
+        """Delete a just-stored upload that ended up unused.
+
+        Deduplicated uploads are left alone: the file was there before them.
+        """
+        if not stored.deduplicated:
+            self.original_path(stored.digest, stored.ext).unlink(missing_ok=True)
+
+
+media_store = MediaStore()
@@ -0,0 +1,117 @@
+"""Background hashing of bulk-imported users' default passwords.
+
+Hashing on the import path would cap imports at bcrypt's speed (a few
+thousand users per minute per core even at the reduced import cost), so
+imported users are stored with PENDING_PASSWORD_HASH and
+`PendingPasswordHasher` hashes their default passwords afterwards, at
+bcrypt_import_rounds on the password hashing pool, in batches of
+PENDING_PASSWORD_BATCH_SIZE (default 200) users. Every worker runs it;
+batches are claimed with `FOR UPDATE SKIP LOCKED`, so workers share the
+backlog. A user who logs in before their turn is checked against the
+default password directly and gets a full-cost hash then (see the login
+route). Schema syncs also mark passwords stored in plaintext before hashing
+existed as pending (`database.ensure_hashed_passwords`), so they are hashed
+the same way.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import suppress
+from typing import Optional
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from backend.api.utils.auth_utils import (
+    PENDING_PASSWORD_HASH,
+    generate_default_password,
+)
+from backend.api.utils.password_hasher import password_hasher
+from backend.models.user import User
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("PENDING_PASSWORD_BATCH_SIZE", "200"))
+# how often to look for users imported by other workers
+INTERVAL_SECONDS = float(os.getenv("PENDING_PASSWORD_INTERVAL_SECONDS", "30"))
+
+
+class PendingPasswordHasher:
+    """Background job hashing pending default passwords."""
+
+    def __init__(self):
+        self._sessions: Optional[async_sessionmaker] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, sessions: async_sessionmaker):
+        """Hash what is pending now and whenever woken (idempotent)."""
+        self._sessions = sessions
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop hashing; a batch in progress is rolled back and redone later."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def wake(self):
+        """Start on newly imported users without waiting for the interval."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def hash_pending(self, sessions: async_sessionmaker) -> int:
+        """Hash every pending password; returns how many this process did."""
+        done = 0
+        while True:
+            async with sessions() as session:
+                users = (
+                    await session.execute(
+                        select(User.id, User.email, User.first_name)
+                        .where(User.hashed_password == PENDING_PASSWORD_HASH)
+                        .limit(BATCH_SIZE)
+                        .with_for_update(skip_locked=True)
+                    )
+                ).all()
+                if not users:
+                    return done
+                hashed = await password_hasher.hash_many(
+                    [
+                        generate_default_password(user.email, user.first_name)
+                        for user in users
+                    ],
+                    rounds=password_hasher.import_rounds,
+                )
+                await session.execute(
+                    update(User.__table__)
+                    .where(
+                        User.id == bindparam("user_id"),
+                        # a login may have stored a full-cost hash meanwhile
+                        User.hashed_password == PENDING_PASSWORD_HASH,
+                    )
+                    .values(hashed_password=bindparam("hashed")),
+                    [
+                        {"user_id": user.id, "hashed": hashed_password}
+                        for user, hashed_password in zip(users, hashed)
+                    ],
+                )
+                await session.commit()
+            done += len(users)
+
+    async def _run(self):
+        while True:
+            try:
+                done = await self.hash_pending(self._sessions)
+                if done:
+                    logger.info(f"Hashed {done} imported users' default passwords.")
+            except Exception as e:
+                logger.error(f"Hashing pending passwords failed: {e}")
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=INTERVAL_SECONDS)
+            self._wake.clear()
+
+
+pending_password_hasher = PendingPasswordHasher()
@@ -0,0 +1,132 @@
+"""Connection pool instrumentation.
+
+The engines are built with pool classes that time how long each checkout
+waits for a connection, and `PoolCollector` reports the current pool
+state (size, checked out, idle, overflow) on every scrape, so reading the
+gauges costs nothing between scrapes.
+
+With PROMETHEUS_MULTIPROC_DIR set, a scrape only reaches one worker, so
+each worker instead writes its pool state to multiprocess gauges
+(labelled by pid) whenever a connection is checked out or in.
+"""
+
+import os
+import time
+from prometheus_client import Gauge, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent obtaining a connection from the pool, including connecting.",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+# the most recently created pool per label ("sync", "async")
+_pools: dict[str, Pool] = {}
+
+
+def track_pool(label: str, pool: Pool):
+    """Report `pool`'s state and checkout waits under `label` from now on."""
+    _pools[label] = pool
+    pool.metrics_label = label
+    if MULTIPROCESS and isinstance(pool, QueuePool):
+
+        def publish(returning: bool = False):
+            checked_out, idle = pool.checkedout(), pool.checkedin()
+            overflow = max(0, pool.overflow())
+            if returning:
+                # "checkin" fires before the connection is back in the pool,
+                # which closes it instead if the pool is full
+                checked_out -= 1
+                if idle < pool.size():
+                    idle += 1
+                else:
+                    overflow = max(0, overflow - 1)
+            POOL_GAUGES["size"].labels(label).set(pool.size())
+            POOL_GAUGES["checked_out"].labels(label).set(checked_out)
+            POOL_GAUGES["checked_in"].labels(label).set(idle)
+            POOL_GAUGES["overflow"].labels(label).set(overflow)
+
+        event.listen(pool, "checkout", lambda *args: publish())
+        event.listen(pool, "checkin", lambda *args: publish(returning=True))
+        publish()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time."""
+
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT_SECONDS.labels(self.metrics_label).observe(
+                time.perf_counter() - started
+            )
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time."""
+
+    metrics_label = "async"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT_SECONDS.labels(self.metrics_label).observe(
+                time.perf_counter() - started
+            )
+
+
+# (key, metric name, help) of the pool state gauges
+_POOL_STATE = [
+    ("size", "db_pool_size", "Configured number of pooled connections."),
+    (
+        "checked_out",
+        "db_pool_checked_out",
+        "Connections currently checked out of the pool.",
+    ),
+    (
+        "checked_in",
+        "db_pool_checked_in",
+        "Idle connections currently held by the pool.",
+    ),
+    ("overflow", "db_pool_overflow", "Connections open beyond the pool size."),
+]
+
+
+class PoolCollector:
+    """Prometheus collector for the state of the tracked pools."""
+
+    def collect(self):
+        size, checked_out, idle, overflow = (
+            GaugeMetricFamily(name, documentation, labels=["pool"])
+            for _, name, documentation in _POOL_STATE
+        )
+        for label, pool in _pools.items():
+            if not isinstance(pool, QueuePool):
+                continue
+            size.add_metric([label], pool.size())
+            checked_out.add_metric([label], pool.checkedout())
+            idle.add_metric([label], pool.checkedin())
+            # overflow() counts down from -pool_size until the pool is full
+            overflow.add_metric([label], max(0, pool.overflow()))
+        yield from (size, checked_out, idle, overflow)
+
+
+if MULTIPROCESS:
+    POOL_GAUGES = {
+        key: Gauge(name, documentation, ["pool"], multiprocess_mode="liveall")
+        for key, name, documentation in _POOL_STATE
+    }
+else:
+    REGISTRY.register(PoolCollector())
@@ -0,0 +1,148 @@
+"""SQL query profiling through SQLAlchemy cursor events.
+
+`install(engine)` hooks an engine so that every statement is timed. Slow
+statements (DB_SLOW_QUERY_MS, default 200) are always logged. Inside a
+`query_profile()` block, which the profiler middleware opens per request
+when DB_PROFILE is true, statements are also collected into a
+`QueryProfile`: count, total time and per-fingerprint stats. A profile
+in which one fingerprint ran DB_N_PLUS_ONE_THRESHOLD times or more (default
+10) is flagged as a likely N+1 pattern.
+
+Fingerprints replace literals and bind parameters with `?` and collapse
+IN and VALUES lists, so `WHERE id = 1` and `WHERE id = 2` group together.
+"""
+
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator, Optional
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_SECONDS = float(os.getenv("DB_SLOW_QUERY_MS", "200")) / 1000
+N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "10"))
+
+_NORMALIZERS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),  # string literals
+    (re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+"), "?"),  # bind parameters
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),  # numeric literals
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),  # (?, ?, ?)
+    (re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+"), r"\1"),  # VALUES rows
+    (re.compile(r"\s+"), " "),
+)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """The statement with literals and parameters normalized away."""
+    for pattern, replacement in _NORMALIZERS:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+@dataclass
+class FingerprintStats:
+    """How often one statement shape ran, and for how long."""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class QueryProfile:
+    """The statements run inside one `query_profile()` block."""
+
+    label: str
+    count: int = 0
+    seconds: float = 0.0
+    fingerprints: dict[str, FingerprintStats] = field(default_factory=dict)
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        key = fingerprint(statement)
+        stats = self.fingerprints.get(key)
+        if stats is None:
+            stats = self.fingerprints[key] = FingerprintStats()
+        stats.count += 1
+        stats.seconds += seconds
+
+    def n_plus_one(self) -> dict[str, int]:
+        """Fingerprints repeated at least N_PLUS_ONE_THRESHOLD times."""
+        return {
+            key: stats.count
+            for key, stats in self.fingerprints.items()
+            if stats.count >= N_PLUS_ONE_THRESHOLD
+        }
+
+    def to_dict(self) -> dict:
+        """Return a dictionary representation of the profile."""
+        return {
+            "label": self.label,
+            "query_count": self.count,
+            "db_time_ms": round(self.seconds * 1000, 3),
+            "queries": [
+                {
+                    "fingerprint": key,
+                    "count": stats.count,
+                    "time_ms": round(stats.seconds * 1000, 3),
+                }
+                for key, stats in sorted(
+                    self.fingerprints.items(), key=lambda kv: -kv[1].seconds
+                )
+            ],
+            "n_plus_one": self.n_plus_one(),
+        }
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar(
+    "query_profile", default=None
+)
+
+
+@contextmanager
+def query_profile(label: str) -> Iterator[QueryProfile]:
+    """Collect the statements run in this block (and its tasks) into a profile."""
+    profile = QueryProfile(label)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+        suspects = profile.n_plus_one()
+        for key, count in suspects.items():
+            logger.warning(f"Possible N+1 in {label}: {count}x {key}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+    if elapsed >= SLOW_QUERY_SECONDS:
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms): {fingerprint(statement)[:500]}"
+        )
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def install(engine: Engine):
+    """Time every statement the engine runs (pass `sync_engine` for async)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,122 @@
+"""In-process cache of the reference (dimension) tables.
+
+Item categories, rooms, drop-off locations and roles only change when the
+seed lists or CSV files change, so they are loaded once, serialized once,
+and served as pre-built JSON bytes with a content-derived ETag.
+"""
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.utils.serialization import dumps, row_dicts
+from backend.models.item_category import ItemCategory
+from backend.models.room import Room
+from backend.models.drop_off_locations import DropOffLocation
+from backend.models.role import Role
+
+logger = logging.getLogger(__name__)
+
+# payload name -> model; the name is also the top-level key of the JSON body
+REFERENCE_MODELS = {
+    "categories": ItemCategory,
+    "rooms": Room,
+    "drop_off_locations": DropOffLocation,
+    "roles": Role,
+}
+
+
+def _reference_statement(model):
+    """All columns of a reference table as plain rows, ordered by id."""
+    return select(*model.__table__.columns).order_by(model.id)
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """A pre-serialized reference list."""
+
+    body: bytes
+    etag: str
+    count: int
+
+
+class ReferenceDataCache:
+    """Versioned in-memory cache of the reference tables."""
+
+    def __init__(self):
+        self._payloads: dict[str, CachedPayload] = {}
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> int:
+        """Incremented on every load and invalidation."""
+        return self._version
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._payloads)
+
+    def _build(self, rows_by_name: dict[str, list[dict]]):
+        payloads = {}
+        for name, rows in rows_by_name.items():
+            body = dumps({name: rows})
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            payloads[name] = CachedPayload(body=body, etag=etag, count=len(rows))
+        # swap the whole mapping at once so readers never see a partial load
+        self._payloads = payloads
+        self._version += 1
+        logger.info(f"Reference data cache loaded (version {self._version}).")
+
+    def load(self, session: Session):
+        """Load all reference tables using a sync session."""
+        rows_by_name = {}
+        for name, model in REFERENCE_MODELS.items():
+            rows = session.execute(_reference_statement(model)).all()
+            rows_by_name[name] = row_dicts(rows)
+        self._build(rows_by_name)
+
+    async def load_async(self, session: AsyncSession):
+        """Load all reference tables using an async session."""
+        rows_by_name = {}
+        for name, model in REFERENCE_MODELS.items():
+            rows = (await session.execute(_reference_statement(model))).all()
+            rows_by_name[name] = row_dicts(rows)
+        self._build(rows_by_name)
+
+    def warm(self):
+        """Load the cache at startup with the sync session factory."""
+        from backend.storage import database
+
+        if not database.sessionLocal:
+            raise Exception("Database not initialized. Call db_init() first.")
+        with database.sessionLocal() as session:
+            self.load(session)
+
+    def invalidate(self):
+        """Drop all cached payloads; the next read reloads them."""
+        self._payloads = {}
+        self._version += 1
+        logger.info(f"Reference data cache invalidated (version {self._version}).")
+
+    async def get(self, name: str) -> CachedPayload:
+        """Return the cached payload, reloading from the database on a miss."""
+        payload: Optional[CachedPayload] = self._payloads.get(name)
+        if payload is not None:
+            return payload
+
+        async with self._lock:
+            if name not in self._payloads:
+                from backend.storage import database
+
+                # shared by every client, so no read-your-writes window applies
+                async with database.read_sessionLocal()() as session:
+                    await self.load_async(session)
+        return self._payloads[name]
+
+
+reference_cache = ReferenceDataCache()
@@ -0,0 +1,195 @@
+"""Revoked access tokens, checked without a database round trip.
+
+Access tokens are verified statelessly, so revoking one (logging out)
+records its id (the `jti` claim) in `revoked_tokens`, and every process
+keeps a Bloom filter of the ids that are revoked and not yet expired. An
+id missing from the filter is certainly not revoked, which is the answer
+for almost every request. A hit is confirmed against the table: at the
+configured capacity about 1% of valid tokens hit, and the answer is then
+remembered per id.
+
+Revocations made by this process apply immediately; those made by other
+workers are picked up every AUTH_REVOCATION_SYNC_SECONDS. Every
+REBUILD_SECONDS, or once it holds more ids than it was sized for, the
+filter is rebuilt from the table and expired rows are deleted.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from datetime import datetime as dt, timezone as tz
+from typing import Optional
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from backend.api.config.auth_config import AuthConfig, auth_config
+from backend.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+REBUILD_SECONDS = 3600
+# rows committed out of id order are caught by re-reading this many ids
+SYNC_LAG_IDS = 1000
+# filter hits whose database answer is remembered
+CONFIRMED_CACHE_SIZE = 1024
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = capacity
+        self.size = max(
+            64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        # double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, value: str):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+def _utcnow() -> dt:
+    return dt.now(tz.utc).replace(tzinfo=None)
+
+
+class RevocationList:
+    """Per-process view of the revoked tokens, kept in sync with the table."""
+
+    def __init__(self, config: Optional[AuthConfig] = None):
+        if config is None:
+            config = auth_config
+        self.capacity = config.revocation_capacity
+        self.sync_seconds = config.revocation_sync_seconds
+        self._filter = BloomFilter(self.capacity)
+        self._confirmed: OrderedDict[str, bool] = OrderedDict()
+        self._high_water = 0
+        self._built_at = 0.0
+        self._sessions: Optional[async_sessionmaker] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, sessions: async_sessionmaker):
+        """Load the current revocations and keep syncing them (idempotent)."""
+        self._sessions = sessions
+        if self._task is None:
+            await self.rebuild()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop syncing."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def rebuild(self):
+        """Delete expired revocations and rebuild the filter from the rest."""
+        now = _utcnow()
+        async with self._sessions() as session:
+            await session.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at < now)
+            )
+            await session.commit()
+            rows = (
+                await session.execute(
+                    select(RevokedToken.id, RevokedToken.jti).where(
+                        RevokedToken.expires_at >= now
+                    )
+                )
+            ).all()
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)))
+        for row in rows:
+            bloom.add(row.jti)
+        self._filter = bloom
+        self._confirmed.clear()
+        self._high_water = max((row.id for row in rows), default=self._high_water)
+        self._built_at = time.monotonic()
+        logger.info(f"Revocation filter rebuilt ({len(rows)} revoked tokens).")
+
+    async def sync(self):
+        """Add the revocations recorded since the last sync."""
+        async with self._sessions() as session:
+            rows = await session.execute(
+                select(RevokedToken.id, RevokedToken.jti).where(
+                    RevokedToken.id > self._high_water - SYNC_LAG_IDS
+                )
+            )
+            for row in rows:
+                self._add(row.jti)
+                self._high_water = max(self._high_water, row.id)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.sync_seconds)
+            try:
+                if (
+                    time.monotonic() - self._built_at >= REBUILD_SECONDS
+                    or self._filter.count > self._filter.capacity
+                ):
+                    await self.rebuild()
+                else:
+                    await self.sync()
+            except Exception as e:
+                logger.error(f"Syncing revoked tokens failed: {e}")
+
+    def _add(self, jti: str):
+        if jti not in self._filter:
+            self._filter.add(jti)
+        if jti in self._confirmed:
+            self._confirmed[jti] = True
+
+    def _remember(self, jti: str, revoked: bool):
+        self._confirmed[jti] = revoked
+        self._confirmed.move_to_end(jti)
+        if len(self._confirmed) > CONFIRMED_CACHE_SIZE:
+            self._confirmed.popitem(last=False)
+
+    async def revoke(self, db: AsyncSession, jti: str, user_id: str, expires_at: dt):
+        """Revoke a token until it expires."""
+        await db.execute(
+            pg_insert(RevokedToken)
+            .values(
+                jti=jti, user_id=user_id, expires_at=expires_at, revoked_at=_utcnow()
+            )
+            .on_conflict_do_nothing()
+        )
+        await db.commit()
+        self._add(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        """Whether the token with this id has been revoked."""
+        if jti not in self._filter:
+            return False
+        revoked = self._confirmed.get(jti)
+        if revoked is None:
+            async with self._sessions() as session:
+                row = await session.execute(
+                    select(RevokedToken.id).where(RevokedToken.jti == jti)
+                )
+                revoked = row.first() is not None
+            self._remember(jti, revoked)
+        return revoked
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,202 @@
+"""Dashboard aggregates kept current by triggers.
+
+`item_rollups` holds the number of lost items per (drop-off location,
+category, status), and `item_daily_rollups` the same per registration
+day. Statement-level triggers on `lost_items` apply the net change of
+every INSERT, UPDATE and DELETE to both tables in the same transaction,
+like the counters in backend.storage.counters. The dashboard therefore
+reads a few hundred pre-aggregated rows however long the item history
+grows: per-location and per-category totals come from `item_rollups`,
+and daily series cost one row per day, location, category and status in
+the requested range.
+
+Archived items stay counted: triggers on `lost_items_archive` add back
+what moving them out of lost_items subtracted.
+"""
+
+import logging
+from datetime import date
+from typing import Iterable, Optional
+from sqlalchemy import Engine, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.utils.constants import ItemStatus
+from backend.models.item_rollup import ItemDailyRollup, ItemRollup
+
+logger = logging.getLogger(__name__)
+
+# rollup column for each dashboard dimension
+DIMENSIONS = {
+    "location": ItemRollup.dropped_off_at,
+    "category": ItemRollup.category,
+}
+
+
+def _apply_changes(changes: str) -> str:
+    """Trigger body adding the net per-group deltas of `changes` to the rollups."""
+    return f"""
+    WITH grouped AS (
+        SELECT created_at::date AS day, dropped_off_at, category, status,
+               sum(delta) AS delta
+        FROM ({changes}) AS changes
+        GROUP BY 1, 2, 3, 4
+        HAVING sum(delta) <> 0
+    ), daily AS (
+        INSERT INTO item_daily_rollups AS r
+            (day, dropped_off_at, category, status, count)
+        SELECT day, dropped_off_at, category, status, delta
+        FROM grouped ORDER BY 1, 2, 3, 4
+        ON CONFLICT (day, dropped_off_at, category, status)
+        DO UPDATE SET count = r.count + EXCLUDED.count
+    )
+    INSERT INTO item_rollups AS r (dropped_off_at, category, status, count)
+    SELECT dropped_off_at, category, status, sum(delta)
+    FROM grouped
+    GROUP BY 1, 2, 3
+    HAVING sum(delta) <> 0
+    ORDER BY 1, 2, 3
+    ON CONFLICT (dropped_off_at, category, status)
+    DO UPDATE SET count = r.count + EXCLUDED.count;
+    """
+
+
+_NEW_ROWS = (
+    "SELECT created_at, dropped_off_at, category, status, 1 AS delta FROM new_rows"
+)
+_OLD_ROWS = (
+    "SELECT created_at, dropped_off_at, category, status, -1 AS delta FROM old_rows"
+)
+
+# (trigger and function name, table, event, transition tables, changed rows)
+_TRIGGERS = [
+    ("rollups_items_ins", "lost_items", "INSERT", "NEW TABLE AS new_rows", _NEW_ROWS),
+    ("rollups_items_del", "lost_items", "DELETE", "OLD TABLE AS old_rows", _OLD_ROWS),
+    (
+        "rollups_items_upd",
+        "lost_items",
+        "UPDATE",
+        "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        f"{_NEW_ROWS} UNION ALL {_OLD_ROWS}",
+    ),
+    (
+        "rollups_archive_ins",
+        "lost_items_archive",
+        "INSERT",
+        "NEW TABLE AS new_rows",
+        _NEW_ROWS,
+    ),
+    (
+        "rollups_archive_del",
+        "lost_items_archive",
+        "DELETE",
+        "OLD TABLE AS old_rows",
+        _OLD_ROWS,
+    ),
+]
+
+
+def rebuild_rollups(connection):
+    """Recompute both rollup tables from a full scan of the items and archive."""
+    connection.execute(text("LOCK TABLE lost_items, lost_items_archive IN SHARE MODE"))
+    connection.execute(text("DELETE FROM item_daily_rollups"))
+    connection.execute(text("DELETE FROM item_rollups"))
+    connection.execute(
+        text(
+            "INSERT INTO item_daily_rollups "
+            "(day, dropped_off_at, category, status, count) "
+            "SELECT created_at::date, dropped_off_at, category, status, count(*) "
+            "FROM (SELECT created_at, dropped_off_at, category, status "
+            "FROM lost_items UNION ALL "
+            "SELECT created_at, dropped_off_at, category, status "
+            "FROM lost_items_archive) AS items "
+            "GROUP BY 1, 2, 3, 4"
+        )
+    )
+    connection.execute(
+        text(
+            "INSERT INTO item_rollups (dropped_off_at, category, status, count) "
+            "SELECT dropped_off_at, category, status, sum(count) "
+            "FROM item_daily_rollups GROUP BY 1, 2, 3"
+        )
+    )
+
+
+def ensure_rollups(engine: Engine):
+    """Install the rollup triggers if missing, backfilling the rollups once."""
+    names = [name for name, *_ in _TRIGGERS]
+    with engine.begin() as connection:
+        installed = set(
+            connection.execute(
+                text("SELECT tgname FROM pg_trigger WHERE tgname = ANY(:names)"),
+                {"names": names},
+            ).scalars()
+        )
+        if installed == set(names):
+            return
+
+        for name, table, event, transition, changes in _TRIGGERS:
+            connection.execute(
+                text(
+                    f"CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$ "
+                    f"BEGIN {_apply_changes(changes)} RETURN NULL; "
+                    "END $$ LANGUAGE plpgsql"
+                )
+            )
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {name} ON {table}"))
+            connection.execute(
+                text(
+                    f"CREATE TRIGGER {name} AFTER {event} ON {table} "
+                    f"REFERENCING {transition} "
+                    f"FOR EACH STATEMENT EXECUTE FUNCTION {name}()"
+                )
+            )
+        rebuild_rollups(connection)
+        logger.info("Rollup triggers installed and rollups backfilled.")
+
+
+async def item_totals(
+    db: AsyncSession, dimensions: list[str], statuses: Iterable[ItemStatus]
+) -> list[dict]:
+    """Item counts grouped by the given dimensions ("location", "category")."""
+    columns = [DIMENSIONS[name].label(name) for name in dimensions]
+    total = func.sum(ItemRollup.count).label("count")
+    result = await db.execute(
+        select(*columns, total)
+        .where(ItemRollup.status.in_(list(statuses)))
+        .group_by(*columns)
+        .having(total > 0)
+        .order_by(*columns)
+    )
+    return [{**row._asdict(), "count": int(row.count)} for row in result]
+
+
+async def daily_totals(
+    db: AsyncSession,
+    start: date,
+    end: date,
+    statuses: Iterable[ItemStatus],
+    location: Optional[int] = None,
+    category: Optional[int] = None,
+) -> list[dict]:
+    """Items registered per day in [start, end], by their current status."""
+    statement = select(
+        ItemDailyRollup.day,
+        ItemDailyRollup.status,
+        func.sum(ItemDailyRollup.count).label("count"),
+    ).where(
+        ItemDailyRollup.day.between(start, end),
+        ItemDailyRollup.status.in_(list(statuses)),
+    )
+    if location is not None:
+        statement = statement.where(ItemDailyRollup.dropped_off_at == location)
+    if category is not None:
+        statement = statement.where(ItemDailyRollup.category == category)
+    result = await db.execute(
+        statement.group_by(ItemDailyRollup.day, ItemDailyRollup.status)
+        .having(func.sum(ItemDailyRollup.count) > 0)
+        .order_by(ItemDailyRollup.day)
+    )
+    days: dict[date, dict] = {}
+    for row in result:
+        counts = days.setdefault(row.day, {"day": row.day, "counts": {}})["counts"]
+        counts[row.status.value] = int(row.count)
+    return list(days.values())
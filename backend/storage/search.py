@@ -0,0 +1,295 @@
+"""Ranked search over lost items.
+
+Two engines share one interface:
+
+- `PostgresSearchEngine` ranks with a GIN-indexed `tsvector` and, when the
+  `pg_trgm` extension is available, trigram similarity on the item name.
+- `InMemorySearchEngine` is a self-contained inverted index with trigram
+  fuzzy term matching, for tests and local runs without a tuned Postgres.
+
+The engine is chosen with the SEARCH_BACKEND environment variable
+("postgres" or "memory").
+"""
+
+import heapq
+import logging
+import math
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import Engine, Select, and_, func, literal_column, or_, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.utils.constants import ItemStatus
+from backend.models.lost_item import LostItem, SEARCH_DOCUMENT_SQL
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+TRIGRAM_INDEX_NAME = "ix_lost_items_name_trgm"
+# minimum trigram similarity for a fuzzy term or name match
+SIMILARITY_THRESHOLD = 0.3
+
+SEARCH_RESULT_COLUMNS = (
+    LostItem.id,
+    LostItem.name,
+    LostItem.description,
+    LostItem.image_url,
+    LostItem.status,
+    LostItem.found_in,
+    LostItem.dropped_off_at,
+    LostItem.category,
+    LostItem.created_at,
+)
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """A search request: free text plus optional exact-match filters."""
+
+    text: str
+    category: Optional[int] = None
+    found_in: Optional[int] = None
+    dropped_off_at: Optional[int] = None
+    status: Optional[ItemStatus] = None
+    limit: int = 20
+
+
+def tokenize(value: str) -> list[str]:
+    """Lower-cased word tokens of a string."""
+    return TOKEN_PATTERN.findall(value.lower())
+
+
+def trigrams(token: str) -> set[str]:
+    """Padded character trigrams, as pg_trgm computes them."""
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def search_result(row, score: float) -> dict:
+    """Build the result dict for one row (encoded by ORJSONResponse)."""
+    return {
+        "id": row.id,
+        "name": row.name,
+        "description": row.description,
+        "image_url": row.image_url,
+        "status": row.status,
+        "found_in": row.found_in,
+        "dropped_off_at": row.dropped_off_at,
+        "category": row.category,
+        "created_at": row.created_at,
+        "score": round(float(score), 6),
+    }
+
+
+class PostgresSearchEngine:
+    """Search backed by Postgres full-text search and pg_trgm."""
+
+    def __init__(self):
+        self.trigrams_available = False
+
+    def setup(self, engine: Engine, session: Session):
+        """Create the trigram index if pg_trgm is available."""
+        try:
+            with engine.begin() as connection:
+                connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                connection.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX_NAME} "
+                        "ON lost_items USING gin (name gin_trgm_ops)"
+                    )
+                )
+            self.trigrams_available = True
+        except SQLAlchemyError as e:
+            logger.warning(
+                "pg_trgm unavailable, search falls back to full-text only: "
+                f"{getattr(e, 'orig', e)}"
+            )
+            self.trigrams_available = False
+
+    def add_item(self, row):
+        """No-op: Postgres indexes rows as they are written."""
+
+    def remove_item(self, item_id: int):
+        """No-op: Postgres indexes rows as they are written."""
+
+    def statement(self, query: SearchQuery) -> Optional[Select]:
+        """The ranked search select, or None if the query has no terms."""
+        tokens = tokenize(query.text)
+        if not tokens:
+            return None
+
+        document = literal_column(SEARCH_DOCUMENT_SQL)
+        # OR the terms together so partial matches still rank; prefix-match
+        # each term to tolerate plurals and truncated words
+        ts_query = func.to_tsquery(
+            literal_column("'english'"), " | ".join(f"{t}:*" for t in tokens)
+        )
+        score = func.ts_rank_cd(document, ts_query)
+        matches = document.op("@@")(ts_query)
+        if self.trigrams_available:
+            phrase = " ".join(tokens)
+            score = score + func.similarity(LostItem.name, phrase)
+            matches = or_(matches, LostItem.name.op("%")(phrase))
+
+        return (
+            select(*SEARCH_RESULT_COLUMNS, score.label("score"))
+            .where(and_(matches, *_filters(query)))
+            .order_by(score.desc(), LostItem.id.desc())
+            .limit(query.limit)
+        )
+
+    async def search(self, db: AsyncSession, query: SearchQuery) -> list[dict]:
+        """Return items ranked by text relevance, best first."""
+        statement = self.statement(query)
+        if statement is None:
+            return []
+        result = await db.execute(statement)
+        return [search_result(row, row.score) for row in result]
+
+
+def _filters(query: SearchQuery) -> list:
+    filters = []
+    if query.category is not None:
+        filters.append(LostItem.category == query.category)
+    if query.found_in is not None:
+        filters.append(LostItem.found_in == query.found_in)
+    if query.dropped_off_at is not None:
+        filters.append(LostItem.dropped_off_at == query.dropped_off_at)
+    if query.status is not None:
+        filters.append(LostItem.status == query.status)
+    return filters
+
+
+@dataclass
+class _IndexedItem:
+    row: object
+    term_counts: dict[str, int]
+    length: int
+
+
+class InMemorySearchEngine:
+    """In-process inverted index with trigram fuzzy matching and BM25 ranking."""
+
+    def __init__(self):
+        self._items: dict[int, _IndexedItem] = {}
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._term_trigrams: dict[str, set[str]] = defaultdict(set)
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def setup(self, engine: Engine, session: Session):
+        """Index every lost item currently in the database."""
+        statement = select(*SEARCH_RESULT_COLUMNS).execution_options(yield_per=5000)
+        for row in session.execute(statement):
+            self.add_item(row)
+        logger.info(f"In-memory search index built ({len(self)} items).")
+
+    def add_item(self, row):
+        """Index (or re-index) one item row carrying SEARCH_RESULT_COLUMNS."""
+        self.remove_item(row.id)
+        terms = tokenize(f"{row.name} {row.description or ''}")
+        term_counts: dict[str, int] = defaultdict(int)
+        for term in terms:
+            term_counts[term] += 1
+        for term in term_counts:
+            if term not in self._postings:
+                for gram in trigrams(term):
+                    self._term_trigrams[gram].add(term)
+            self._postings[term].add(row.id)
+        self._items[row.id] = _IndexedItem(row, dict(term_counts), len(terms))
+        self._total_length += len(terms)
+
+    def remove_item(self, item_id: int):
+        """Drop an item from the index, if present."""
+        indexed = self._items.pop(item_id, None)
+        if indexed is None:
+            return
+        self._total_length -= indexed.length
+        for term in indexed.term_counts:
+            postings = self._postings[term]
+            postings.discard(item_id)
+            if not postings:
+                del self._postings[term]
+                for gram in trigrams(term):
+                    self._term_trigrams[gram].discard(term)
+
+    def _expand(self, token: str) -> dict[str, float]:
+        """Vocabulary terms similar to `token`, with their similarity."""
+        grams = trigrams(token)
+        shared: dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for term in self._term_trigrams.get(gram, ()):
+                shared[term] += 1
+        expanded = {}
+        for term, common in shared.items():
+            similarity = common / (len(grams) + len(trigrams(term)) - common)
+            if term.startswith(token):
+                similarity = max(similarity, 0.9)
+            if similarity >= SIMILARITY_THRESHOLD:
+                expanded[term] = similarity
+        return expanded
+
+    def _matches_filters(self, row, query: SearchQuery) -> bool:
+        return (
+            (query.category is None or row.category == query.category)
+            and (query.found_in is None or row.found_in == query.found_in)
+            and (
+                query.dropped_off_at is None
+                or row.dropped_off_at == query.dropped_off_at
+            )
+            and (query.status is None or row.status == query.status)
+        )
+
+    def search_sync(self, query: SearchQuery) -> list[dict]:
+        """Return items ranked by BM25 over fuzzily expanded terms."""
+        if not self._items:
+            return []
+        average_length = self._total_length / len(self._items) or 1.0
+        scores: dict[int, float] = defaultdict(float)
+        for token in dict.fromkeys(tokenize(query.text)):
+            for term, similarity in self._expand(token).items():
+                postings = self._postings[term]
+                idf = math.log(
+                    1 + (len(self._items) - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for item_id in postings:
+                    indexed = self._items[item_id]
+                    frequency = indexed.term_counts[term]
+                    norm = frequency + 1.2 * (
+                        0.25 + 0.75 * indexed.length / average_length
+                    )
+                    scores[item_id] += similarity * idf * frequency * 2.2 / norm
+
+        ranked = heapq.nlargest(
+            query.limit,
+            (
+                (score, item_id)
+                for item_id, score in scores.items()
+                if self._matches_filters(self._items[item_id].row, query)
+            ),
+        )
+        return [
+            search_result(self._items[item_id].row, score) for score, item_id in ranked
+        ]
+
+    async def search(self, db: AsyncSession, query: SearchQuery) -> list[dict]:
+        return self.search_sync(query)
+
+
+def make_search_engine():
+    """Build the engine selected by SEARCH_BACKEND."""
+    backend = os.getenv("SEARCH_BACKEND", "postgres").lower()
+    if backend == "memory":
+        return InMemorySearchEngine()
+    if backend != "postgres":
+        raise ValueError(f"Unknown SEARCH_BACKEND: {backend}")
+    return PostgresSearchEngine()
+
+
+search_engine = make_search_engine()
@@ -0,0 +1,110 @@
+"""Background thumbnail generation.
+
+Decoding and resizing photos is CPU-bound, so it runs on a process pool
+outside the request: the upload returns as soon as the original is
+stored, and the thumbnail appears once a worker has written it. Other
+per-image work, such as the perceptual hashes duplicate detection
+compares, runs on the same pool through `ThumbnailWorker.run`.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+from backend.api.config.storage_config import StorageSettings, storage_settings
+
+logger = logging.getLogger(__name__)
+
+# originals never change, so one that failed is not retried; the most
+# recent failures are remembered
+MAX_REMEMBERED_FAILURES = 10_000
+
+
+def make_thumbnail(source: str, destination: str, size: int) -> str:
+    """Write a JPEG of `source` whose longest edge is at most `size` pixels."""
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        # let the JPEG decoder downscale while decoding; much cheaper than
+        # decoding the full image and resizing it
+        image.draft("RGB", (size, size))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        Path(destination).parent.mkdir(parents=True, exist_ok=True)
+        temporary = f"{destination}.{os.getpid()}.tmp"
+        image.save(temporary, "JPEG", quality=80, optimize=True)
+        os.replace(temporary, destination)
+    return destination
+
+
+class ThumbnailWorker:
+    """Generates thumbnails on a process pool, at most once per image.
+
+    An image whose thumbnail failed (e.g. one that does not decode) is not
+    resubmitted, however often its thumbnail is requested.
+    """
+
+    def __init__(self, settings: Optional[StorageSettings] = None):
+        if settings is None:
+            settings = storage_settings
+        self.size = settings.thumbnail_size
+        self.workers = settings.thumbnail_pool_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: dict[str, Future] = {}
+        self._failed: OrderedDict[str, Future] = OrderedDict()
+
+    def start(self):
+        """Start the worker processes (idempotent)."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Thumbnail pool started ({self.workers} workers).")
+
+    def shutdown(self):
+        """Stop the worker processes, dropping queued thumbnails."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._pending.clear()
+            logger.info("Thumbnail pool stopped.")
+
+    def submit(self, source: Path, destination: Path) -> Future:
+        """Queue a thumbnail unless it is already queued or failed."""
+        key = str(destination)
+        pending = self._pending.get(key) or self._failed.get(key)
+        if pending is not None:
+            return pending
+        self.start()
+        future = self._executor.submit(make_thumbnail, str(source), key, self.size)
+        self._pending[key] = future
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    async def run(self, fn, *args):
+        """Run other image processing on the pool and await its result."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _finished(self, key: str, future: Future):
+        self._pending.pop(key, None)
+        if future.cancelled() or future.exception() is None:
+            return
+        logger.warning(f"Thumbnail {key} failed: {future.exception()}")
+        # a pool that died did not get to try the image
+        if not isinstance(future.exception(), BrokenProcessPool):
+            self._failed[key] = future
+            if len(self._failed) > MAX_REMEMBERED_FAILURES:
+                self._failed.popitem(last=False)
+
+
+thumbnail_worker = ThumbnailWorker()
@@ -0,0 +1,18 @@
+"""Shared fixtures: the tests need a running Postgres (the DB_* settings)
+and are skipped when it cannot be reached."""
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+from backend.storage import database
+
+
+@pytest.fixture(scope="session")
+def primary():
+    """The configured database, initialized like the app does at startup."""
+    try:
+        database.db_init()
+    except (SQLAlchemyError, OSError) as e:
+        pytest.skip(f"database unavailable: {e}")
+    database.pre_populate_tables()
+    yield database
+    database.close_db()
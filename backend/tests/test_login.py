@@ -0,0 +1,112 @@
+"""Logging in with each form a stored password can take."""
+
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from backend.api.utils.auth_utils import (
+    PENDING_PASSWORD_HASH,
+    generate_default_password,
+    is_bcrypt_hash,
+    password_matches,
+)
+from backend.api.utils.password_hasher import password_hasher
+from backend.api.v1.routers.auth import auth_router
+from backend.models.user import User
+from backend.storage.pending_passwords import pending_password_hasher
+
+USER_ID = "TLOGIN"
+EMAIL = "login@test.invalid"
+DEFAULT_PASSWORD = generate_default_password(EMAIL, "Lee")
+
+
+@pytest.fixture
+def client(primary):
+    app = FastAPI()
+    app.include_router(auth_router)
+    with TestClient(app) as client:
+        yield client
+        # pooled connections belong to the client's event loop
+        client.portal.call(primary.async_engine.dispose)
+    password_hasher.shutdown()
+
+
+@pytest.fixture
+def store_user(primary):
+    """Store the test user with a given `hashed_password` value."""
+
+    def store(hashed_password: str):
+        with primary.sessionLocal() as session:
+            session.execute(delete(User).where(User.id == USER_ID))
+            session.add(
+                User(
+                    id=USER_ID,
+                    first_name="Lee",
+                    last_name="Test",
+                    email=EMAIL,
+                    hashed_password=hashed_password,
+                )
+            )
+            session.commit()
+
+    yield store
+    with primary.sessionLocal() as session:
+        session.execute(delete(User).where(User.id == USER_ID))
+        session.commit()
+
+
+def _stored_password(primary) -> str:
+    with primary.sessionLocal() as session:
+        return session.get(User, USER_ID).hashed_password
+
+
+def _login(client, password: str):
+    return client.post("/auth/login", json={"username": USER_ID, "password": password})
+
+
+@pytest.mark.parametrize("stored", [DEFAULT_PASSWORD, PENDING_PASSWORD_HASH])
+def test_unhashed_passwords_are_hashed_on_login(client, store_user, primary, stored):
+    store_user(stored)
+    assert _login(client, "wrong").status_code == 401
+    assert _stored_password(primary) == stored
+
+    assert _login(client, DEFAULT_PASSWORD).status_code == 200
+    hashed = _stored_password(primary)
+    assert is_bcrypt_hash(hashed)
+    assert password_matches(hashed, DEFAULT_PASSWORD)
+    assert _login(client, DEFAULT_PASSWORD).status_code == 200
+
+
+def test_unusable_passwords_never_match(client, store_user):
+    store_user("!")
+    assert _login(client, "!").status_code == 401
+
+
+def test_unknown_users_are_rejected(client):
+    response = client.post(
+        "/auth/login", json={"username": "nobody", "password": "nothing"}
+    )
+    assert response.status_code == 401
+
+
+def test_plaintext_passwords_are_hashed_in_the_background(store_user, primary):
+    store_user(DEFAULT_PASSWORD)
+    primary.ensure_hashed_passwords(primary.engine)
+    assert _stored_password(primary) == PENDING_PASSWORD_HASH
+
+    async def hash_pending():
+        try:
+            await pending_password_hasher.hash_pending(primary.async_sessionLocal)
+        finally:
+            await primary.async_engine.dispose()
+
+    asyncio.run(hash_pending())
+    password_hasher.shutdown()
+    assert password_matches(_stored_password(primary), DEFAULT_PASSWORD)
+
+
+def test_unusable_passwords_are_not_queued_for_hashing(store_user, primary):
+    store_user("!")
+    primary.ensure_hashed_passwords(primary.engine)
+    assert _stored_password(primary) == "!"
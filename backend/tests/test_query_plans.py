@@ -0,0 +1,33 @@
+"""The canonical lost item queries must not plan sequential scans."""
+
+import pytest
+from sqlalchemy import func, select, text
+from backend.benchmarks.query_plans import (
+    MIN_ROWS,
+    canonical_queries,
+    explain,
+    sequential_scans,
+)
+from backend.benchmarks.synthetic import seed_database
+from backend.models.lost_item import LostItem
+
+
+@pytest.fixture(scope="module")
+def plans(primary):
+    """EXPLAIN plans of every canonical query, seeding items if there are few."""
+    with primary.engine.begin() as connection:
+        rows = connection.execute(select(func.count()).select_from(LostItem)).scalar()
+    if rows < MIN_ROWS:
+        with primary.sessionLocal() as session:
+            seed_database(session, users=2000, items=MIN_ROWS - rows)
+    with primary.engine.begin() as connection:
+        connection.execute(text("ANALYZE lost_items"))
+        return {
+            name: explain(connection, statement)
+            for name, statement in canonical_queries(connection).items()
+        }
+
+
+def test_no_sequential_scans(plans):
+    scanning = {name: plan for name, plan in plans.items() if sequential_scans(plan)}
+    assert not scanning, f"sequential scans on lost_items: {sorted(scanning)}"
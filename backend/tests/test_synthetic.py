@@ -0,0 +1,26 @@
+"""Benchmark data generators."""
+
+import pytest
+from backend.benchmarks import load
+from backend.benchmarks.synthetic import bench_user_id, synthetic_user_ids
+from backend.models.user import User
+
+USER_ID_LENGTH = User.__table__.c.id.type.length
+
+
+def test_synthetic_user_ids_fit_the_id_column():
+    ids = synthetic_user_ids(200_000)
+    assert len(set(ids)) == len(ids)
+    assert max(map(len, ids)) <= USER_ID_LENGTH
+
+
+def test_load_user_ids_fit_the_id_column(monkeypatch):
+    monkeypatch.setattr(load, "_ids", iter([0, 99_999, 100_000, 36**5 - 1]))
+    ids = [load._new_user()["id"] for _ in range(4)]
+    assert len(set(ids)) == 4
+    assert max(map(len, ids)) <= USER_ID_LENGTH
+
+
+def test_running_out_of_ids_is_an_error():
+    with pytest.raises(ValueError):
+        bench_user_id("S", 36**5)